@@ -2,5 +2,6 @@
 Module d'analyse et de recommandations
 """
 from .schema_analyzer import SchemaAnalyzer
+from .batch_analyzer import BatchAnalyzer, load_batch_rows, run_batch
 
-__all__ = ['SchemaAnalyzer']
\ No newline at end of file
+__all__ = ['SchemaAnalyzer', 'BatchAnalyzer', 'load_batch_rows', 'run_batch']
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""
+Analyse par lots de mots-clés (ValueSERP + scraping des concurrents)
+Entrée CSV ou JSONL, sortie JSONL écrite au fil de l'eau
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config import Config
+from api.valueserp import ValueSERPAPIWithRetry
+from scrapers.schema_scraper import SchemaScraper
+from analyzers.schema_analyzer import SchemaAnalyzer
+from utils.page_store import reuse_stats
+
+logger = logging.getLogger(__name__)
+
+
+def load_batch_rows(path: str) -> Iterator[Dict]:
+    """
+    Lit les lignes d'un fichier de lot sans le charger entièrement
+
+    Le fichier est un CSV (colonnes keyword, location, language) ou un JSONL
+    (un objet par ligne avec les mêmes clés). location et language sont
+    optionnels (défauts: France / fr).
+
+    Args:
+        path: Chemin du fichier .csv ou .jsonl
+
+    Returns:
+        Itérateur de dictionnaires {'keyword', 'location', 'language'}
+    """
+    is_jsonl = os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson')
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if is_jsonl:
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        for row in rows:
+            keyword = (row.get('keyword') or '').strip()
+            if not keyword:
+                continue
+            yield {
+                'keyword': keyword,
+                'location': (row.get('location') or '').strip() or 'France',
+                'language': (row.get('language') or '').strip() or 'fr'
+            }
+
+
+class BatchAnalyzer:
+    """
+    Pipeline d'analyse de nombreux mots-clés
+
+    Les mots-clés sont traités par fenêtres: les recherches d'une fenêtre
+    partagent un budget de concurrence borné, les URLs concurrentes sont
+    dédupliquées entre mots-clés puis chaque URL unique n'est analysée qu'une
+    fois. Les pages déjà extraites (fenêtres précédentes ou autres analyses)
+    sont servies par le magasin de pages partagé, et chaque mot-clé est émis
+    dès que sa fenêtre est terminée.
+    """
+
+    def __init__(self,
+                 api_key: str,
+                 max_concurrent_searches: int = Config.BATCH_MAX_CONCURRENT_SEARCHES,
+                 max_workers: int = Config.MAX_CONCURRENT_REQUESTS,
+                 window_size: int = Config.BATCH_WINDOW_SIZE,
+                 max_retries: int = Config.RETRY_ATTEMPTS,
+                 include_schemas: bool = False):
+        """
+        Args:
+            api_key: Clé API ValueSERP
+            max_concurrent_searches: Recherches ValueSERP simultanées
+            max_workers: Téléchargements de pages simultanés
+            window_size: Nombre de mots-clés traités ensemble
+            max_retries: Retries ValueSERP par recherche
+            include_schemas: Inclure les schemas complets dans la sortie
+        """
+        self.api_key = api_key
+        self.max_concurrent_searches = max_concurrent_searches
+        self.max_workers = max_workers
+        self.window_size = window_size
+        self.max_retries = max_retries
+        self.include_schemas = include_schemas
+
+        self.scraper = SchemaScraper()
+        self.analyzer = SchemaAnalyzer()
+
+        self.stats = {
+            'keywords': 0,
+            'failed_searches': 0,
+            'url_occurrences': 0,
+            'unique_urls': 0,
+            'urls_fetched': 0,
+            'urls_revalidated': 0
+        }
+
+    def run(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Analyse les mots-clés et émet un résultat par mot-clé, dans l'ordre
+
+        Args:
+            rows: Dictionnaires {'keyword', 'location', 'language'}
+
+        Returns:
+            Itérateur de résultats par mot-clé
+        """
+        window = []
+        for row in rows:
+            window.append(row)
+            if len(window) >= self.window_size:
+                yield from self._run_window(window)
+                window = []
+
+        if window:
+            yield from self._run_window(window)
+
+    def _run_window(self, rows: List[Dict]) -> Iterator[Dict]:
+        """Recherche, scrape et analyse une fenêtre de mots-clés"""
+        # Étape 1: recherches ValueSERP sous budget de concurrence
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_searches, len(rows))) as executor:
+            search_results = list(executor.map(self._search, rows))
+
+        # Étape 2: URLs concurrentes de chaque mot-clé, dédupliquées entre mots-clés
+        keyword_urls = []
+        urls_to_crawl = []
+        for search_result in search_results:
+            urls = []
+            if search_result and 'error' not in search_result:
+                urls = [result['link'] for result in search_result.get('organic_results', []) if 'link' in result]
+                urls = list(dict.fromkeys(urls))[:Config.MAX_URLS_PER_ANALYSIS]
+            keyword_urls.append(urls)
+            self.stats['url_occurrences'] += len(urls)
+
+            urls_to_crawl.extend(urls)
+
+        # Étape 3: chaque URL unique n'est analysée qu'une fois (magasin de pages)
+        urls_to_crawl = list(dict.fromkeys(urls_to_crawl))
+        url_results = {}
+        if urls_to_crawl:
+            logger.info("Lot: %d URL(s) unique(s) à analyser pour %d mot(s)-clé(s)", len(urls_to_crawl), len(rows))
+            deadline = Config.ANALYSIS_DEADLINE * math.ceil(len(urls_to_crawl) / Config.MAX_URLS_PER_ANALYSIS)
+            crawled = self.scraper.analyze_urls(urls_to_crawl, self.max_workers, deadline)
+            url_results = {url_result['url']: url_result for url_result in crawled}
+
+            window_reuse = reuse_stats(crawled)
+            self.stats['unique_urls'] += window_reuse['urls']
+            self.stats['urls_fetched'] += window_reuse['fetched']
+            self.stats['urls_revalidated'] += window_reuse['revalidated']
+
+        # Étape 4: analyse par mot-clé, émise immédiatement
+        for row, search_result, urls in zip(rows, search_results, keyword_urls):
+            self.stats['keywords'] += 1
+            yield self._build_keyword_result(row, search_result, urls, url_results)
+
+    def _search(self, row: Dict) -> Optional[Dict]:
+        """Recherche ValueSERP d'un mot-clé (exécuté dans un thread du pool)"""
+        api = ValueSERPAPIWithRetry(self.api_key)
+        api.max_retries = self.max_retries
+        return api.search_google_with_retry(row['keyword'], location=row['location'], language=row['language'])
+
+    def _build_keyword_result(self,
+                              row: Dict,
+                              search_result: Optional[Dict],
+                              urls: List[str],
+                              url_results: Dict[str, Dict]) -> Dict:
+        """Compile et analyse les résultats d'un mot-clé"""
+        result = {
+            'keyword': row['keyword'],
+            'location': row['location'],
+            'language': row['language'],
+            'analyzed_at': datetime.now().isoformat()
+        }
+
+        if not search_result or 'error' in search_result:
+            self.stats['failed_searches'] += 1
+            result['error'] = (search_result or {}).get('error', 'Aucune réponse de l\'API')
+            result['status_code'] = (search_result or {}).get('status_code')
+            return result
+
+        # Positions propres à ce mot-clé
+        keyword_results = [{**url_results[url], 'position': position} for position, url in enumerate(urls, 1)]
+
+        scraper_results = self.scraper.compile_url_results(keyword_results)
+        result['analysis'] = self.analyzer.analyze_serp_schemas(scraper_results)
+        result['schema_frequency'] = scraper_results['schema_frequency']
+        result['urls_analyzed'] = [
+            {key: value for key, value in url_result.items() if self.include_schemas or key != 'schemas'}
+            for url_result in keyword_results
+        ]
+        return result
+
+    def get_stats(self) -> Dict:
+        """
+        Statistiques du lot en cours
+
+        Returns:
+            Compteurs et taux de réutilisation des URLs (reuse_ratio: part des
+            occurrences d'URLs servies sans téléchargement)
+        """
+        stats = dict(self.stats)
+        occurrences = stats['url_occurrences']
+        stats['urls_reused'] = occurrences - stats['urls_fetched']
+        stats['reuse_ratio'] = round(stats['urls_reused'] / occurrences, 3) if occurrences else 0.0
+        return stats
+
+
+def run_batch(input_path: str, output_path: str, api_key: str, **kwargs) -> Dict:
+    """
+    Analyse un fichier de lot et écrit un résultat JSONL par mot-clé
+
+    Chaque ligne est écrite et vidée sur disque dès qu'elle est prête: un lot
+    interrompu conserve les mots-clés déjà traités.
+
+    Args:
+        input_path: Fichier .csv ou .jsonl de mots-clés
+        output_path: Fichier JSONL de sortie
+        api_key: Clé API ValueSERP
+        **kwargs: Options transmises à BatchAnalyzer
+
+    Returns:
+        Statistiques du lot
+    """
+    batch = BatchAnalyzer(api_key, **kwargs)
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for result in batch.run(load_batch_rows(input_path)):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+            if 'error' in result:
+                logger.warning("Échec du mot-clé %r (%s/%s): %s", result['keyword'], result['location'],
+                               result['language'], result['error'])
+            else:
+                logger.info("Mot-clé analysé: %r (%s/%s)", result['keyword'], result['location'],
+                            result['language'])
+
+    return batch.get_stats()
+
+
+def main():
+    """
+    Ancienne entrée python -m analyzers.batch_analyzer ENTRÉE SORTIE [options]
+
+    Équivalent de python -m schemeo analyze --input ENTRÉE --output SORTIE
+    --stats [options]: mêmes options, journal et statistiques sur stderr.
+    """
+    from schemeo.cli import main as cli_main
+
+    parser = argparse.ArgumentParser(description="Analyse par lots de mots-clés (voir python -m schemeo analyze)")
+    parser.add_argument('input', help="Fichier .csv ou .jsonl (keyword, location, language)")
+    parser.add_argument('output', help="Fichier JSONL de résultats")
+    args, options = parser.parse_known_args()
+
+    sys.exit(cli_main(['analyze', '--input', args.input, '--output', args.output, '--stats'] + options))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,25 +2,99 @@
 Module pour interagir avec l'API ValueSERP
 Version finale avec paramètres corrects selon l'interface ValueSERP
 """
+import asyncio
+import contextlib
+import logging
 import requests
+import threading
 import time
 import random
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from config import Config
+from utils.http_client import HttpClient, CancelToken, RequestCancelled, get_http_client, parse_retry_after
+from utils.metrics import registry
+from utils.timing import span
+
+logger = logging.getLogger(__name__)
+
+# Codes HTTP temporaires pour lesquels un nouvel essai a du sens
+RETRYABLE_STATUS_CODES = (429, 503)
+
+
+# Métriques (utils/metrics.py)
+_requests = registry.counter('valueserp_requests_total', "Requêtes ValueSERP par statut HTTP", ('status',))
+_retries = registry.counter('valueserp_retries_total', "Nouveaux essais ValueSERP par cause", ('reason',))
+_credits = registry.counter('valueserp_credits_used_total', "Crédits ValueSERP consommés")
+_request_seconds = registry.histogram('valueserp_request_seconds', "Durée des requêtes ValueSERP")
+
+
+class _SearchCalls:
+    """Jetons d'annulation des recherches en cours d'un client"""
+
+    def __init__(self):
+        self._tokens = set()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def track(self, cancel_token: Optional[CancelToken] = None) -> Iterator[CancelToken]:
+        """Enregistre le jeton d'une recherche (nouveau jeton si absent) le temps de l'appel"""
+        token = cancel_token or CancelToken()
+        with self._lock:
+            self._tokens.add(token)
+        try:
+            yield token
+        finally:
+            with self._lock:
+                self._tokens.discard(token)
+
+    def cancel(self):
+        """Annule les recherches en cours; les suivantes ne sont pas affectées"""
+        with self._lock:
+            tokens = list(self._tokens)
+        for token in tokens:
+            token.cancel()
+
+
+def _record_response(response: requests.Response):
+    """Compte une réponse ValueSERP et sa durée"""
+    _requests.inc(status=str(response.status_code))
+    _request_seconds.observe(response.elapsed.total_seconds())
+
+
+def _record_credits(data: Dict):
+    """
+    Compte les crédits consommés par une réponse ValueSERP réussie
+
+    request_info.credits_used est le cumul du compte: seul
+    credits_used_this_request correspond à cette requête (1 s'il est absent).
+    """
+    if registry.enabled:
+        credits = (data.get('request_info') or {}).get('credits_used_this_request')
+        _credits.inc(1 if credits is None else credits)
 
 
 class ValueSERPAPI:
     """Classe originale pour gérer les requêtes à l'API ValueSERP (compatibilité)"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[HttpClient] = None, base_url: Optional[str] = None):
         self.api_key = api_key
-        self.base_url = Config.VALUESERP_BASE_URL
+        self.base_url = base_url or Config.VALUESERP_BASE_URL
+        self.max_retries = Config.RETRY_ATTEMPTS
+        self.base_delay = Config.RETRY_DELAY
+        self.max_retry_time = Config.RETRY_MAX_TOTAL_TIME
+        self.http = http_client or get_http_client()
+        self._calls = _SearchCalls()
+
+    def cancel(self):
+        """Annule les recherches en cours (requêtes et attentes entre retries)"""
+        self._calls.cancel()
 
     def search_google(self,
                       keyword: str,
                       location: str = "France",
                       language: str = "fr",
-                      num: int = 10) -> Optional[Dict]:
+                      num: int = 10,
+                      cancel_token: Optional[CancelToken] = None) -> Optional[Dict]:
         """
         Effectue une recherche Google via ValueSERP
 
@@ -29,10 +103,22 @@ class ValueSERPAPI:
             location: Localisation (nom de pays)
             language: Langue de recherche
             num: Nombre de résultats
+            cancel_token: Jeton d'annulation de cette recherche (défaut: un
+                nouveau jeton, annulé par cancel())
 
         Returns:
             Résultats de recherche ou None si erreur
         """
+        with self._calls.track(cancel_token) as cancel_token:
+            return self._search_google(keyword, location, language, num, cancel_token)
+
+    def _search_google(self,
+                       keyword: str,
+                       location: str,
+                       language: str,
+                       num: int,
+                       cancel_token: CancelToken) -> Optional[Dict]:
+        """Corps de search_google() avec le jeton de l'appel"""
         # Mapping des paramètres selon la localisation
         location_params = self._get_location_params(location, language)
 
@@ -47,18 +133,45 @@ class ValueSERPAPI:
             'output': 'json'
         }
 
-        try:
-            response = requests.get(
-                self.base_url,
-                params=params,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+        deadline = time.monotonic() + self.max_retry_time
 
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur ValueSERP: {e}")
-            return None
+        for attempt in range(self.max_retries + 1):
+            try:
+                with span('serp.request', attempt=attempt + 1) as fields:
+                    response = self.http.get(
+                        self.base_url,
+                        params=params,
+                        cancel_token=cancel_token,
+                        timeout=30
+                    )
+                    fields['status'] = response.status_code
+                _record_response(response)
+
+                # Erreur temporaire: nouvel essai en respectant Retry-After
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                    delay = parse_retry_after(response.headers.get('Retry-After'))
+                    if delay is None:
+                        delay = self.base_delay * (2 ** attempt)
+                    if time.monotonic() + delay <= deadline:
+                        logger.info("Erreur %d ValueSERP - retry dans %.1fs", response.status_code, delay)
+                        _retries.inc(reason=str(response.status_code))
+                        if cancel_token.wait(delay):
+                            return None
+                        continue
+
+                response.raise_for_status()
+                data = response.json()
+                _record_credits(data)
+                return data
+
+            except RequestCancelled:
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.warning("Erreur ValueSERP: %s", e)
+                _requests.inc(status='error')
+                return None
+
+        return None
 
     def _get_location_params(self, location: str, language: str) -> Dict[str, str]:
         """
@@ -140,66 +253,90 @@ class ValueSERPAPI:
 class ValueSERPAPIWithRetry:
     """Version améliorée avec retry automatique et paramètres corrects"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[HttpClient] = None, base_url: Optional[str] = None):
         self.api_key = api_key
-        self.base_url = Config.VALUESERP_BASE_URL
-        self.max_retries = 3
-        self.base_delay = 2
+        self.base_url = base_url or Config.VALUESERP_BASE_URL
+        self.max_retries = Config.RETRY_ATTEMPTS
+        self.base_delay = Config.RETRY_DELAY
+        self.max_retry_time = Config.RETRY_MAX_TOTAL_TIME
+        self.http = http_client or get_http_client()
+        self._calls = _SearchCalls()
+
+    def cancel(self):
+        """Annule les recherches en cours (requêtes et attentes entre retries)"""
+        self._calls.cancel()
 
     def search_google_with_retry(self,
                                  keyword: str,
                                  location: str = "France",
                                  language: str = "fr",
-                                 num: int = 10) -> Optional[Dict]:
+                                 num: int = 10,
+                                 cancel_token: Optional[CancelToken] = None) -> Optional[Dict]:
         """
         Effectue une recherche avec mécanisme de retry et paramètres corrects
+
+        Les erreurs 429/503 sont réessayées en respectant l'en-tête Retry-After;
+        la durée cumulée des attentes est plafonnée par max_retry_time.
+        Chaque appel a son propre jeton d'annulation (cancel_token, sinon un
+        nouveau jeton): cancel() n'affecte que les recherches en cours.
         """
+        with self._calls.track(cancel_token) as cancel_token:
+            return self._search_with_retry(keyword, location, language, num, cancel_token)
+
+    def _search_with_retry(self,
+                           keyword: str,
+                           location: str,
+                           language: str,
+                           num: int,
+                           cancel_token: CancelToken) -> Optional[Dict]:
+        """Boucle de retry de search_google_with_retry() avec le jeton de l'appel"""
+        deadline = time.monotonic() + self.max_retry_time
+
         for attempt in range(self.max_retries + 1):
+            if cancel_token.cancelled:
+                return self._cancelled_result()
+
             try:
-                result = self._make_request(keyword, location, language, num, attempt)
+                result = self._make_request(keyword, location, language, num, attempt, cancel_token)
 
                 if result is None:
                     continue
 
                 # Si succès, retourner le résultat
                 if 'error' not in result:
-                    print(f"✅ Succès après {attempt + 1} tentative(s)")
+                    logger.debug("Succès après %d tentative(s)", attempt + 1)
                     return result
 
                 # Si erreur 400, pas de retry (configuration incorrecte)
                 if result.get('status_code') == 400:
-                    print(f"❌ Erreur 400 - Configuration incorrecte")
+                    logger.warning("Erreur 400 ValueSERP - configuration incorrecte")
                     return result
 
-                # Si erreur 503, retry
-                elif result.get('status_code') == 503:
-                    if attempt < self.max_retries:
-                        delay = self._calculate_delay(attempt)
-                        print(f"⏳ Erreur 503 - Retry dans {delay}s (tentative {attempt + 1}/{self.max_retries + 1})")
-                        time.sleep(delay)
+                # Si erreur temporaire (503, 429), retry
+                elif result.get('status_code') in RETRYABLE_STATUS_CODES:
+                    delay = self._retry_delay(result, attempt)
+                    if attempt < self.max_retries and time.monotonic() + delay <= deadline:
+                        logger.info("Erreur %d ValueSERP - retry dans %.1fs (tentative %d/%d)",
+                                    result['status_code'], delay, attempt + 1, self.max_retries + 1)
+                        _retries.inc(reason=str(result['status_code']))
+                        if cancel_token.wait(delay):
+                            return self._cancelled_result()
                         continue
                     else:
-                        print("❌ Échec après tous les retries - Service ValueSERP indisponible")
-                        return {
-                            'error': 'Service ValueSERP temporairement indisponible après plusieurs tentatives',
-                            'status_code': 503,
-                            'suggestions': [
-                                'Vérifier la page de statut ValueSERP : https://valueserp.statuspage.io/',
-                                'Réessayer dans 10-15 minutes',
-                                'Contacter le support ValueSERP si le problème persiste'
-                            ]
-                        }
+                        return self._retries_exhausted_result(result['status_code'])
 
                 # Pour les autres erreurs, pas de retry
                 else:
-                    print(f"❌ Erreur non-retryable: {result.get('error', 'Erreur inconnue')}")
+                    logger.warning("Erreur ValueSERP non-retryable: %s", result.get('error', 'Erreur inconnue'))
                     return result
 
             except Exception as e:
-                print(f"❌ Exception lors de la tentative {attempt + 1}: {e}")
-                if attempt < self.max_retries:
-                    delay = self._calculate_delay(attempt)
-                    time.sleep(delay)
+                logger.warning("Exception lors de la tentative %d: %s", attempt + 1, e)
+                delay = self._calculate_delay(attempt)
+                if attempt < self.max_retries and time.monotonic() + delay <= deadline:
+                    _retries.inc(reason='exception')
+                    if cancel_token.wait(delay):
+                        return self._cancelled_result()
                     continue
                 else:
                     return {
@@ -209,7 +346,67 @@ class ValueSERPAPIWithRetry:
 
         return None
 
-    def _make_request(self, keyword: str, location: str, language: str, num: int, attempt: int) -> Optional[Dict]:
+    async def asearch_google_with_retry(self,
+                                        keyword: str,
+                                        location: str = "France",
+                                        language: str = "fr",
+                                        num: int = 10) -> Optional[Dict]:
+        """
+        Version awaitable de search_google_with_retry()
+
+        L'annulation de la tâche asyncio annule aussi les retries en attente
+        de cette recherche (et d'elle seule).
+        """
+        loop = asyncio.get_running_loop()
+        cancel_token = CancelToken()
+        try:
+            return await loop.run_in_executor(
+                None,
+                lambda: self.search_google_with_retry(keyword, location, language, num, cancel_token)
+            )
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+    def _cancelled_result(self) -> Dict:
+        """Résultat retourné lorsqu'une recherche est annulée"""
+        return {
+            'error': 'Recherche annulée',
+            'status_code': 499
+        }
+
+    def _retries_exhausted_result(self, status_code: int) -> Dict:
+        """Résultat retourné lorsque les retries (nombre ou durée) sont épuisés"""
+        if status_code == 429:
+            logger.warning("Échec après tous les retries - limite de taux ValueSERP atteinte")
+            return {
+                'error': 'Limite de taux ValueSERP atteinte après plusieurs tentatives',
+                'status_code': 429,
+                'suggestions': [
+                    'Réduire le nombre de recherches simultanées',
+                    'Vérifier les quotas de votre compte ValueSERP',
+                    'Réessayer dans quelques minutes'
+                ]
+            }
+
+        logger.warning("Échec après tous les retries - service ValueSERP indisponible")
+        return {
+            'error': 'Service ValueSERP temporairement indisponible après plusieurs tentatives',
+            'status_code': 503,
+            'suggestions': [
+                'Vérifier la page de statut ValueSERP : https://valueserp.statuspage.io/',
+                'Réessayer dans 10-15 minutes',
+                'Contacter le support ValueSERP si le problème persiste'
+            ]
+        }
+
+    def _make_request(self,
+                      keyword: str,
+                      location: str,
+                      language: str,
+                      num: int,
+                      attempt: int,
+                      cancel_token: Optional[CancelToken] = None) -> Optional[Dict]:
         """Effectue une requête unique avec les paramètres corrects"""
 
         # Obtenir les paramètres corrects selon la localisation
@@ -226,24 +423,27 @@ class ValueSERPAPIWithRetry:
             'output': 'json'
         }
 
-        print(f"📡 Tentative {attempt + 1}: {keyword}")
-        print(f"🌍 Localisation: {location_params['location']}")
-        print(
-            f"🔧 Paramètres: gl={location_params['gl']}, hl={location_params['hl']}, domain={location_params['google_domain']}")
+        logger.debug("Tentative %d: %s (location=%s, gl=%s, hl=%s, domain=%s)",
+                     attempt + 1, keyword, location_params['location'], location_params['gl'],
+                     location_params['hl'], location_params['google_domain'])
 
         try:
-            response = requests.get(
-                self.base_url,
-                params=params,
-                timeout=45
-            )
-
-            print(f"🔗 URL: {response.url}")
-            print(f"📊 Status Code: {response.status_code}")
+            with span('serp.request', attempt=attempt + 1) as fields:
+                response = self.http.get(
+                    self.base_url,
+                    params=params,
+                    cancel_token=cancel_token,
+                    timeout=45
+                )
+                fields['status'] = response.status_code
+            _record_response(response)
+
+            # L'URL complète contient la clé API: seul le statut est journalisé
+            logger.debug("Réponse ValueSERP: %d", response.status_code)
 
             # Gestion spécifique des codes d'erreur
             if response.status_code == 400:
-                print(f"❌ Erreur 400: Paramètres invalides")
+                logger.info("Erreur 400 ValueSERP: paramètres invalides pour %s", location)
                 return {
                     'error': f'Paramètres invalides - vérifiez la configuration pour "{location}"',
                     'status_code': 400,
@@ -253,19 +453,21 @@ class ValueSERPAPIWithRetry:
                     }
                 }
             elif response.status_code == 503:
-                print("❌ Erreur 503: Service temporairement indisponible")
+                logger.info("Erreur 503 ValueSERP: service temporairement indisponible")
                 return {
                     'error': 'Service temporairement indisponible (surcharge ou maintenance)',
-                    'status_code': 503
+                    'status_code': 503,
+                    'retry_after': parse_retry_after(response.headers.get('Retry-After'))
                 }
             elif response.status_code == 429:
-                print("❌ Erreur 429: Limite de taux atteinte")
+                logger.info("Erreur 429 ValueSERP: limite de taux atteinte")
                 return {
                     'error': 'Limite de taux atteinte - trop de requêtes',
-                    'status_code': 429
+                    'status_code': 429,
+                    'retry_after': parse_retry_after(response.headers.get('Retry-After'))
                 }
             elif response.status_code == 401:
-                print("❌ Erreur 401: Clé API invalide")
+                logger.warning("Erreur 401 ValueSERP: clé API invalide")
                 return {
                     'error': 'Clé API invalide ou expirée',
                     'status_code': 401
@@ -273,6 +475,7 @@ class ValueSERPAPIWithRetry:
 
             response.raise_for_status()
             result = response.json()
+            _record_credits(result)
 
             # Vérifier si l'API retourne une erreur dans le JSON
             if 'error' in result:
@@ -281,18 +484,23 @@ class ValueSERPAPIWithRetry:
                     'status_code': response.status_code
                 }
 
-            print(f"✅ Succès: {len(result.get('organic_results', []))} résultats trouvés")
+            logger.debug("Succès: %d résultats trouvés", len(result.get('organic_results', [])))
             return result
 
+        except RequestCancelled:
+            return self._cancelled_result()
         except requests.exceptions.Timeout:
-            print("⏰ Timeout: La requête a pris trop de temps")
+            logger.info("Timeout ValueSERP: la requête a pris trop de temps")
+            _requests.inc(status='timeout')
             return {
                 'error': 'Timeout - la requête a pris trop de temps',
                 'status_code': 408
             }
         except requests.exceptions.RequestException as e:
             status_code = getattr(e.response, 'status_code', 500) if hasattr(e, 'response') and e.response else 500
-            print(f"❌ Erreur requête: {e}")
+            logger.warning("Erreur requête ValueSERP: %s", e)
+            if e.response is None:
+                _requests.inc(status='error')
             return {
                 'error': f'Erreur réseau: {str(e)}',
                 'status_code': status_code
@@ -356,6 +564,13 @@ class ValueSERPAPIWithRetry:
             'google_domain': 'google.com'
         })
 
+    def _retry_delay(self, result: Dict, attempt: int) -> float:
+        """Délai avant le prochain essai: Retry-After du serveur, sinon backoff"""
+        retry_after = result.get('retry_after')
+        if retry_after is not None:
+            return retry_after
+        return self._calculate_delay(attempt)
+
     def _calculate_delay(self, attempt: int) -> float:
         """Calcule le délai avec backoff exponentiel et jitter"""
         delay = self.base_delay * (2 ** attempt)
@@ -525,9 +740,9 @@ def diagnose_valueserp_issues(api_key: str) -> Dict:
     return diagnosis
 
 
-def create_valueserp_client(api_key: str, use_retry: bool = True):
-    """Factory pour créer le bon client ValueSERP"""
+def create_valueserp_client(api_key: str, use_retry: bool = True, **kwargs):
+    """Factory pour créer le bon client ValueSERP (kwargs: http_client, base_url)"""
     if use_retry:
-        return ValueSERPAPIWithRetry(api_key)
+        return ValueSERPAPIWithRetry(api_key, **kwargs)
     else:
-        return ValueSERPAPI(api_key)
\ No newline at end of file
+        return ValueSERPAPI(api_key, **kwargs)
\ No newline at end of file
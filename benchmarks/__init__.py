@@ -0,0 +1,4 @@
+"""
+Benchmarks hors-ligne de l'analyseur de schemas
+Chaque script s'exécute avec: python -m benchmarks.<nom_du_script>
+"""
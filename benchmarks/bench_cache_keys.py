@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: dérivation des clés de cache
+
+Compare l'ancienne dérivation (json.dumps(sort_keys=True) + MD5 pour toutes
+les clés) à make_cache_key sur les clés typiques de l'application.
+
+Usage:
+    python -m benchmarks.bench_cache_keys [--number 20000]
+"""
+import argparse
+import hashlib
+import json
+import timeit
+
+from utils.cache import make_cache_key, _serp_cache_key, _schema_analysis_cache_key
+
+
+def legacy_cache_key(key_data):
+    """Ancienne implémentation de CacheManager._get_cache_key"""
+    if isinstance(key_data, (dict, list)):
+        key_str = json.dumps(key_data, sort_keys=True)
+    else:
+        key_str = str(key_data)
+    return hashlib.md5(key_str.encode()).hexdigest()
+
+
+def build_serp_payload(results: int = 10) -> dict:
+    """Réponse ValueSERP représentative (passée en argument à une fonction @cached)"""
+    return {
+        'search_metadata': {'id': 'bench', 'total_time_taken': 1.2},
+        'organic_results': [
+            {
+                'position': position,
+                'title': f"Résultat {position} - meilleur restaurant Paris",
+                'link': f"https://www.example-{position}.com/restaurants/paris",
+                'snippet': 'Lorem ipsum dolor sit amet ' * 8,
+                'sitelinks': {'inline': [{'title': f"Lien {i}", 'link': f"https://example.com/{i}"}
+                                         for i in range(4)]}
+            }
+            for position in range(1, results + 1)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    keyword, location, language = 'meilleur restaurant paris', 'France', 'fr'
+    url = 'https://www.example.com/restaurants/paris?utm_source=serp'
+    payload = build_serp_payload()
+
+    cases = [
+        (
+            'Clé SERP',
+            lambda: legacy_cache_key({'type': 'serp_results', 'keyword': keyword,
+                                      'location': location, 'language': language}),
+            lambda: make_cache_key(_serp_cache_key(keyword, location, language))
+        ),
+        (
+            'Clé URL',
+            lambda: legacy_cache_key({'type': 'schema_analysis', 'url': url}),
+            lambda: make_cache_key(_schema_analysis_cache_key(url))
+        ),
+        (
+            '@cached(payload SERP)',
+            lambda: legacy_cache_key({'prefix': 'f', 'args': (payload,), 'kwargs': {}}),
+            lambda: make_cache_key({'prefix': 'f', 'args': (payload,), 'kwargs': {}})
+        ),
+    ]
+
+    print(f"{'Clé':<24}{'Avant (µs)':>12}{'Après (µs)':>12}{'Gain':>8}")
+    for label, legacy, current in cases:
+        number = args.number if 'payload' not in label else max(1, args.number // 20)
+        before = timeit.timeit(legacy, number=number) / number * 1e6
+        after = timeit.timeit(current, number=number) / number * 1e6
+        print(f"{label:<24}{before:>12.2f}{after:>12.2f}{before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: re-crawl d'URLs déjà analysées, avec et sans GET conditionnel
+
+Le serveur local sert des pages avec ETag (la moitié) ou Last-Modified
+(l'autre moitié) et répond 304 quand les validateurs reçus correspondent.
+Config.CACHE_DURATION est mis à 0 pour que chaque re-crawl trouve des
+pages expirées: "avant" vide le magasin de pages (téléchargement complet),
+"après" revalide les pages expirées avec leurs validateurs.
+
+Usage:
+    python -m benchmarks.bench_conditional_get [--urls 10] [--rounds 3]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.corpus import generate_page
+from benchmarks.servers import LocalServer
+from config import Config
+from scrapers.schema_scraper import SchemaScraper
+from utils.cache_backends import MemoryCacheBackend
+from utils.page_store import PageStore
+
+LAST_MODIFIED = 'Wed, 14 Oct 2026 08:00:00 GMT'
+
+
+class ConditionalRoute:
+    """Page qui répond 304 si If-None-Match / If-Modified-Since correspondent"""
+
+    def __init__(self, body: bytes, etag: str = None):
+        self.body = body
+        self.etag = etag
+        self.bytes_sent = 0
+
+    def __call__(self, handler):
+        headers = {'Content-Type': 'text/html; charset=utf-8'}
+        if self.etag:
+            headers['ETag'] = self.etag
+            not_modified = handler.headers.get('If-None-Match') == self.etag
+        else:
+            headers['Last-Modified'] = LAST_MODIFIED
+            not_modified = handler.headers.get('If-Modified-Since') == LAST_MODIFIED
+
+        if not_modified:
+            return 304, headers, b''
+        self.bytes_sent += len(self.body)
+        return 200, headers, self.body
+
+
+def crawl(scraper: SchemaScraper, urls: list) -> float:
+    """Analyse les URLs et retourne la durée en secondes"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = scraper.analyze_urls(urls)
+    assert all(result['schema_types'] for result in results)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--urls', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    body = generate_page('categorie-100ko', 100).encode('utf-8')
+    routes = {
+        f'/page-{i}': ConditionalRoute(body, etag=f'"v1-{i}"' if i % 2 else None)
+        for i in range(args.urls)
+    }
+    Config.CACHE_DURATION = 0
+    # Transport seul: pas de limitation de débit vers le serveur local
+    Config.POLITENESS_ENABLED = False
+
+    print(f"{'Mode':<8}{'Re-crawl':>10}{'Temps (ms)':>12}{'Octets servis':>15}{'Requêtes':>10}")
+    with LocalServer(routes) as server:
+        urls = [server.url(path) for path in routes]
+
+        for mode in ('avant', 'après'):
+            store = PageStore(MemoryCacheBackend(ttl=Config.PAGE_REVALIDATION_MAX_AGE))
+            scraper = SchemaScraper(page_store=store)
+            crawl(scraper, urls)
+
+            for round_number in range(1, args.rounds + 1):
+                if mode == 'avant':
+                    store.clear()
+                for route in routes.values():
+                    route.bytes_sent = 0
+                server.reset_counters()
+
+                elapsed = crawl(scraper, urls)
+                sent = sum(route.bytes_sent for route in routes.values())
+                print(f"{mode:<8}{round_number:>10}{elapsed * 1000:>12.1f}{sent:>15}{server.requests:>10}")
+
+            print(f"{'':<8}{store.snapshot()}")
+
+
+if __name__ == '__main__':
+    main()
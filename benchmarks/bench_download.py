@@ -0,0 +1,110 @@
+"""
+Benchmark: octets lus, temps et pic mémoire du téléchargement des pages
+
+"Avant" reproduit l'ancien scrape_url (corps entier chargé via
+response.text, sans limite); "après" appelle SchemaScraper.scrape_page
+(streaming, budget Config.MAX_PAGE_BYTES, arrêt à </html>).
+Le serveur est local: les pages couvrent une page volumineuse, une page
+compressée en gzip, une page suivie de contenu parasite après </html> et
+un fichier binaire annoncé en text/html.
+
+Usage:
+    python -m benchmarks.bench_download [--repeat 3]
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import os
+import statistics
+import time
+import tracemalloc
+
+import requests
+
+from benchmarks.corpus import generate_page
+from benchmarks.servers import LocalServer
+from config import Config
+from scrapers.schema_scraper import SchemaScraper, USER_AGENTS
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def build_routes() -> dict:
+    """Pages servies par le serveur local"""
+    page = generate_page('categorie-1mo', 1000).encode('utf-8')
+    huge = generate_page('categorie-12mo', 12000).encode('utf-8')
+    return {
+        '/page-1mo': (200, HTML, page),
+        '/page-gzip': (200, {**HTML, 'Content-Encoding': 'gzip'}, gzip.compress(page)),
+        '/page-12mo': (200, HTML, huge),
+        '/page-parasite': (200, HTML, page + b'<!-- tracking -->' * 200000),
+        '/binaire': (200, HTML, b'\x00\x01PK' + os.urandom(4 * 1024 * 1024)),
+    }
+
+
+def legacy_scrape(session: requests.Session, url: str):
+    """Ancien téléchargement: corps entier, décodé en une fois"""
+    for ua in USER_AGENTS:
+        try:
+            response = session.get(url, headers={'User-Agent': ua}, timeout=30)
+            response.raise_for_status()
+            if 'text/html' not in response.headers.get('content-type', ''):
+                continue
+            return response.text
+        except requests.exceptions.RequestException:
+            continue
+    return None
+
+
+def measure(scrape, url: str, repeat: int) -> dict:
+    """Temps médian, pic mémoire (tracemalloc) et taille du HTML retenu"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scrape(url)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    html = scrape(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ms': statistics.median(timings) * 1000,
+        'peak_mb': peak / (1024 * 1024),
+        'kb': len(html) / 1024 if html else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Transport seul: pas de limitation de débit vers le serveur local
+    Config.POLITENESS_ENABLED = False
+    scraper = SchemaScraper()
+    session = requests.Session()
+    modes = (
+        ('avant', lambda url: legacy_scrape(session, url)),
+        ('après', scraper.scrape_url),
+    )
+
+    print(f"Budget: {Config.MAX_PAGE_BYTES / (1024 * 1024):.0f} Mo par page")
+    print(f"{'Page':<16}{'Mode':>8}{'Temps (ms)':>12}{'Pic (Mo)':>10}{'HTML (Ko)':>11}{'Connexions':>12}")
+    with LocalServer(build_routes()) as server:
+        for path in server.routes:
+            for mode, scrape in modes:
+                server.reset_counters()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stats = measure(scrape, server.url(path), args.repeat)
+                print(f"{path:<16}{mode:>8}{stats['ms']:>12.1f}{stats['peak_mb']:>10.1f}"
+                      f"{stats['kb']:>11.0f}{server.connections:>12}")
+
+        page = scraper.scrape_page(server.url('/page-12mo'))
+        print(f"\n/page-12mo: {page['bytes']} octets lus, truncated={page['truncated']}")
+
+
+if __name__ == '__main__':
+    main()
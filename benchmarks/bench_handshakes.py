@@ -0,0 +1,96 @@
+"""
+Benchmark: nombre de handshakes TCP par scraping, avant/après le transport partagé
+
+"Avant" reproduit l'ancien comportement de scrape_url (une requests.Session
+neuve par tentative de User-Agent); "après" utilise SchemaScraper tel quel.
+Le serveur est local et en HTTP clair: chaque connexion acceptée correspond à
+un handshake TCP (et à un handshake TLS supplémentaire en HTTPS).
+
+Usage:
+    python -m benchmarks.bench_handshakes [--urls 10] [--scrapers 3]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import requests
+
+from benchmarks.servers import LocalServer
+from config import Config
+from scrapers.schema_scraper import SchemaScraper, USER_AGENTS
+
+HTML_PAGE = (
+    b'<html><head><script type="application/ld+json">'
+    b'{"@context": "https://schema.org", "@type": "Organization", "name": "Bench"}'
+    b'</script></head><body><p>ok</p></body></html>'
+)
+
+
+def legacy_scrape_url(url: str):
+    """Ancienne implémentation: nouvelle session pour chaque User-Agent"""
+    for ua in USER_AGENTS:
+        try:
+            session = requests.Session()
+            session.headers.update({'User-Agent': ua})
+            response = session.get(url, timeout=30, allow_redirects=True)
+            response.raise_for_status()
+            if 'text/html' not in response.headers.get('content-type', ''):
+                continue
+            return response.text
+        except requests.exceptions.RequestException:
+            continue
+    return None
+
+
+def run_scenario(server: LocalServer, path: str, urls: int, scrapers: int, legacy: bool) -> dict:
+    """Scrape `urls` URLs avec `scrapers` instances et compte les handshakes"""
+    server.reset_counters()
+    # Repartir d'un pool vide pour mesurer aussi le coût de démarrage
+    SchemaScraper._shared_transport = None
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(scrapers):
+            scraper = SchemaScraper()
+            for i in range(urls):
+                url = server.url(f"{path}?page={i}")
+                if legacy:
+                    legacy_scrape_url(url)
+                else:
+                    scraper.scrape_url(url)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': server.requests,
+        'handshakes': server.connections,
+        'seconds': elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--urls', type=int, default=10)
+    parser.add_argument('--scrapers', type=int, default=3)
+    args = parser.parse_args()
+
+    # Transport seul: pas de limitation de débit vers le serveur local
+    Config.POLITENESS_ENABLED = False
+
+    routes = {
+        '/html': (200, {'Content-Type': 'text/html; charset=utf-8'}, HTML_PAGE),
+        # Mauvais type de contenu: déclenche toutes les tentatives de User-Agent
+        '/binary': (200, {'Content-Type': 'application/pdf'}, b'%PDF-1.4'),
+    }
+
+    with LocalServer(routes) as server:
+        print(f"{'Scénario':<28}{'Mode':<8}{'Requêtes':>10}{'Handshakes':>12}{'Temps (s)':>12}")
+        for label, path in (('Pages HTML', '/html'), ('Échecs (4 User-Agents)', '/binary')):
+            for mode, legacy in (('avant', True), ('après', False)):
+                stats = run_scenario(server, path, args.urls, args.scrapers, legacy)
+                print(f"{label:<28}{mode:<8}{stats['requests']:>10}"
+                      f"{stats['handshakes']:>12}{stats['seconds']:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
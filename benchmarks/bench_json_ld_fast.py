@@ -0,0 +1,55 @@
+"""
+Benchmark: extraction complète vs mode JSON-LD seul (pré-scan sans DOM)
+
+Pour chaque page du corpus hors ligne, compare le temps médian de
+extract_schemas en mode complet et en mode json_ld_only, et vérifie que les
+schemas JSON-LD obtenus sont identiques. Les pages avec microdata basculent
+volontairement sur le parsing complet.
+
+Usage:
+    python -m benchmarks.bench_json_ld_fast [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from benchmarks.corpus import generate_corpus
+from scrapers.schema_scraper import SchemaScraper
+
+BASE_URL = 'https://shop.example/'
+
+
+def timed(extract, repeat: int):
+    """Temps médian en millisecondes et dernier résultat"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = extract()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    scraper = SchemaScraper()
+
+    print(f"{'Page':<18}{'Taille':>9}{'Complet (ms)':>14}{'JSON-LD (ms)':>14}{'Gain':>8}  Chemin  JSON-LD identique")
+    for name, html in generate_corpus():
+        full_ms, full = timed(lambda: scraper.extract_schemas(BASE_URL, html), args.repeat)
+        fast_ms, fast = timed(lambda: scraper.extract_schemas(BASE_URL, html, json_ld_only=True), args.repeat)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = 'pré-scan' if scraper._prescan_json_ld(html) is not None else 'complet'
+        same = full['json-ld'] == fast['json-ld']
+        print(f"{name:<18}{len(html) / 1024:>7.0f}Ko{full_ms:>14.1f}{fast_ms:>14.1f}"
+              f"{full_ms / fast_ms:>7.1f}x  {path:<9}{'oui' if same else 'NON'}")
+
+
+if __name__ == '__main__':
+    main()
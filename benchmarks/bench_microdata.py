@@ -0,0 +1,67 @@
+"""
+Benchmark de stress: extraction microdata sur des itemscopes imbriqués
+
+"Avant" reproduit l'ancienne extraction (un parcours des descendants de
+chaque élément itemtype, O(n·profondeur), propriétés imbriquées rattachées à
+tous les ancêtres); "après" appelle le parcours unique de SchemaScraper.
+Les pages générées contiennent ~10 000 itemprops.
+
+Usage:
+    python -m benchmarks.bench_microdata [--itemprops 10000]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.corpus import generate_microdata_stress_page
+from scrapers.schema_scraper import SchemaScraper
+
+
+def legacy_microdata(tree) -> list:
+    """Ancienne extraction: chaque item rescanne tous ses descendants"""
+    items = []
+    for element in tree.xpath('//*[@itemtype]'):
+        item = {'type': element.get('itemtype'), 'properties': {}}
+        for prop_element in element.xpath('.//*[@itemprop]'):
+            value = prop_element.text_content().strip()
+            if value:
+                item['properties'].setdefault(prop_element.get('itemprop'), []).append(value)
+        if item['properties']:
+            items.append(item)
+    return items
+
+
+def count_values(items: list) -> int:
+    """Nombre de valeurs de propriétés rattachées aux items (hors items imbriqués)"""
+    total = 0
+    for item in items:
+        for value in item['properties'].values():
+            values = value if isinstance(value, list) else [value]
+            total += sum(1 for v in values if isinstance(v, str))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--itemprops', type=int, default=10000)
+    args = parser.parse_args()
+
+    scraper = SchemaScraper()
+
+    print(f"{'Profondeur':>10}{'itemprops':>11}{'Mode':>8}{'Temps (ms)':>12}{'Items':>8}{'Valeurs':>10}")
+    for depth in (1, 2, 10, 50, 200):
+        html = generate_microdata_stress_page(args.itemprops, depth)
+        tree = scraper._parse_html(html)
+        itemprops = html.count('itemprop=')
+
+        for mode, extract in (('avant', legacy_microdata), ('après', scraper._extract_microdata)):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                items = extract(tree)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{depth:>10}{itemprops:>11}{mode:>8}{elapsed:>12.1f}{len(items):>8}{count_values(items):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: temps de parsing et pic mémoire par page dans extract_schemas
+
+"Avant" reproduit l'ancien chemin (arbre BeautifulSoup html.parser, puis
+extruct.extract qui re-parse le HTML avec lxml); "après" appelle
+SchemaScraper.extract_schemas tel quel (un seul arbre lxml partagé).
+Le pic mémoire est celui du tas Python (tracemalloc): les allocations C de
+libxml2 ne sont pas comptées, dans un mode comme dans l'autre.
+Le corpus est généré hors ligne par benchmarks.corpus.
+
+Usage:
+    python -m benchmarks.bench_parse [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import time
+import tracemalloc
+
+import extruct
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import generate_corpus
+from scrapers.schema_scraper import SchemaScraper
+
+BASE_URL = 'https://shop.example/'
+
+
+def _legacy_microdata_item(element):
+    """Ancienne extraction microdata (éléments BeautifulSoup)"""
+    item = {'type': element.get('itemtype'), 'properties': {}}
+    for prop_element in element.find_all(attrs={"itemprop": True}):
+        if prop_element.name == 'meta':
+            value = prop_element.get('content', '')
+        elif prop_element.name == 'a':
+            value = prop_element.get('href', prop_element.get_text().strip())
+        elif prop_element.name == 'img':
+            value = prop_element.get('src', prop_element.get('alt', ''))
+        elif prop_element.name == 'time':
+            value = prop_element.get('datetime', prop_element.get_text().strip())
+        else:
+            value = prop_element.get_text().strip()
+        prop_name = prop_element.get('itemprop')
+        if value and prop_name in item['properties']:
+            if not isinstance(item['properties'][prop_name], list):
+                item['properties'][prop_name] = [item['properties'][prop_name]]
+            item['properties'][prop_name].append(value)
+        elif value:
+            item['properties'][prop_name] = value
+    return item if item['properties'] else None
+
+
+def legacy_extract(scraper: SchemaScraper, html: str) -> dict:
+    """Ancien chemin: deux parsings complets du même HTML"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    json_ld_schemas = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads((script.string or script.get_text()).strip())
+            json_ld_schemas.extend(data if isinstance(data, list) else [data])
+        except ValueError:
+            pass
+
+    extruct_data = {}
+    try:
+        extruct_data = extruct.extract(html, base_url=BASE_URL,
+                                       syntaxes=['json-ld', 'microdata', 'rdfa', 'opengraph'])
+    except Exception:
+        pass
+
+    microdata_items = [item for item in (_legacy_microdata_item(element)
+                                         for element in soup.find_all(attrs={"itemtype": True})) if item]
+
+    return {
+        'json-ld': scraper._process_json_ld(json_ld_schemas),
+        'microdata': microdata_items or extruct_data.get('microdata', []),
+        'rdfa': extruct_data.get('rdfa', []),
+        'opengraph': extruct_data.get('opengraph', [])
+    }
+
+
+def measure(extract, html: str, repeat: int) -> dict:
+    """Temps médian et pic mémoire (tracemalloc) d'une extraction"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(html)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    schemas = extract(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ms': statistics.median(timings) * 1000,
+        'peak_mb': peak / (1024 * 1024),
+        'counts': {syntax: len(items) for syntax, items in schemas.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scraper = SchemaScraper()
+    modes = (
+        ('avant', lambda html: legacy_extract(scraper, html)),
+        ('après', lambda html: scraper.extract_schemas(BASE_URL, html)),
+    )
+
+    print(f"{'Page':<18}{'Taille':>9}{'Mode':>8}{'Temps (ms)':>12}{'Pic (Mo)':>10}  Schemas (ld/md/rdfa/og)")
+    for name, html in generate_corpus():
+        for mode, extract in modes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = measure(extract, html, args.repeat)
+            counts = stats['counts']
+            print(f"{name:<18}{len(html) / 1024:>7.0f}Ko{mode:>8}{stats['ms']:>12.1f}{stats['peak_mb']:>10.1f}  "
+                  f"{counts.get('json-ld', 0)}/{counts.get('microdata', 0)}/"
+                  f"{counts.get('rdfa', 0)}/{counts.get('opengraph', 0)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: débit de l'étage d'extraction, threads contre pool de processus
+
+"Avant" extrait les pages du corpus hors ligne dans des threads (le GIL
+limite l'extraction à un cœur); "après" les soumet à un ParsePool de
+1 à N processus depuis autant de threads. Le débit est donné en pages par
+seconde et par cœur effectivement disponible, avec la taille moyenne du
+résultat sérialisé qui revient du processus worker.
+
+Usage:
+    python -m benchmarks.bench_parse_pool [--processes 4] [--rounds 2] [--max-kb 1500]
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import generate_corpus
+from scrapers.parse_pool import ParsePool, extract_page_data
+from scrapers.schema_scraper import SchemaScraper
+
+BASE_URL = 'https://shop.example/'
+
+
+def run(extract, pages: list, threads: int) -> float:
+    """Extrait toutes les pages avec `threads` threads et retourne la durée"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda html: extract(BASE_URL, html), pages))
+    elapsed = time.perf_counter() - start
+    assert all(result['schema_types'] for result in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--processes', type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument('--rounds', type=int, default=2, help="Passages sur le corpus")
+    parser.add_argument('--max-kb', type=int, default=1500, help="Taille maximale des pages retenues")
+    args = parser.parse_args()
+
+    pages = [html for _, html in generate_corpus() if len(html) <= args.max_kb * 1024] * args.rounds
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+    # Les extractions écrivent leur journal sur stdout: on le coupe au niveau du
+    # descripteur pour que les processus workers héritent aussi de la redirection
+    report = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    sys.stdout.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+    scraper = SchemaScraper()
+    payload = sum(len(pickle.dumps(extract_page_data(BASE_URL, html))) for html in pages) / len(pages)
+
+    print(f"{len(pages)} pages, {cores} cœur(s) disponible(s), résultat sérialisé moyen: {payload / 1024:.0f} Ko",
+          file=report)
+    print(f"{'Mode':<22}{'Temps (s)':>10}{'Pages/s':>9}{'Pages/s/cœur':>14}", file=report)
+
+    elapsed = run(scraper._extract_page_data, pages, args.processes)
+    rate = len(pages) / elapsed
+    print(f"{'avant (threads)':<22}{elapsed:>10.2f}{rate:>9.1f}{rate:>14.1f}", file=report)
+
+    for processes in sorted({1, args.processes}):
+        pool = ParsePool(processes)
+        pool.extract(BASE_URL, pages[0])  # démarrage des processus hors mesure
+        elapsed = run(pool.extract, pages, processes)
+        pool.close()
+        rate = len(pages) / elapsed
+        used = min(processes, cores)
+        print(f"{f'après ({processes} processus)':<22}{elapsed:>10.2f}{rate:>9.1f}{rate / used:>14.1f}",
+              file=report)
+
+    report.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: débit par hôte, concurrence et repli avec l'ordonnanceur de politesse
+
+Trois hôtes locaux servent chacun des pages: "boutique" répond normalement,
+"limite" répond 429 (Retry-After: 1) à ses trois premières requêtes, "lent" déclare
+un Crawl-delay dans robots.txt. "Avant" analyse les URLs sans ordonnanceur,
+"après" avec un PolitenessScheduler (débit, rafale et Crawl-delay réglés
+par les options).
+
+Usage:
+    python -m benchmarks.bench_politeness [--pages 8] [--rate 4] [--workers 8]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.corpus import generate_page
+from benchmarks.servers import MultiHostServer, ScriptedRoute
+from scrapers.politeness import PolitenessScheduler
+from scrapers.schema_scraper import SchemaScraper
+from utils.cache_backends import MemoryCacheBackend
+from utils.page_store import PageStore
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def build_hosts(pages: int, crawl_delay: float) -> dict:
+    """Routes des trois hôtes"""
+    page = (200, HTML, generate_page('article-blog', 20).encode('utf-8'))
+    too_many = (429, {**HTML, 'Retry-After': '1'}, b'<html><body>slow down</body></html>')
+    limited = ScriptedRoute([too_many] * 3 + [page])
+    return {
+        'boutique': {f'/p{i}': page for i in range(pages)},
+        'limite': {'/robots.txt': (200, {'Content-Type': 'text/plain'}, b'User-agent: *\nDisallow:\n'),
+                   **{f'/p{i}': limited for i in range(pages)}},
+        'lent': {'/robots.txt': (200, {'Content-Type': 'text/plain'},
+                                 f'User-agent: *\nCrawl-delay: {crawl_delay}\n'.encode('utf-8')),
+                 **{f'/p{i}': page for i in range(pages)}},
+    }
+
+
+def min_interval(times: list) -> float:
+    """Plus petit écart entre deux requêtes consécutives (ms)"""
+    times = sorted(times)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    return min(gaps) * 1000 if gaps else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=8, help="Pages par hôte")
+    parser.add_argument('--rate', type=float, default=4.0, help="Requêtes par seconde et par hôte")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--crawl-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{'Mode':<8}{'Hôte':<10}{'Requêtes':>9}{'Concurrence max':>17}{'Écart min (ms)':>16}{'Pages OK':>10}")
+    for mode in ('avant', 'après'):
+        scheduler = None
+        if mode == 'après':
+            scheduler = PolitenessScheduler(requests_per_second=args.rate, burst=1, max_concurrent=args.workers,
+                                            max_per_host=2, respect_crawl_delay=True)
+
+        with MultiHostServer(build_hosts(args.pages, args.crawl_delay), delay=0.02) as hosts:
+            scraper = SchemaScraper(page_store=PageStore(MemoryCacheBackend()), scheduler=scheduler)
+            if mode == 'avant':
+                scraper.scheduler = None
+            urls = [hosts.url(name, f'/p{i}') for i in range(args.pages) for name in hosts.servers]
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = scraper.analyze_urls(urls, max_workers=args.workers, deadline=120)
+            elapsed = time.perf_counter() - start
+
+            for name in hosts.servers:
+                host_url = hosts.url(name)
+                ok = sum(1 for result in results if result['url'].startswith(host_url) and result['schema_types'])
+                page_times = [t for t, path in hosts.request_log[name] if path != '/robots.txt']
+                print(f"{mode:<8}{name:<10}{len(page_times):>9}{hosts.max_in_flight[name]:>17}"
+                      f"{min_interval(page_times):>16.0f}{ok:>10}")
+            print(f"{'':<8}durée totale: {elapsed:.2f}s")
+
+        if scheduler:
+            for host, stats in scheduler.snapshot().items():
+                print(f"{'':<8}{host}: {stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: rejeu d'une archive HTTP enregistrée avec profils de panne
+
+Une session réelle est d'abord enregistrée contre des hôtes locaux
+("boutique" et "lent" pour les pages, "serp" pour ValueSERP) avec un
+RecordingTransport. Les hôtes sont ensuite arrêtés et chaque profil rejoue
+l'archive: analyse des pages avec 1 puis N threads (la latence injectée
+montre le gain de la concurrence) et recherches ValueSERP avec retry (les
+rafales de 503 montrent le nombre de tentatives, y compris les essais du
+scraper avec les User-Agents suivants). Chaque profil est
+rejoué deux fois pour vérifier que les compteurs sont reproductibles.
+
+Usage:
+    python -m benchmarks.bench_replay [--pages 10] [--searches 6] [--workers 5] [--archive chemin.zip]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from api.valueserp import ValueSERPAPIWithRetry
+from benchmarks.corpus import generate_page, generate_serp_response, generate_yoast_page
+from benchmarks.servers import MultiHostServer
+from config import Config
+from scrapers.schema_scraper import SchemaScraper
+from utils.cache_backends import MemoryCacheBackend
+from utils.http_client import HttpClient
+from utils.http_fixtures import FailureProfile, RecordingTransport, ReplayTransport
+from utils.page_store import PageStore
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+JSON = {'Content-Type': 'application/json'}
+
+
+def build_hosts(pages: int, searches: int) -> dict:
+    """Routes des hôtes enregistrés"""
+    product_page = (200, HTML, generate_page('article-blog', 20).encode('utf-8'))
+    article_page = (200, HTML, generate_yoast_page(paragraphs=20, comments=5).encode('utf-8'))
+    serp = (200, JSON, json.dumps(generate_serp_response('chaussure trail', [
+        f'https://site{i}.example/page' for i in range(10)
+    ])).encode('utf-8'))
+    return {
+        'boutique': {f'/p{i}': product_page for i in range(pages)},
+        'lent': {f'/p{i}': article_page for i in range(pages)},
+        'serp': {'/search': serp},
+    }
+
+
+def run_session(http_client: HttpClient, urls: list, serp_url: str, searches: int, workers: int) -> dict:
+    """Analyse les pages puis lance les recherches ValueSERP"""
+    scraper = SchemaScraper(http_client=http_client, page_store=PageStore(MemoryCacheBackend()))
+    start = time.perf_counter()
+    url_results = scraper.analyze_urls(urls, max_workers=workers, deadline=120)
+    pages_seconds = time.perf_counter() - start
+
+    client = ValueSERPAPIWithRetry('bench-key', http_client=http_client, base_url=serp_url)
+    client.base_delay = 0.05
+    start = time.perf_counter()
+    serp_results = [client.search_google_with_retry(f'mot-cle {i}') for i in range(searches)]
+    serp_seconds = time.perf_counter() - start
+
+    return {
+        'pages_ok': sum(1 for result in url_results if result['schema_types']),
+        'pages_seconds': pages_seconds,
+        'serp_ok': sum(1 for result in serp_results if result and 'error' not in result),
+        'serp_seconds': serp_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=10, help="Pages par hôte")
+    parser.add_argument('--searches', type=int, default=6)
+    parser.add_argument('--workers', type=int, default=5)
+    parser.add_argument('--archive', help="Archive à écrire (défaut: fichier temporaire)")
+    args = parser.parse_args()
+
+    # Seul le transport est mesuré: pas de régulation par hôte
+    Config.POLITENESS_ENABLED = False
+    archive = args.archive or os.path.join(tempfile.mkdtemp(), 'http.zip')
+
+    with MultiHostServer(build_hosts(args.pages, args.searches)) as hosts:
+        urls = [hosts.url(name, f'/p{i}') for i in range(args.pages) for name in ('boutique', 'lent')]
+        serp_url = hosts.url('serp', '/search')
+        slow_host = hosts.url('lent').split('/')[2]
+
+        recorder = HttpClient(transport=RecordingTransport(archive))
+        recorded = run_session(recorder, urls, serp_url, args.searches, args.workers)
+        recorder.close()
+
+    print(f"Enregistrement: {len(urls)} pages + {args.searches} recherches, "
+          f"archive {os.path.getsize(archive) / 1024:.0f} Ko ({recorded['pages_ok']} pages OK)\n")
+
+    profiles = [
+        ('sans latence', FailureProfile()),
+        ('latence 50 ms', FailureProfile(latency=0.05, jitter=0.02, seed=1)),
+        ('hôte lent +200 ms', FailureProfile(latency=0.05, slow_hosts={slow_host: 0.2}, seed=1)),
+        ('rafales 503 (2 sur 3)', FailureProfile(burst_every=3, burst_length=2, retry_after=0)),
+    ]
+
+    print(f"{'Profil':<24}{'Threads':>8}{'Pages (s)':>11}{'Pages OK':>10}{'SERP (s)':>10}"
+          f"{'SERP OK':>9}{'Requêtes':>10}{'503 injectés':>14}")
+    for label, profile in profiles:
+        for workers in sorted({1, args.workers}):
+            counters = []
+            for _ in range(2):
+                profile.reset()
+                transport = ReplayTransport(archive, profile=profile)
+                client = HttpClient(transport=transport)
+                stats = run_session(client, urls, serp_url, args.searches, workers)
+                client.close()
+                counters.append((stats['pages_ok'], stats['serp_ok'], transport.requests,
+                                 transport.injected_failures))
+            stable = '' if counters[0] == counters[1] else '  NON REPRODUCTIBLE'
+            print(f"{label:<24}{workers:>8}{stats['pages_seconds']:>11.2f}{stats['pages_ok']:>10}"
+                  f"{stats['serp_seconds']:>10.2f}{stats['serp_ok']:>9}{transport.requests:>10}"
+                  f"{transport.injected_failures:>14}{stable}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Scénarios hors ligne du client ValueSERP contre un serveur de réponses factices
+
+Chaque scénario rejoue une séquence 200/429/503 et vérifie le nombre
+d'appels, le respect de Retry-After, le plafond de durée des retries et la
+réutilisation des connexions du pool.
+
+Usage:
+    python -m benchmarks.bench_valueserp_retry [--searches 20]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from api.valueserp import ValueSERPAPI, ValueSERPAPIWithRetry
+from benchmarks.servers import LocalServer, ScriptedRoute, rate_limited, serp_ok, unavailable
+from utils.http_client import HttpClient
+
+SCENARIOS = [
+    # (libellé, réponses, statut attendu, appels attendus)
+    ('200 direct', [serp_ok()], None, 1),
+    ('429 Retry-After 1s puis 200', [rate_limited(1), serp_ok()], None, 2),
+    ('503 sans en-tête puis 200', [unavailable(), serp_ok()], None, 2),
+    ('503 Retry-After 0 x4', [unavailable(0)], 503, 4),
+    ('429 Retry-After au-delà du plafond', [rate_limited(3600)], 429, 1),
+]
+
+
+def run_scenario(responses, client_cls=ValueSERPAPIWithRetry) -> dict:
+    """Exécute une recherche contre une séquence de réponses"""
+    route = ScriptedRoute(responses)
+    with LocalServer({'/search': route}) as server:
+        client = client_cls('bench-key', http_client=HttpClient(), base_url=server.url('/search'))
+        client.base_delay = 0.1
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if client_cls is ValueSERPAPIWithRetry:
+                result = client.search_google_with_retry('test', num=10)
+            else:
+                result = client.search_google('test', num=10)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'result': result,
+        'calls': route.calls,
+        'handshakes': server.connections,
+        'seconds': elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--searches', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'Scénario':<38}{'Statut':>8}{'Appels':>8}{'Attendu':>9}{'Temps (s)':>11}")
+    for label, responses, expected_status, expected_calls in SCENARIOS:
+        stats = run_scenario(responses)
+        status = (stats['result'] or {}).get('status_code') or 200
+        ok = status == (expected_status or 200) and stats['calls'] == expected_calls
+        print(f"{label:<38}{status:>8}{stats['calls']:>8}{expected_calls:>9}"
+              f"{stats['seconds']:>11.3f}  {'OK' if ok else 'ÉCHEC'}")
+
+    # Client simple: mêmes règles de retry, résultat None en cas d'échec
+    stats = run_scenario([rate_limited(1), serp_ok()], client_cls=ValueSERPAPI)
+    print(f"{'ValueSERPAPI 429 puis 200':<38}{'200' if stats['result'] else 'None':>8}"
+          f"{stats['calls']:>8}{2:>9}{stats['seconds']:>11.3f}")
+
+    # Réutilisation des connexions keep-alive sur plusieurs recherches
+    route = ScriptedRoute([serp_ok()])
+    with LocalServer({'/search': route}) as server:
+        client = ValueSERPAPIWithRetry('bench-key', http_client=HttpClient(), base_url=server.url('/search'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.searches):
+                client.search_google_with_retry('test')
+        print(f"\n{args.searches} recherches: {server.requests} requêtes, {server.connections} handshake(s)")
+
+
+if __name__ == '__main__':
+    main()
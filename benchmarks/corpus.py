@@ -0,0 +1,356 @@
+"""
+Corpus HTML hors ligne pour les benchmarks d'extraction
+
+Les pages sont générées de façon déterministe (aucun accès réseau) et
+reproduisent la structure de pages e-commerce réelles: @graph JSON-LD,
+cartes produits en microdata imbriquées (Product > Offer, AggregateRating),
+RDFa, balises OpenGraph et beaucoup de balisage sans données structurées.
+Les pages "jsonld-*" décrivent leurs produits uniquement en JSON-LD, les
+pages "yoast-*" reproduisent le @graph WordPress/Yoast d'un article, et
+generate_serp_response() produit des réponses ValueSERP réalistes.
+"""
+import json
+import random
+from typing import List, Optional, Tuple
+
+# (nom, nombre de cartes produits, microdata): ~1 Ko de HTML par carte
+CORPUS_PAGES = [
+    ('article-blog', 20, True),
+    ('categorie-100ko', 100, True),
+    ('categorie-1mo', 1000, True),
+    ('categorie-2mo', 2000, True),
+    ('categorie-3mo', 3000, True),
+    ('jsonld-100ko', 100, False),
+    ('jsonld-1mo', 1000, False),
+    ('jsonld-3mo', 3000, False),
+]
+
+_WORDS = (
+    'chaussure running légère amorti semelle maille respirante femme homme '
+    'promo livraison gratuite retour avis client taille pointure couleur noir '
+    'blanc bleu rouge stock disponible magasin collection nouveauté'
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _head(name: str, rng: random.Random, extra_json_ld: Optional[dict] = None) -> str:
+    graph = {
+        '@context': 'https://schema.org',
+        '@graph': [
+            {'@type': 'Organization', '@id': 'https://shop.example/#org', 'name': 'Shop Example',
+             'url': 'https://shop.example/', 'logo': 'https://shop.example/logo.png'},
+            {'@type': 'WebSite', '@id': 'https://shop.example/#website', 'url': 'https://shop.example/',
+             'potentialAction': {'@type': 'SearchAction',
+                                 'target': 'https://shop.example/search?q={q}', 'query-input': 'required name=q'}},
+            {'@type': 'BreadcrumbList', 'itemListElement': [
+                {'@type': 'ListItem', 'position': i, 'name': f'Niveau {i}',
+                 'item': f'https://shop.example/{name}/{i}'} for i in range(1, 4)
+            ]},
+        ]
+    }
+    faq = {
+        '@context': 'https://schema.org', '@type': 'FAQPage',
+        'mainEntity': [
+            {'@type': 'Question', 'name': f'Question {i} ?',
+             'acceptedAnswer': {'@type': 'Answer', 'text': _text(rng, 30)}} for i in range(5)
+        ]
+    }
+    return (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+        f'<title>{name} - Shop Example</title>'
+        f'<meta property="og:title" content="{name}">'
+        '<meta property="og:type" content="website">'
+        f'<meta property="og:url" content="https://shop.example/{name}">'
+        '<meta property="og:image" content="https://shop.example/og.png">'
+        '<link rel="stylesheet" href="/static/app.css">'
+        f'<script type="application/ld+json">{json.dumps(graph, ensure_ascii=False)}</script>'
+        f'<script type="application/ld+json">{json.dumps(faq, ensure_ascii=False)}</script>'
+        + (f'<script type="application/ld+json">{json.dumps(extra_json_ld, ensure_ascii=False)}</script>'
+           if extra_json_ld else '') +
+        '<script>window.dataLayer = window.dataLayer || []; function gtag(){dataLayer.push(arguments);}</script>'
+        '</head>'
+    )
+
+
+def _product_card(i: int, rng: random.Random, microdata: bool = True) -> str:
+    price = f"{rng.randint(20, 200)}.{rng.randint(0, 99):02d}"
+    if not microdata:
+        return (
+            f'<div class="card col-3"><a href="/p/{i}" class="card-link"><img src="/img/{i}.jpg" '
+            f'alt="Produit {i}" loading="lazy" width="300" height="300"></a>'
+            f'<h3 class="card-title">Produit {i} {_text(rng, 4)}</h3>'
+            f'<p class="card-desc">{_text(rng, 25)}</p>'
+            f'<div class="rating">{rng.randint(30, 50) / 10}/5 ({rng.randint(1, 900)} avis)</div>'
+            f'<span class="price">{price} €</span>'
+            f'<ul class="swatches">' + ''.join(
+                f'<li class="swatch swatch-{c}"><span>{c}</span></li>' for c in ('noir', 'blanc', 'bleu')
+            ) + '</ul>'
+            f'<button class="btn btn-primary" data-id="{i}">Ajouter au panier</button>'
+            f'</div>'
+        )
+    return (
+        f'<div class="card col-3" itemscope itemtype="https://schema.org/Product">'
+        f'<a href="/p/{i}" class="card-link"><img itemprop="image" src="/img/{i}.jpg" alt="Produit {i}" '
+        f'loading="lazy" width="300" height="300"></a>'
+        f'<h3 class="card-title" itemprop="name">Produit {i} {_text(rng, 4)}</h3>'
+        f'<meta itemprop="sku" content="SKU-{i:06d}">'
+        f'<p class="card-desc" itemprop="description">{_text(rng, 25)}</p>'
+        f'<div itemprop="aggregateRating" itemscope itemtype="https://schema.org/AggregateRating">'
+        f'<span itemprop="ratingValue">{rng.randint(30, 50) / 10}</span>/5 '
+        f'(<span itemprop="reviewCount">{rng.randint(1, 900)}</span> avis)</div>'
+        f'<div itemprop="offers" itemscope itemtype="https://schema.org/Offer">'
+        f'<span class="price" itemprop="price" content="{price}">{price} €</span>'
+        f'<meta itemprop="priceCurrency" content="EUR">'
+        f'<link itemprop="availability" href="https://schema.org/InStock">'
+        f'</div>'
+        f'<ul class="swatches">' + ''.join(
+            f'<li class="swatch swatch-{c}"><span>{c}</span></li>' for c in ('noir', 'blanc', 'bleu')
+        ) + '</ul>'
+        f'<button class="btn btn-primary" data-id="{i}">Ajouter au panier</button>'
+        f'</div>'
+    )
+
+
+def generate_page(name: str, products: int, microdata: bool = True, seed: int = 42) -> str:
+    """
+    Génère une page e-commerce déterministe
+
+    Args:
+        name: Nom de la page (utilisé dans les URLs et le titre)
+        products: Nombre de cartes produits
+        microdata: Cartes balisées en microdata; sinon les produits sont
+            décrits par un ItemList JSON-LD
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        HTML de la page
+    """
+    rng = random.Random(f"{seed}-{name}")
+    item_list = None
+    if not microdata:
+        item_list = {
+            '@context': 'https://schema.org', '@type': 'ItemList',
+            'itemListElement': [
+                {'@type': 'ListItem', 'position': i + 1,
+                 'item': {'@type': 'Product', 'name': f'Produit {i}', 'sku': f'SKU-{i:06d}',
+                          'offers': {'@type': 'Offer', 'price': rng.randint(20, 200), 'priceCurrency': 'EUR'}}}
+                for i in range(min(products, 50))
+            ]
+        }
+    parts = [_head(name, rng, item_list), '<body>']
+    parts.append('<nav class="menu"><ul>' + ''.join(
+        f'<li><a href="/c/{i}">{_text(rng, 2)}</a></li>' for i in range(40)
+    ) + '</ul></nav>')
+
+    # Bloc RDFa (fil d'Ariane)
+    parts.append(
+        '<ol vocab="https://schema.org/" typeof="BreadcrumbList">' + ''.join(
+            f'<li property="itemListElement" typeof="ListItem">'
+            f'<a property="item" typeof="WebPage" href="/{name}/{i}"><span property="name">Niveau {i}</span></a>'
+            f'<meta property="position" content="{i}"></li>' for i in range(1, 4)
+        ) + '</ol>'
+    )
+
+    parts.append('<main class="grid">')
+    parts.extend(_product_card(i, rng, microdata) for i in range(products))
+    parts.append('</main>')
+    parts.append('<footer>' + ''.join(f'<p>{_text(rng, 20)}</p>' for _ in range(10)) + '</footer>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def generate_malformed_page(products: int = 50) -> str:
+    """Page au HTML cassé: balises non fermées, fermetures orphelines, attributs tronqués"""
+    html = generate_page('malformee', products)
+    html = html.replace('</div>', '', products // 2)
+    html = html.replace('</li>', '</div></li>', 20)
+    return html.replace('<main class="grid">', '<main class="grid"><table><tr><td><p class=">', 1)
+
+
+def generate_corpus() -> List[Tuple[str, str]]:
+    """
+    Génère le corpus complet
+
+    Returns:
+        Liste de (nom, html)
+    """
+    corpus = [(name, generate_page(name, products, microdata)) for name, products, microdata in CORPUS_PAGES]
+    corpus.append(('malformee', generate_malformed_page()))
+    corpus.append(('yoast-article', generate_yoast_page()))
+    corpus.append(('yoast-commentaires', generate_yoast_page('yoast-commentaires', paragraphs=300, comments=500)))
+    return corpus
+
+
+def _yoast_graph(name: str, rng: random.Random, comments: int) -> dict:
+    """@graph WordPress/Yoast: entités liées par @id, commentaires en Comment"""
+    site = 'https://blog.example'
+    page_url = f'{site}/{name}/'
+    return {
+        '@context': 'https://schema.org',
+        '@graph': [
+            {'@type': 'Article', '@id': f'{page_url}#article', 'isPartOf': {'@id': page_url},
+             'author': {'name': 'Camille', '@id': f'{site}/#/schema/person/1'},
+             'headline': f'{name} {_text(rng, 6)}', 'datePublished': '2026-03-02T08:00:00+00:00',
+             'dateModified': '2026-09-14T10:30:00+00:00', 'mainEntityOfPage': {'@id': page_url},
+             'wordCount': rng.randint(800, 4000), 'commentCount': comments,
+             'publisher': {'@id': f'{site}/#organization'}, 'image': {'@id': f'{page_url}#primaryimage'},
+             'thumbnailUrl': f'{site}/wp-content/uploads/{name}.jpg',
+             'keywords': _text(rng, 8).split(), 'articleSection': ['Guides', 'Running'],
+             'inLanguage': 'fr-FR',
+             'potentialAction': [{'@type': 'CommentAction', 'name': 'Comment',
+                                  'target': [f'{page_url}#respond']}],
+             'comment': [
+                 {'@type': 'Comment', '@id': f'{page_url}#comment-{i}', 'url': f'{page_url}#comment-{i}',
+                  'datePublished': '2026-09-01T12:00:00+00:00', 'description': _text(rng, 20),
+                  'author': {'@type': 'Person', 'name': f'Lecteur {i}'}}
+                 for i in range(comments)
+             ]},
+            {'@type': 'WebPage', '@id': page_url, 'url': page_url, 'name': f'{name} - Blog Example',
+             'isPartOf': {'@id': f'{site}/#website'}, 'primaryImageOfPage': {'@id': f'{page_url}#primaryimage'},
+             'breadcrumb': {'@id': f'{page_url}#breadcrumb'}, 'inLanguage': 'fr-FR'},
+            {'@type': 'ImageObject', 'inLanguage': 'fr-FR', '@id': f'{page_url}#primaryimage',
+             'url': f'{site}/wp-content/uploads/{name}.jpg', 'width': 1200, 'height': 675},
+            {'@type': 'BreadcrumbList', '@id': f'{page_url}#breadcrumb', 'itemListElement': [
+                {'@type': 'ListItem', 'position': 1, 'name': 'Accueil', 'item': f'{site}/'},
+                {'@type': 'ListItem', 'position': 2, 'name': 'Guides', 'item': f'{site}/guides/'},
+                {'@type': 'ListItem', 'position': 3, 'name': name},
+            ]},
+            {'@type': 'WebSite', '@id': f'{site}/#website', 'url': f'{site}/', 'name': 'Blog Example',
+             'publisher': {'@id': f'{site}/#organization'},
+             'potentialAction': [{'@type': 'SearchAction',
+                                  'target': {'@type': 'EntryPoint', 'urlTemplate': f'{site}/?s={{search_term_string}}'},
+                                  'query-input': 'required name=search_term_string'}]},
+            {'@type': 'Organization', '@id': f'{site}/#organization', 'name': 'Blog Example', 'url': f'{site}/',
+             'logo': {'@type': 'ImageObject', '@id': f'{site}/#/schema/logo/image/',
+                      'url': f'{site}/logo.png', 'width': 512, 'height': 512},
+             'sameAs': ['https://www.facebook.com/blogexample', 'https://x.com/blogexample']},
+            {'@type': 'Person', '@id': f'{site}/#/schema/person/1', 'name': 'Camille',
+             'image': {'@type': 'ImageObject', '@id': f'{site}/#/schema/person/image/',
+                       'url': f'{site}/avatar.jpg'},
+             'url': f'{site}/author/camille/'},
+        ]
+    }
+
+
+def generate_yoast_page(name: str = 'yoast-article', paragraphs: int = 120, comments: int = 40,
+                        seed: int = 42) -> str:
+    """
+    Génère un article WordPress avec le @graph JSON-LD de Yoast SEO
+
+    Args:
+        name: Nom de l'article (utilisé dans les URLs)
+        paragraphs: Nombre de paragraphes du contenu
+        comments: Nombre de commentaires (dans le HTML et dans le @graph)
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        HTML de la page
+    """
+    rng = random.Random(f"{seed}-{name}")
+    graph = json.dumps(_yoast_graph(name, rng, comments), ensure_ascii=False)
+    parts = [
+        '<!DOCTYPE html><html lang="fr-FR"><head><meta charset="UTF-8">'
+        f'<title>{name} - Blog Example</title>'
+        '<meta name="robots" content="index, follow, max-image-preview:large">'
+        f'<link rel="canonical" href="https://blog.example/{name}/">'
+        '<meta property="og:locale" content="fr_FR"><meta property="og:type" content="article">'
+        f'<meta property="og:title" content="{name}">'
+        f'<meta property="og:url" content="https://blog.example/{name}/">'
+        '<meta property="article:published_time" content="2026-03-02T08:00:00+00:00">'
+        '<meta name="twitter:card" content="summary_large_image">'
+        f'<script type="application/ld+json" class="yoast-schema-graph">{graph}</script>'
+        + ''.join(f'<link rel="stylesheet" id="wp-block-{i}-css" href="/wp-includes/css/{i}.css" media="all">'
+                  for i in range(15)) +
+        '<script src="/wp-includes/js/jquery/jquery.min.js" id="jquery-core-js"></script>'
+        '</head><body class="post-template-default single single-post">',
+        '<header class="site-header"><nav class="main-navigation"><ul class="menu">' + ''.join(
+            f'<li class="menu-item menu-item-{i}"><a href="/c/{i}/">{_text(rng, 2)}</a></li>' for i in range(25)
+        ) + '</ul></nav></header>',
+        '<main id="main" class="site-main"><article class="post type-post status-publish">'
+        f'<h1 class="entry-title">{name}</h1><div class="entry-content">',
+    ]
+    for i in range(paragraphs):
+        if i % 15 == 0:
+            parts.append(f'<h2 class="wp-block-heading" id="section-{i}">{_text(rng, 5)}</h2>')
+        parts.append(f'<p>{_text(rng, 60)}</p>')
+        if i % 20 == 10:
+            parts.append(f'<figure class="wp-block-image size-large"><img decoding="async" width="1024" '
+                         f'height="576" src="/wp-content/uploads/{name}-{i}.jpg" alt="{_text(rng, 3)}" '
+                         f'class="wp-image-{i}" loading="lazy"></figure>')
+    parts.append('</div></article>')
+    parts.append('<section id="comments" class="comments-area"><ol class="comment-list">' + ''.join(
+        f'<li id="comment-{i}" class="comment"><article class="comment-body">'
+        f'<footer class="comment-meta"><b class="fn">Lecteur {i}</b></footer>'
+        f'<div class="comment-content"><p>{_text(rng, 20)}</p></div></article></li>' for i in range(comments)
+    ) + '</ol></section></main>')
+    parts.append('<footer class="site-footer">' + ''.join(f'<p>{_text(rng, 15)}</p>' for _ in range(5)) + '</footer>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def generate_serp_response(keyword: str, urls: List[str], seed: int = 42) -> dict:
+    """
+    Réponse JSON ValueSERP réaliste pour une recherche Google
+
+    Args:
+        keyword: Mot-clé recherché
+        urls: URLs des résultats organiques, dans l'ordre des positions
+        seed: Graine du générateur pseudo-aléatoire
+
+    Returns:
+        Dictionnaire au format de l'API ValueSERP
+    """
+    rng = random.Random(f"{seed}-{keyword}")
+    return {
+        'request_info': {'success': True, 'credits_used': 1, 'credits_remaining': 999},
+        'search_metadata': {'created_at': '2026-10-01T09:00:00.000Z', 'processed_at': '2026-10-01T09:00:01.200Z',
+                            'total_time_taken': 1.2, 'engine_url': 'https://www.google.fr/search?q=' + keyword},
+        'search_parameters': {'q': keyword, 'location': 'France', 'gl': 'fr', 'hl': 'fr',
+                              'google_domain': 'google.fr', 'num': str(len(urls)), 'output': 'json'},
+        'search_information': {'original_query_yields_zero_results': False,
+                               'total_results': rng.randint(10 ** 5, 10 ** 8), 'time_taken_displayed': 0.41},
+        'organic_results': [
+            {'position': position, 'title': f'{keyword} {_text(rng, 5)}', 'link': url,
+             'domain': url.split('/')[2], 'displayed_link': url.split('?')[0],
+             'snippet': _text(rng, 30), 'prerender': False, 'block_position': position,
+             'rich_snippet': {'top': {'detected_extensions': {'rating': 4.5, 'reviews': rng.randint(10, 900)}}}
+             if position % 3 == 0 else {}}
+            for position, url in enumerate(urls, 1)
+        ],
+        'related_searches': [{'query': f'{keyword} {_text(rng, 2)}'} for _ in range(8)],
+        'pagination': {'current': 1, 'next': 'https://www.google.fr/search?q=' + keyword + '&start=10'},
+    }
+
+
+def generate_microdata_stress_page(itemprops: int = 10000, depth: int = 2, props_per_item: int = 5) -> str:
+    """
+    Page de stress microdata: chaînes d'itemscopes imbriqués
+
+    Args:
+        itemprops: Nombre total approximatif d'attributs itemprop
+        depth: Profondeur de chaque chaîne d'items imbriqués
+        props_per_item: Propriétés textuelles par item
+
+    Returns:
+        HTML de la page
+    """
+    rng = random.Random(f"stress-{itemprops}-{depth}")
+    per_chain = depth * (props_per_item + 1)
+    parts = ['<!DOCTYPE html><html><head><title>stress</title></head><body><main>']
+
+    for chain in range(max(1, itemprops // per_chain)):
+        opening = []
+        for level in range(depth):
+            prop = ' itemprop="isRelatedTo"' if level else ''
+            opening.append(
+                f'<div{prop} itemscope itemtype="https://schema.org/Thing">' + ''.join(
+                    f'<span itemprop="p{k}">{_text(rng, 2)}</span>' for k in range(props_per_item)
+                )
+            )
+        parts.append(''.join(opening) + '</div>' * depth)
+
+    parts.append('</main></body></html>')
+    return ''.join(parts)
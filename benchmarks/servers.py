@@ -0,0 +1,238 @@
+"""
+Serveurs HTTP locaux utilisés par les benchmarks
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Réponse: (status, headers, body)
+Response = Tuple[int, Dict[str, str], bytes]
+Route = Union[Response, Callable[[BaseHTTPRequestHandler], Response]]
+
+
+class _CountingHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP qui compte les connexions TCP acceptées"""
+
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+        self.requests = 0
+        self.counter_lock = threading.Lock()
+
+    def get_request(self):
+        request = super().get_request()
+        with self.counter_lock:
+            self.connections += 1
+        return request
+
+    def handle_error(self, request, client_address):
+        # Un client qui abandonne une réponse en cours coupe la connexion: ce n'est pas une erreur
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class LocalServer:
+    """
+    Serveur HTTP/1.1 keep-alive exécuté dans un thread d'arrière-plan
+
+    Usage:
+        with LocalServer({'/page': (200, {'Content-Type': 'text/html'}, b'...')}) as server:
+            requests.get(server.url('/page'))
+            print(server.connections)
+    """
+
+    def __init__(self, routes: Dict[str, Route], host: str = '127.0.0.1', port: int = 0):
+        self.routes = routes
+        self._server = _CountingHTTPServer((host, port), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Une seule écriture par réponse: évite la latence Nagle/ACK retardé en keep-alive
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def _respond(self, send_body: bool):
+                with server._server.counter_lock:
+                    server._server.requests += 1
+
+                route = server.routes.get(self.path.split('?')[0])
+                if route is None:
+                    status, headers, body = 404, {'Content-Type': 'text/plain'}, b'not found'
+                elif callable(route):
+                    status, headers, body = route(self)
+                else:
+                    status, headers, body = route
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def connections(self) -> int:
+        """Nombre de connexions TCP (donc de handshakes) acceptées"""
+        return self._server.connections
+
+    @property
+    def requests(self) -> int:
+        """Nombre de requêtes HTTP servies"""
+        return self._server.requests
+
+    def reset_counters(self):
+        with self._server.counter_lock:
+            self._server.connections = 0
+            self._server.requests = 0
+
+    def url(self, path: str = '/') -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self) -> 'LocalServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'LocalServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class ScriptedRoute:
+    """
+    Route qui rejoue une séquence de réponses, la dernière étant répétée
+
+    Usage:
+        route = ScriptedRoute([rate_limited(1), serp_ok()])
+        with LocalServer({'/search': route}) as server:
+            ...
+        print(route.calls)
+    """
+
+    def __init__(self, responses: Sequence[Response]):
+        self.responses: List[Response] = list(responses)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, handler: BaseHTTPRequestHandler) -> Response:
+        with self._lock:
+            index = min(self.calls, len(self.responses) - 1)
+            self.calls += 1
+        return self.responses[index]
+
+
+class MultiHostServer:
+    """
+    Plusieurs hôtes locaux (un LocalServer par hôte, ports distincts)
+
+    Chaque requête est journalisée (horodatage, chemin) et la concurrence
+    maximale atteinte est relevée par hôte, pour vérifier débits et plafonds
+    côté serveur.
+
+    Usage:
+        with MultiHostServer({'a': routes_a, 'b': routes_b}) as hosts:
+            requests.get(hosts.url('a', '/page'))
+            print(hosts.request_log['a'], hosts.max_in_flight['a'])
+    """
+
+    def __init__(self, hosts: Dict[str, Dict[str, Route]], delay: float = 0.0):
+        """
+        Args:
+            hosts: Routes de chaque hôte, par nom d'hôte
+            delay: Temps de réponse simulé de chaque requête (secondes)
+        """
+        self.delay = delay
+        self.request_log: Dict[str, List[Tuple[float, str]]] = {name: [] for name in hosts}
+        self.max_in_flight: Dict[str, int] = {name: 0 for name in hosts}
+        self._in_flight: Dict[str, int] = {name: 0 for name in hosts}
+        self._lock = threading.Lock()
+        self.servers = {
+            name: LocalServer({path: self._recording(name, route) for path, route in routes.items()})
+            for name, routes in hosts.items()
+        }
+
+    def _recording(self, name: str, route: Route) -> Callable[[BaseHTTPRequestHandler], Response]:
+        def handle(handler: BaseHTTPRequestHandler) -> Response:
+            with self._lock:
+                self.request_log[name].append((time.monotonic(), handler.path))
+                self._in_flight[name] += 1
+                self.max_in_flight[name] = max(self.max_in_flight[name], self._in_flight[name])
+            try:
+                if self.delay:
+                    time.sleep(self.delay)
+                return route(handler) if callable(route) else route
+            finally:
+                with self._lock:
+                    self._in_flight[name] -= 1
+        return handle
+
+    def url(self, name: str, path: str = '/') -> str:
+        return self.servers[name].url(path)
+
+    def __enter__(self) -> 'MultiHostServer':
+        for server in self.servers.values():
+            server.start()
+        return self
+
+    def __exit__(self, *exc):
+        for server in self.servers.values():
+            server.stop()
+
+
+def serp_ok(organic_results: Optional[List[Dict]] = None) -> Response:
+    """Réponse ValueSERP 200 avec des résultats organiques factices"""
+    if organic_results is None:
+        organic_results = [
+            {'position': i, 'title': f'Résultat {i}', 'link': f'https://example.com/page-{i}'}
+            for i in range(1, 11)
+        ]
+    body = json.dumps({
+        'request_info': {'success': True},
+        'search_metadata': {'total_credits_used': 1},
+        'organic_results': organic_results
+    }).encode('utf-8')
+    return 200, {'Content-Type': 'application/json'}, body
+
+
+def _serp_error(status: int, message: str, retry_after: Optional[str]) -> Response:
+    headers = {'Content-Type': 'application/json'}
+    if retry_after is not None:
+        headers['Retry-After'] = str(retry_after)
+    return status, headers, json.dumps({'request_info': {'success': False, 'message': message}}).encode('utf-8')
+
+
+def rate_limited(retry_after: Optional[Union[int, str]] = None) -> Response:
+    """Réponse ValueSERP 429 (Retry-After en secondes ou date HTTP)"""
+    return _serp_error(429, 'Too many requests', retry_after)
+
+
+def unavailable(retry_after: Optional[Union[int, str]] = None) -> Response:
+    """Réponse ValueSERP 503 (Retry-After en secondes ou date HTTP)"""
+    return _serp_error(503, 'Service unavailable', retry_after)
@@ -0,0 +1,283 @@
+"""
+Suite de benchmarks hors ligne: extraction, détection des types,
+agrégation SERP et génération de schemas
+
+Aucune requête réseau: les pages (petits blogs, catégories e-commerce de
+plusieurs Mo, @graph WordPress/Yoast, listes microdata) et les réponses
+ValueSERP sont synthétiques, générées de façon déterministe par
+benchmarks.corpus (aucune page ni réponse réelle enregistrée). Chaque cas est exécuté `--repeat`
+fois; la médiane, le minimum et le maximum sont écrits dans un fichier JSON
+qui sert de référence aux exécutions suivantes (`--compare`).
+
+Usage:
+    python -m benchmarks.suite [--repeat 5] [--quick] [--only extraction]
+                               [--output benchmarks/results/latest.json]
+                               [--compare benchmarks/results/reference.json] [--threshold 0.2]
+
+Le code de sortie vaut 1 si un cas est plus lent que la référence au-delà
+du seuil (ratio des minimums).
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from analyzers.schema_analyzer import SchemaAnalyzer
+from benchmarks.corpus import generate_corpus, generate_serp_response
+from generators.schema_generator import SchemaGenerator
+from scrapers.schema_scraper import SchemaScraper
+from utils.logging_config import configure_logging
+
+BASE_URL = 'https://shop.example/'
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), 'results', 'latest.json')
+
+# Pages ignorées par --quick (les plus longues à extraire)
+QUICK_SKIP = ('categorie-2mo', 'categorie-3mo', 'jsonld-3mo')
+
+CLIENT_INFO = {
+    'company_name': 'Boutique Example',
+    'website': 'https://shop.example',
+    'description': 'Chaussures de running et équipement de trail',
+    'logo': 'https://shop.example/logo.png'
+}
+
+# Durée minimale d'une exécution mesurée
+MIN_RUN_SECONDS = 0.02
+
+# Un cas: (nom, fonction mesurée, taille des données en Ko)
+Case = Tuple[str, Callable[[], object], float]
+
+
+def _extraction_cases(scraper: SchemaScraper, corpus: List[Tuple[str, str]]) -> List[Case]:
+    """Extraction complète et mode JSON-LD seul, page par page"""
+    cases = []
+    for name, html in corpus:
+        size = len(html.encode('utf-8')) / 1024
+        cases.append((f'extraction/{name}', lambda html=html: scraper.extract_schemas(BASE_URL, html), size))
+        cases.append((f'extraction-json-ld/{name}',
+                      lambda html=html: scraper.extract_schemas(BASE_URL, html, json_ld_only=True), size))
+    return cases
+
+
+def _type_cases(scraper: SchemaScraper, corpus: List[Tuple[str, str]]) -> List[Case]:
+    """Détection des types sur les schemas déjà extraits, et traitement des @graph"""
+    cases = []
+    for name, html in corpus:
+        schemas = scraper.extract_schemas(BASE_URL, html)
+        size = len(json.dumps(schemas)) / 1024
+        cases.append((f'types/{name}', lambda schemas=schemas: scraper.get_schema_types(schemas), size))
+        if name.startswith('yoast-'):
+            # @graph brut tel que publié par Yoast, avant dépliage et déduplication
+            script = html.split('class="yoast-schema-graph">', 1)[1].split('</script>', 1)[0]
+            cases.append((f'process-json-ld/{name}',
+                          lambda script=script: scraper._process_json_ld([json.loads(script)]),
+                          len(script.encode('utf-8')) / 1024))
+    return cases
+
+
+def _aggregation_cases(scraper: SchemaScraper, corpus: List[Tuple[str, str]]) -> List[Case]:
+    """Lecture de la réponse ValueSERP puis compilation et analyse des résultats par URL"""
+    pages = [(name, scraper.extract_schemas(BASE_URL, html)) for name, html in corpus]
+    analyzer = SchemaAnalyzer()
+    cases = []
+    for count in (10, 100):
+        urls = [f'https://site{i}.example/{pages[i % len(pages)][0]}' for i in range(count)]
+        payload = json.dumps(generate_serp_response('chaussure trail', urls))
+
+        def aggregate(payload=payload):
+            organic = json.loads(payload)['organic_results']
+            url_results = []
+            for result in organic:
+                schemas = pages[(result['position'] - 1) % len(pages)][1]
+                url_results.append({
+                    'url': result['link'],
+                    'position': result['position'],
+                    'schemas': schemas,
+                    'schema_types': list(scraper.get_schema_types(schemas)),
+                    'reused': False
+                })
+            return analyzer.analyze_serp_schemas(scraper.compile_url_results(url_results))
+
+        cases.append((f'aggregation/serp-{count}', aggregate, len(payload) / 1024))
+    return cases
+
+
+def _generation_cases() -> List[Case]:
+    """Génération du jeu de schemas prioritaires et de quelques types isolés"""
+    generator = SchemaGenerator()
+    priority = generator.get_priority_schemas()
+
+    def generate_priority_set():
+        # Type par type: generate_multiple_schemas échoue dès que l'@graph
+        # contient plusieurs schemas (_ensure_reviewable_item_exists absente)
+        return [generator.generate_schema(schema_type, CLIENT_INFO, context_schemas=priority)
+                for schema_type in priority]
+
+    cases = [('generation/priority-set', generate_priority_set, 0.0)]
+    for schema_type in ('Organization', 'Product', 'Article', 'FAQPage', 'LocalBusiness'):
+        cases.append((f'generation/{schema_type}',
+                      lambda schema_type=schema_type: generator.generate_schema(schema_type, CLIENT_INFO), 0.0))
+    return cases
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict:
+    """
+    Exécute un cas `repeat` fois après un passage de chauffe
+
+    Les cas de moins de MIN_RUN_SECONDS sont appelés en boucle dans chaque
+    exécution (durée par appel), pour que les ratios de --compare ne
+    mesurent pas la résolution de l'horloge. Comme timeit, le ramasse-miettes
+    est suspendu pendant les mesures.
+
+    Args:
+        function: Fonction mesurée
+        repeat: Nombre d'exécutions mesurées
+
+    Returns:
+        Dictionnaire {median_ms, min_ms, max_ms, runs, loops}
+    """
+    function()
+    # Calibrage façon timeit.autorange: 1, 2, 5, 10... appels par exécution
+    loops = 1
+    for loops in (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        if time.perf_counter() - start >= MIN_RUN_SECONDS:
+            break
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                function()
+            timings.append((time.perf_counter() - start) * 1000 / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'min_ms': round(min(timings), 4),
+        'max_ms': round(max(timings), 4),
+        'runs': repeat,
+        'loops': loops
+    }
+
+
+def _git_commit() -> str:
+    """Commit courant (vide hors dépôt git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def compare(results: Dict, reference: Dict, threshold: float) -> List[str]:
+    """
+    Compare les minimums aux résultats de référence
+
+    Le minimum est la mesure la moins sensible aux autres processus de la
+    machine; la médiane reste dans le fichier pour l'analyse.
+
+    Args:
+        results: Résultats de l'exécution courante
+        reference: Contenu d'un fichier produit par une exécution précédente
+        threshold: Ralentissement toléré (0.2 = 20 %)
+
+    Returns:
+        Noms des cas en régression
+    """
+    regressions = []
+    print(f"\n{'Cas (min.)':<42}{'Réf. (ms)':>11}{'Actuel (ms)':>13}{'Ratio':>8}")
+    for name, current in results.items():
+        previous = reference.get('results', {}).get(name)
+        if previous is None:
+            print(f"{name:<42}{'-':>11}{current['min_ms']:>13.3f}{'nouveau':>8}")
+            continue
+        ratio = current['min_ms'] / previous['min_ms'] if previous['min_ms'] else 1.0
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  RÉGRESSION'
+        print(f"{name:<42}{previous['min_ms']:>11.3f}{current['min_ms']:>13.3f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5, help="Exécutions mesurées par cas")
+    parser.add_argument('--quick', action='store_true', help="Ignore les pages de plus de 1 Mo")
+    parser.add_argument('--only', help="Ne garde que les cas dont le nom commence par ce préfixe")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Fichier JSON des résultats")
+    parser.add_argument('--compare', help="Fichier JSON de référence")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Ralentissement toléré (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    # Les avertissements attendus (champs manquants, page malformée) ne
+    # doivent pas coûter d'écriture pendant les mesures
+    configure_logging(level='ERROR')
+
+    corpus = [(name, html) for name, html in generate_corpus() if not (args.quick and name in QUICK_SKIP)]
+    scraper = SchemaScraper()
+
+    # Les modules de l'application peuvent encore écrire sur stdout: le rapport
+    # garde un flux à part
+    report = sys.stdout
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = (_extraction_cases(scraper, corpus) + _type_cases(scraper, corpus)
+                 + _aggregation_cases(scraper, corpus) + _generation_cases())
+        cases = [case for case in cases if not args.only or case[0].startswith(args.only)]
+
+        print(f"{len(cases)} cas, {args.repeat} exécution(s) chacun", file=report)
+        print(f"{'Cas':<42}{'Taille (Ko)':>12}{'Médiane (ms)':>14}{'Min':>10}{'Max':>10}", file=report)
+        for name, function, size in cases:
+            stats = measure(function, args.repeat)
+            stats['size_kb'] = round(size, 1)
+            results[name] = stats
+            print(f"{name:<42}{size:>12.0f}{stats['median_ms']:>14.3f}{stats['min_ms']:>10.3f}"
+                  f"{stats['max_ms']:>10.3f}", file=report)
+
+    reference = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            reference = json.load(f)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'commit': _git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+                'quick': args.quick
+            },
+            'results': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if reference is not None:
+        regressions = compare(results, reference, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} cas en régression au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nAucune régression")
+
+
+if __name__ == '__main__':
+    main()
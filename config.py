@@ -29,18 +29,58 @@ class Config:
     # Request Settings
     REQUEST_TIMEOUT = 30  # secondes
     USER_AGENT = 'SEO-Schema-Analyzer/1.0 (https://example.com; contact@example.com)'
+    HTTP_POOL_MAXSIZE = 20  # connexions keep-alive conservées par hôte
+    MAX_REQUESTS_PER_HOST = 4  # requêtes simultanées maximum vers un même hôte
 
     # Cache Settings
     CACHE_ENABLED = True
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')  # 'memory' ou 'sqlite' (persistant sous CACHE_DIR)
     CACHE_DURATION = 3600  # 1 hour in seconds (utilisé par cache.py)
     CACHE_EXPIRY_HOURS = 24
-    MAX_CACHE_SIZE = 1000
+    # Stale-while-revalidate des résultats SERP: au-delà de CACHE_DURATION, l'entrée
+    # périmée est servie et actualisée en arrière-plan jusqu'à cet âge maximum
+    SERP_STALE_WHILE_REVALIDATE = True
+    CACHE_MAX_STALE_AGE = CACHE_EXPIRY_HOURS * 3600  # secondes
+    MAX_CACHE_SIZE = 1000  # nombre maximum d'entrées (éviction LRU)
+    MAX_CACHE_BYTES = 256 * 1024 * 1024  # budget approximatif (mémoire estimée, octets pickle en SQLite), 0 = illimité
+    PAGE_STORE_MAX_SIZE = 5000  # pages extraites partagées entre analyses
+    # Au-delà de CACHE_DURATION, une page expirée est revalidée par GET conditionnel
+    # (ETag / Last-Modified) tant qu'elle a moins de cet âge
+    PAGE_REVALIDATION_MAX_AGE = 7 * 24 * 3600  # secondes
 
     # Crawling settings
     MAX_URLS_PER_ANALYSIS = 10
     MAX_CONCURRENT_REQUESTS = 5
+    ANALYSIS_DEADLINE = 60  # secondes, durée maximale d'une analyse multi-URLs
+    MAX_PAGE_BYTES = 5 * 1024 * 1024  # octets HTML (décompressés) lus par page, au-delà la page est tronquée
+    SCRAPE_HEAD_PRECHECK = False  # requête HEAD préalable pour écarter les contenus non HTML
+    PARSE_PROCESSES = 0  # processus d'extraction (parsing + extruct), 0 = dans les threads de téléchargement
+    # Politesse: débit par hôte (seaux à jetons) et repli adaptatif sur 429/503
+    POLITENESS_ENABLED = True
+    POLITENESS_REQUESTS_PER_SECOND = 2.0  # débit soutenu par hôte
+    POLITENESS_BURST = 2  # requêtes consécutives autorisées sans attente
+    POLITENESS_MAX_BACKOFF = 30  # secondes, intervalle maximum entre deux requêtes d'un hôte pénalisé
+    RESPECT_ROBOTS_CRAWL_DELAY = False  # lire le Crawl-delay de robots.txt (une requête de plus par hôte)
+    ROBOTS_CACHE_DURATION = 24 * 3600  # secondes
+    # Enregistrement/rejeu des réponses HTTP (utils/http_fixtures.py) pour les tests de charge
+    HTTP_FIXTURES_MODE = os.getenv('HTTP_FIXTURES_MODE', '')  # 'record', 'replay' ou '' (réseau)
+    HTTP_FIXTURES_PATH = os.getenv('HTTP_FIXTURES_PATH', 'fixtures/http.zip')
     RETRY_ATTEMPTS = 3
     RETRY_DELAY = 2  # secondes
+    RETRY_MAX_TOTAL_TIME = 60  # secondes, durée cumulée maximale des attentes entre retries
+
+    # Analyse par lots
+    BATCH_MAX_CONCURRENT_SEARCHES = 3  # recherches ValueSERP simultanées
+    BATCH_WINDOW_SIZE = 20  # mots-clés traités ensemble (déduplication des URLs)
+
+    # Métriques Prometheus (utils/metrics.py), endpoint /metrics local
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+    # Journalisation (utils/logging_config.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING')  # niveau des modules de l'application
+    LOG_LEVELS = {}  # niveaux par module, ex. {'api.valueserp': 'INFO'}
 
     # File paths
     CACHE_DIR = 'cache'
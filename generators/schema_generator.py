@@ -3,6 +3,7 @@ Module pour générer des schemas Schema.org complets avec toutes les propriét
 Version optimisée pour éviter les redondances et corriger le problème Review
 """
 import json
+import logging
 from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime
 
@@ -12,6 +13,12 @@ from .schema_constants import SchemaConstants
 from .schema_fillers import SCHEMA_FILLERS
 from .schema_validators import SchemaDataValidator
 from .schema_deduplication_manager import SchemaDeduplicationManager, SchemaGeneratorOptimized
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Métriques (utils/metrics.py)
+_generated = registry.counter('schemas_generated_total', "Schemas générés par type", ('type',))
 
 
 class SchemaGenerator:
@@ -82,6 +89,7 @@ class SchemaGenerator:
         # Valider les champs requis
         self._validate_required_fields(schema, schema_type)
 
+        _generated.inc(type=schema_type)
         return schema
 
     def _fix_review_schema(self, schema: Dict, client_info: Dict,
@@ -474,7 +482,7 @@ class SchemaGenerator:
                 missing.append(field)
 
         if missing:
-            print(f"Attention: Champs requis manquants pour {schema_type}: {missing}")
+            logger.warning("Champs requis manquants pour %s: %s", schema_type, missing)
 
     def get_schema_documentation(self, schema_type: str) -> Dict:
         """
@@ -5,6 +5,8 @@ Version refactorisée et modulaire avec navigation d'onglets
 import streamlit as st
 from config import Config
 from translations import get_text
+from utils.logging_config import configure_logging
+from utils.metrics import start_metrics_server
 
 # Import des sections de l'interface
 from ui.search_section import search_section
@@ -22,6 +24,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Journalisation de l'application (niveau Config.LOG_LEVEL, debug via l'onglet recherche)
+configure_logging()
+
+# Endpoint /metrics (Config.METRICS_ENABLED), démarré une seule fois par processus
+start_metrics_server()
+
 
 # Initialisation de la session
 def init_session_state():
@@ -0,0 +1,7 @@
+"""
+Interface en ligne de commande (analyses planifiées, CI)
+Usage: python -m schemeo {analyze,crawl-page,generate} --help
+"""
+from .cli import main
+
+__all__ = ['main']
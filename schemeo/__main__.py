@@ -0,0 +1,8 @@
+"""
+Point d'entrée de python -m schemeo
+"""
+import sys
+
+from schemeo.cli import main
+
+sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Commandes sans interface: analyse SERP, analyse de pages et génération
+Pilote directement ValueSERPAPIWithRetry, SchemaScraper, SchemaAnalyzer et
+SchemaGenerator, sans session Streamlit. Les entrées sont des arguments ou
+des fichiers, les sorties du JSON ou du JSONL (fichier ou stdout avec '-');
+la journalisation va sur stderr.
+
+Usage:
+    python -m schemeo analyze "chaussure trail" [--input mots-cles.csv] [--output resultats.jsonl]
+    python -m schemeo crawl-page https://exemple.fr/page [--input urls.txt] [--json-ld-only]
+    python -m schemeo generate Organization Product --client client.json [--format html]
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import os
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from config import Config
+from analyzers.batch_analyzer import BatchAnalyzer, load_batch_rows
+from analyzers.schema_analyzer import SchemaAnalyzer
+from generators.schema_generator import SchemaGenerator
+from scrapers.politeness import PolitenessScheduler
+from scrapers.schema_scraper import SchemaScraper
+from utils.logging_config import configure_logging
+from utils.metrics import registry as metrics_registry, start_metrics_server
+
+logger = logging.getLogger(__name__)
+
+LOG_LEVEL_CHOICES = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+
+@contextlib.contextmanager
+def _open_output(path: str) -> Iterator[TextIO]:
+    """Fichier de sortie, ou stdout pour '-'"""
+    if path == '-':
+        yield sys.stdout
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        yield f
+
+
+def _write_line(out: TextIO, record: Dict):
+    """Écrit une ligne JSONL et la vide (un traitement interrompu garde les lignes écrites)"""
+    out.write(json.dumps(record, ensure_ascii=False, default=list) + '\n')
+    out.flush()
+
+
+def load_urls(path: str) -> Iterator[str]:
+    """
+    Lit les URLs d'un fichier sans le charger entièrement
+
+    Le fichier est un texte (une URL par ligne, lignes vides et commentaires
+    # ignorés) ou un JSONL (un objet par ligne avec une clé url, par exemple
+    la sortie de crawl-page).
+
+    Args:
+        path: Chemin du fichier .txt ou .jsonl
+
+    Returns:
+        Itérateur d'URLs
+    """
+    is_jsonl = os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson')
+
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url = json.loads(line).get('url', '') if is_jsonl else line
+            if url:
+                yield url
+
+
+def _chain(rows: List[Dict], more: Iterator[Dict]) -> Iterator[Dict]:
+    """Mots-clés des arguments puis ceux du fichier"""
+    yield from rows
+    yield from more
+
+
+def run_analyze(args: argparse.Namespace) -> int:
+    """Recherche ValueSERP puis analyse des concurrents, un résultat JSONL par mot-clé"""
+    if not args.api_key:
+        logger.error("Clé API ValueSERP manquante (--api-key ou VALUESERP_API_KEY)")
+        return 2
+
+    rows = [{'keyword': keyword, 'location': args.location, 'language': args.language}
+            for keyword in args.keywords]
+    if args.input:
+        rows = _chain(rows, load_batch_rows(args.input))
+    elif not rows:
+        logger.error("Aucun mot-clé (arguments ou --input)")
+        return 2
+
+    batch = BatchAnalyzer(
+        args.api_key,
+        max_concurrent_searches=args.searches,
+        max_workers=args.workers,
+        max_retries=args.retries,
+        include_schemas=args.include_schemas
+    )
+
+    failed = 0
+    with _open_output(args.output) as out:
+        for result in batch.run(rows):
+            _write_line(out, result)
+            if 'error' in result:
+                failed += 1
+                logger.warning("Échec de l'analyse de %r: %s", result['keyword'], result['error'])
+            else:
+                logger.info("Mot-clé analysé: %r", result['keyword'])
+
+    stats = batch.get_stats()
+    logger.info("Analyse terminée", extra=stats)
+    if args.stats:
+        print(json.dumps(stats, indent=2), file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _unique_urls(args: argparse.Namespace) -> Iterator[str]:
+    """URLs des arguments puis du fichier, sans doublon, lues au fil de l'eau"""
+    seen = set()
+    urls = itertools.chain(args.urls, load_urls(args.input) if args.input else ())
+    for url in urls:
+        if url not in seen:
+            seen.add(url)
+            yield url
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Découpe un itérable en listes de size éléments au plus"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _chunk_deadline(chunk: List[str], deadline: Optional[float]) -> float:
+    """
+    Délai d'un lot: délai demandé plus l'attente minimale imposée par la
+    politesse à l'hôte le plus représenté du lot (Config.POLITENESS_REQUESTS_PER_SECOND)
+    """
+    deadline = Config.ANALYSIS_DEADLINE if deadline is None else deadline
+    if not Config.POLITENESS_ENABLED or Config.POLITENESS_REQUESTS_PER_SECOND <= 0:
+        return deadline
+    per_host = Counter(PolitenessScheduler.host_key(url) for url in chunk)
+    queued = max(0, max(per_host.values()) - Config.POLITENESS_BURST)
+    return deadline + queued / Config.POLITENESS_REQUESTS_PER_SECOND
+
+
+def run_crawl_page(args: argparse.Namespace) -> int:
+    """
+    Analyse des schemas de pages, un résultat JSONL par URL
+
+    Les URLs sont traitées par lots de --chunk-size, chacun avec son propre
+    délai (--deadline, plus l'attente de politesse du lot): un long fichier
+    n'épuise pas un délai unique, et les résultats d'un lot sont écrits dès
+    qu'il est terminé.
+    """
+    urls = _unique_urls(args)
+    first = next(urls, None)
+    if first is None:
+        logger.error("Aucune URL (arguments ou --input)")
+        return 2
+
+    scraper = SchemaScraper()
+    analyzer = SchemaAnalyzer()
+
+    done = 0
+    failed = 0
+    with _open_output(args.output) as out:
+        for chunk in _chunks(itertools.chain([first], urls), max(1, args.chunk_size)):
+            url_results = scraper.analyze_urls(
+                chunk,
+                max_workers=args.workers,
+                deadline=_chunk_deadline(chunk, args.deadline),
+                json_ld_only=args.json_ld_only,
+                progress=lambda finished, total, offset=done: logger.info("Pages analysées: %d", offset + finished)
+            )
+
+            for url_result in url_results:
+                record = {
+                    'url': url_result['url'],
+                    'position': done + url_result['position'],
+                    'schema_types': sorted(url_result['schema_types'])
+                }
+                if 'error' in url_result or not url_result.get('fetched', True):
+                    failed += 1
+                    record['error'] = url_result.get('error', 'Page inaccessible')
+                else:
+                    record['analysis'] = analyzer.analyze_page_schemas(url_result['schemas'],
+                                                                       set(url_result['schema_types']))
+                if args.include_schemas:
+                    record['schemas'] = url_result['schemas']
+                _write_line(out, record)
+            done += len(chunk)
+
+    logger.info("Analyse terminée", extra={'urls': done, 'failed': failed})
+    return 1 if failed else 0
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    """Génération de schemas JSON-LD à partir des informations client"""
+    generator = SchemaGenerator()
+
+    with open(args.client, encoding='utf-8') as f:
+        client_info = json.load(f)
+    additional_data = None
+    if args.data:
+        with open(args.data, encoding='utf-8') as f:
+            additional_data = json.load(f)
+
+    schema_types = args.types or generator.get_priority_schemas()
+    unknown = [schema_type for schema_type in schema_types if schema_type not in generator.templates]
+    if unknown:
+        logger.error("Type(s) inconnu(s): %s (disponibles: %s)", ', '.join(unknown),
+                     ', '.join(sorted(generator.get_available_schema_types())))
+        return 2
+
+    # Type par type, chacun avec les autres en contexte (liaisons @id)
+    schemas = []
+    for schema_type in schema_types:
+        schema = generator.generate_schema(schema_type, client_info, additional_data,
+                                           include_optional=not args.required_only,
+                                           context_schemas=schema_types)
+        if schema:
+            schemas.append(schema)
+
+    with _open_output(args.output) as out:
+        if args.format == 'html':
+            out.write(generator.format_for_insertion(schemas) + '\n')
+        else:
+            out.write(json.dumps(schemas, indent=2, ensure_ascii=False) + '\n')
+
+    logger.info("%d schema(s) généré(s)", len(schemas))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Analyseur des arguments des trois commandes"""
+    # Options communes, acceptées avant ou après la commande (SUPPRESS: la
+    # valeur d'une commande n'écrase pas celle donnée avant elle)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--log-level', type=str.upper, choices=LOG_LEVEL_CHOICES, default=argparse.SUPPRESS,
+                        help="Niveau de journalisation (défaut: Config.LOG_LEVEL)")
+    common.add_argument('--metrics-port', type=int, default=argparse.SUPPRESS,
+                        help="Expose les métriques Prometheus sur ce port pendant la commande")
+
+    parser = argparse.ArgumentParser(prog='python -m schemeo', description=__doc__.splitlines()[1],
+                                     parents=[common])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', parents=[common], help="Analyse SERP de mots-clés (sortie JSONL)")
+    analyze.add_argument('keywords', nargs='*', help="Mots-clés à analyser")
+    analyze.add_argument('--input', help="Fichier .csv ou .jsonl (keyword, location, language)")
+    analyze.add_argument('--output', default='-', help="Fichier JSONL de résultats (défaut: stdout)")
+    analyze.add_argument('--location', default='France', help="Localisation des mots-clés en argument")
+    analyze.add_argument('--language', default='fr', help="Langue des mots-clés en argument")
+    analyze.add_argument('--api-key', default=Config.VALUESERP_API_KEY)
+    analyze.add_argument('--searches', type=int, default=Config.BATCH_MAX_CONCURRENT_SEARCHES,
+                         help="Recherches ValueSERP simultanées")
+    analyze.add_argument('--workers', type=int, default=Config.MAX_CONCURRENT_REQUESTS,
+                         help="Téléchargements de pages simultanés")
+    analyze.add_argument('--retries', type=int, default=Config.RETRY_ATTEMPTS,
+                         help="Retries ValueSERP par recherche")
+    analyze.add_argument('--include-schemas', action='store_true',
+                         help="Inclure les schemas complets de chaque URL")
+    analyze.add_argument('--stats', action='store_true', help="Affiche les statistiques du lot sur stderr")
+    analyze.set_defaults(handler=run_analyze)
+
+    crawl = commands.add_parser('crawl-page', parents=[common], help="Schemas de pages (sortie JSONL)")
+    crawl.add_argument('urls', nargs='*', help="URLs à analyser")
+    crawl.add_argument('--input', help="Fichier d'URLs (.txt, une par ligne, ou .jsonl avec une clé url)")
+    crawl.add_argument('--output', default='-', help="Fichier JSONL de résultats (défaut: stdout)")
+    crawl.add_argument('--workers', type=int, default=Config.MAX_CONCURRENT_REQUESTS,
+                       help="Téléchargements de pages simultanés")
+    crawl.add_argument('--chunk-size', type=int, default=Config.MAX_URLS_PER_ANALYSIS,
+                       help="URLs analysées ensemble, résultats écrits à la fin de chaque lot")
+    crawl.add_argument('--deadline', type=float,
+                       help="Durée maximale par lot en secondes, hors attente de politesse "
+                            "(défaut: Config.ANALYSIS_DEADLINE)")
+    crawl.add_argument('--json-ld-only', action='store_true', help="Mode rapide limité au JSON-LD")
+    crawl.add_argument('--include-schemas', action='store_true', help="Inclure les schemas complets")
+    crawl.set_defaults(handler=run_crawl_page)
+
+    generate = commands.add_parser('generate', parents=[common], help="Génère des schemas JSON-LD (sortie JSON ou HTML)")
+    generate.add_argument('types', nargs='*', help="Types à générer (défaut: schemas prioritaires)")
+    generate.add_argument('--client', required=True, help="Fichier JSON des informations client")
+    generate.add_argument('--data', help="Fichier JSON de données supplémentaires")
+    generate.add_argument('--output', default='-', help="Fichier de sortie (défaut: stdout)")
+    generate.add_argument('--format', choices=('json', 'html'), default='json',
+                          help="Liste JSON ou balises <script> prêtes à insérer")
+    generate.add_argument('--required-only', action='store_true', help="Sans les champs optionnels")
+    generate.set_defaults(handler=run_generate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Exécute une commande
+
+    Args:
+        argv: Arguments (défaut: sys.argv[1:])
+
+    Returns:
+        Code de sortie: 0 succès, 1 au moins un échec (mot-clé ou URL), 2 entrée invalide
+    """
+    args = build_parser().parse_args(argv)
+
+    configure_logging(getattr(args, 'log_level', Config.LOG_LEVEL))
+
+    metrics_port = getattr(args, 'metrics_port', None)
+    if metrics_port:
+        metrics_registry.enabled = True
+        start_metrics_server(metrics_port)
+
+    return args.handler(args)
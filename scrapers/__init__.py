@@ -2,5 +2,14 @@
 Module de scraping et extraction de données
 """
 from .schema_scraper import SchemaScraper
+from .politeness import PolitenessScheduler, TokenBucket, get_politeness_scheduler
+from .parse_pool import ParsePool, get_parse_pool
 
-__all__ = ['SchemaScraper']
\ No newline at end of file
+__all__ = [
+    'SchemaScraper',
+    'PolitenessScheduler',
+    'TokenBucket',
+    'get_politeness_scheduler',
+    'ParsePool',
+    'get_parse_pool'
+]
\ No newline at end of file
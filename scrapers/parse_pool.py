@@ -0,0 +1,145 @@
+"""
+Étage d'extraction multi-processus
+Les threads de téléchargement transmettent le HTML à un pool de processus
+qui exécute le parsing, extruct et get_schema_types hors du GIL
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from config import Config
+
+# Scraper du processus worker (créé par _init_worker, sans aucune requête réseau)
+_worker_scraper = None
+
+
+def _init_worker():
+    """Initialise le scraper d'extraction d'un processus du pool"""
+    global _worker_scraper
+    from config import Config
+    from scrapers.schema_scraper import SchemaScraper
+    from utils.cache_backends import MemoryCacheBackend
+    from utils.http_client import HttpClient
+    from utils.page_store import PageStore
+
+    # Le worker ne fait que parser: ni ordonnanceur de politesse ni pool
+    # imbriqué (Config est propre au processus), transport et magasin de
+    # pages minimaux
+    Config.POLITENESS_ENABLED = False
+    Config.PARSE_PROCESSES = 0
+    _worker_scraper = SchemaScraper(
+        http_client=HttpClient(pool_maxsize=1),
+        page_store=PageStore(MemoryCacheBackend(max_entries=1))
+    )
+
+
+def extract_page_data(url: str, html: str, json_ld_only: bool = False) -> Dict:
+    """
+    Extrait les schemas d'une page dans un processus du pool
+
+    Args:
+        url: URL de la page
+        html: Contenu HTML
+        json_ld_only: Mode rapide limité au JSON-LD
+
+    Returns:
+        Dictionnaire {'schemas', 'schema_types'} composé uniquement de types
+        JSON (aucun objet lxml ou BeautifulSoup ne quitte le processus)
+    """
+    if _worker_scraper is None:
+        _init_worker()
+
+    schemas = _worker_scraper.extract_schemas(url, html, json_ld_only=json_ld_only)
+    return {
+        'schemas': schemas,
+        'schema_types': list(_worker_scraper.get_schema_types(schemas))
+    }
+
+
+class ParsePool:
+    """
+    Pool de processus d'extraction partagé par les threads de téléchargement
+
+    Chaque thread soumet le HTML téléchargé et attend le résultat: pendant
+    l'attente le GIL est libre pour les autres téléchargements, et jusqu'à
+    `processes` extractions s'exécutent en parallèle sur des cœurs distincts.
+    """
+
+    def __init__(self, processes: int = Config.PARSE_PROCESSES):
+        """
+        Args:
+            processes: Nombre de processus d'extraction
+        """
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Démarre le pool au premier usage
+
+        Les processus sont lancés par 'spawn': le pool est créé depuis un
+        thread de téléchargement d'un processus multi-thread (Streamlit), où
+        un fork copierait des verrous tenus par d'autres threads (logging,
+        ordonnanceur, pool HTTP) et pourrait bloquer l'enfant.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def extract(self, url: str, html: str, json_ld_only: bool = False) -> Dict:
+        """
+        Extrait les schemas d'une page dans le pool
+
+        Args:
+            url: URL de la page
+            html: Contenu HTML
+            json_ld_only: Mode rapide limité au JSON-LD
+
+        Returns:
+            Dictionnaire {'schemas', 'schema_types'}
+
+        Raises:
+            BrokenProcessPool: si un processus du pool s'est arrêté
+                brutalement (le pool est alors recréé au prochain appel)
+        """
+        executor = self._get_executor()
+        try:
+            return executor.submit(extract_page_data, url, html, json_ld_only).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+
+    def close(self):
+        """Arrête les processus du pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+# Instance partagée par le processus principal
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """
+    Retourne le pool d'extraction partagé (Config.PARSE_PROCESSES processus)
+
+    Returns:
+        Instance ParsePool unique
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ParsePool()
+    return _parse_pool
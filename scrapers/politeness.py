@@ -0,0 +1,363 @@
+"""
+Ordonnanceur de politesse pour le scraping des pages concurrentes
+Seaux à jetons par domaine, plafonds de concurrence global et par hôte,
+repli adaptatif sur 429/503 et Crawl-delay de robots.txt (optionnel)
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from config import Config
+from utils.helpers import get_domain_from_url
+from utils.http_client import HttpClient, CancelToken, RequestCancelled, get_http_client, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Réponses qui déclenchent le repli adaptatif de l'hôte
+BACKOFF_STATUS_CODES = (429, 503)
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = '*') -> Optional[float]:
+    """
+    Extrait le Crawl-delay d'un robots.txt
+
+    Le groupe de l'agent demandé est prioritaire sur le groupe '*'. Les
+    délais décimaux sont acceptés (urllib.robotparser ne lit que les entiers).
+
+    Args:
+        robots_txt: Contenu de robots.txt
+        user_agent: Agent recherché
+
+    Returns:
+        Délai en secondes, ou None si absent
+    """
+    delays: Dict[str, float] = {}
+    agents: List[str] = []
+    in_rules = False
+
+    for line in robots_txt.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+
+        if field == 'user-agent':
+            # Un User-agent après des règles ouvre un nouveau groupe
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif field == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+        else:
+            in_rules = True
+
+    delay = delays.get(user_agent.lower(), delays.get('*'))
+    return delay if delay and delay > 0 else None
+
+
+class TokenBucket:
+    """
+    Seau à jetons thread-safe
+
+    reserve() consomme un jeton immédiatement, quitte à rendre le solde
+    négatif, et retourne l'attente correspondante: les appelants concurrents
+    sont ainsi servis dans l'ordre sans boucle d'attente active.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Jetons ajoutés par seconde
+            capacity: Nombre maximum de jetons accumulés (rafale)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Réserve un jeton
+
+        Returns:
+            Délai en secondes avant de pouvoir utiliser le jeton
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None):
+        """Change le débit (et la rafale) en conservant le solde accumulé"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+                self.tokens = min(self.tokens, capacity)
+
+
+class _HostState:
+    """État de politesse d'un hôte"""
+
+    def __init__(self, rate: float, burst: float, max_concurrent: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.penalty = 1.0
+        self.last_backoff = 0.0
+        self.paused_until = 0.0
+        self.crawl_delay: Optional[float] = None
+        self.requests = 0
+        self.backoffs = 0
+        self.waited = 0.0
+
+
+class PolitenessScheduler:
+    """
+    Régule les requêtes du scraper domaine par domaine
+
+    Chaque hôte a son seau à jetons (Config.POLITENESS_REQUESTS_PER_SECOND,
+    rafale Config.POLITENESS_BURST). Une réponse 429/503 double l'intervalle
+    de l'hôte (jusqu'à Config.POLITENESS_MAX_BACKOFF) et respecte Retry-After;
+    chaque succès le réduit progressivement. Si Crawl-delay est respecté,
+    robots.txt est lu une fois par hôte et mis en cache.
+    """
+
+    def __init__(self,
+                 http_client: Optional[HttpClient] = None,
+                 requests_per_second: float = Config.POLITENESS_REQUESTS_PER_SECOND,
+                 burst: float = Config.POLITENESS_BURST,
+                 max_concurrent: int = Config.MAX_CONCURRENT_REQUESTS,
+                 max_per_host: int = Config.MAX_REQUESTS_PER_HOST,
+                 max_backoff: float = Config.POLITENESS_MAX_BACKOFF,
+                 respect_crawl_delay: bool = Config.RESPECT_ROBOTS_CRAWL_DELAY,
+                 user_agent: str = '*'):
+        """
+        Args:
+            http_client: Client HTTP utilisé pour robots.txt (défaut: client partagé)
+            requests_per_second: Débit soutenu par hôte
+            burst: Requêtes consécutives autorisées sans attente
+            max_concurrent: Requêtes simultanées tous hôtes confondus
+            max_per_host: Requêtes simultanées vers un même hôte
+            max_backoff: Intervalle maximum entre deux requêtes d'un hôte
+            respect_crawl_delay: Appliquer le Crawl-delay de robots.txt
+            user_agent: Agent recherché dans robots.txt
+        """
+        self.http = http_client
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_per_host = max_per_host
+        self.max_backoff = max_backoff
+        self.respect_crawl_delay = respect_crawl_delay
+        self.user_agent = user_agent
+
+        self._global_semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+        # Crawl-delay par hôte: (délai ou None, lu le)
+        self._robots: Dict[str, Tuple[Optional[float], float]] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Domaine (avec port éventuel) utilisé pour regrouper les requêtes"""
+        return get_domain_from_url(url).lower()
+
+    def _get_host(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.requests_per_second, self.burst, self.max_per_host)
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url: str, cancel_token: Optional[CancelToken] = None) -> Iterator[None]:
+        """
+        Attend le droit d'envoyer une requête vers l'hôte de l'URL
+
+        La place reste occupée pendant tout le bloc with (lecture du corps
+        comprise).
+
+        Args:
+            url: URL de la requête
+            cancel_token: Jeton d'annulation (optionnel)
+
+        Raises:
+            RequestCancelled: si le jeton est annulé pendant l'attente
+        """
+        host = self.host_key(url)
+        state = self._get_host(host)
+        if self.respect_crawl_delay:
+            self._apply_crawl_delay(url, host, state)
+
+        # L'attente du jeton se fait avant la place globale: un hôte ralenti
+        # ne bloque pas les requêtes vers les autres hôtes
+        self._acquire(state.semaphore, url, cancel_token)
+        try:
+            delay = max(state.bucket.reserve(), state.paused_until - time.monotonic())
+            with self._lock:
+                state.requests += 1
+                state.waited += max(0.0, delay)
+            if delay > 0 and self._wait(delay, cancel_token):
+                raise RequestCancelled(url)
+
+            self._acquire(self._global_semaphore, url, cancel_token)
+            try:
+                yield
+            finally:
+                self._global_semaphore.release()
+        finally:
+            state.semaphore.release()
+
+    def record_response(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """
+        Ajuste le débit de l'hôte selon la réponse reçue
+
+        Args:
+            url: URL de la requête
+            status_code: Code HTTP de la réponse
+            retry_after: En-tête Retry-After éventuel
+        """
+        state = self._get_host(self.host_key(url))
+
+        with self._lock:
+            if status_code in BACKOFF_STATUS_CODES:
+                state.backoffs += 1
+                # Une seule aggravation par intervalle: les réponses d'une même
+                # rafale de requêtes concurrentes ne comptent qu'une fois
+                now = time.monotonic()
+                if now - state.last_backoff >= state.penalty / self.requests_per_second:
+                    state.penalty = min(state.penalty * 2, self.max_backoff * self.requests_per_second)
+                    state.last_backoff = now
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    state.paused_until = max(state.paused_until, time.monotonic() + min(delay, self.max_backoff))
+            elif state.penalty > 1.0:
+                state.penalty = max(1.0, state.penalty * 0.75)
+            else:
+                return
+
+        self._update_rate(state)
+
+    def _update_rate(self, state: _HostState):
+        """Recalcule le débit de l'hôte (pénalité et Crawl-delay)"""
+        interval = min(self.max_backoff, state.penalty / self.requests_per_second)
+        if state.crawl_delay:
+            interval = max(interval, state.crawl_delay)
+        # Hôte ralenti: plus de rafale
+        burst = self.burst if interval <= 1 / self.requests_per_second else 1
+        state.bucket.set_rate(1 / interval, burst)
+
+    def _apply_crawl_delay(self, url: str, host: str, state: _HostState):
+        """Lit (une fois par hôte) le Crawl-delay de robots.txt et l'applique"""
+        cached = self._robots.get(host)
+        if cached is not None and time.time() - cached[1] < Config.ROBOTS_CACHE_DURATION:
+            return
+
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+
+        with host_lock:
+            cached = self._robots.get(host)
+            if cached is not None and time.time() - cached[1] < Config.ROBOTS_CACHE_DURATION:
+                return
+
+            crawl_delay = self._fetch_crawl_delay(url)
+            self._robots[host] = (crawl_delay, time.time())
+            state.crawl_delay = crawl_delay
+            self._update_rate(state)
+
+    def _fetch_crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Télécharge robots.txt et retourne son Crawl-delay
+
+        Returns:
+            Délai en secondes, ou None si absent ou robots.txt inaccessible
+        """
+        parsed = urlparse(url)
+        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+
+        try:
+            http = self.http or get_http_client()
+            response = http.get(robots_url, timeout=10)
+            if response.status_code != 200:
+                return None
+            return parse_crawl_delay(response.text, self.user_agent)
+        except requests.exceptions.RequestException as e:
+            logger.info("robots.txt illisible pour %s: %s", parsed.netloc, e)
+            return None
+
+    @staticmethod
+    def _acquire(semaphore: threading.BoundedSemaphore, url: str, cancel_token: Optional[CancelToken]):
+        """Prend une place du sémaphore en surveillant l'annulation"""
+        while not semaphore.acquire(timeout=0.1):
+            if cancel_token and cancel_token.cancelled:
+                raise RequestCancelled(url)
+
+    @staticmethod
+    def _wait(delay: float, cancel_token: Optional[CancelToken]) -> bool:
+        """Attend delay secondes; retourne True si le jeton a été annulé"""
+        if cancel_token:
+            return cancel_token.wait(delay)
+        time.sleep(delay)
+        return False
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        État par hôte
+
+        Returns:
+            Dictionnaire {hôte: {'requests', 'backoffs', 'waited_seconds',
+            'rate', 'crawl_delay'}}
+        """
+        with self._lock:
+            return {
+                host: {
+                    'requests': state.requests,
+                    'backoffs': state.backoffs,
+                    'waited_seconds': round(state.waited, 2),
+                    'rate': round(state.bucket.rate, 3),
+                    'crawl_delay': state.crawl_delay
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+# Instance partagée par le processus
+_scheduler: Optional[PolitenessScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_politeness_scheduler() -> PolitenessScheduler:
+    """
+    Retourne l'ordonnanceur de politesse partagé du processus
+
+    Returns:
+        Instance PolitenessScheduler unique
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = PolitenessScheduler()
+    return _scheduler
@@ -2,197 +2,538 @@
 Module complet pour scraper et extraire les schemas des pages web
 Version finale avec corrections pour @graph et détection robuste
 """
+import asyncio
 import requests
 import json
 from bs4 import BeautifulSoup
 import extruct
+from extruct.utils import parse_xmldom_html
+from extruct.xmldom import XmlDomHTMLParser
+from lxml import etree
+from lxml.html import soupparser
+import logging
 import re
+import threading
 import time
-from typing import List, Dict, Optional, Set
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Dict, Optional, Set, Tuple
 from urllib.parse import urlparse, urljoin
 from config import Config
+from utils.http_client import HttpClient, CancelToken, RequestCancelled
+from utils.page_store import PageStore, get_page_store, reuse_stats
+from utils.metrics import registry
+from utils.timing import bind, fetching, span
+from scrapers.politeness import PolitenessScheduler, get_politeness_scheduler
+from scrapers.parse_pool import ParsePool, get_parse_pool
+
+logger = logging.getLogger(__name__)
+
+# Décodeur JSON rapide si disponible
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Pré-scan du mode JSON-LD seul: scripts JSON-LD, commentaires HTML (qui
+# peuvent masquer des scripts) et attributs microdata imposant un parsing complet
+_JSON_LD_SCRIPT_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_ITEMTYPE_RE = re.compile(r'\bitemtype\s*=', re.IGNORECASE)
+
+# Taille des blocs lus lors du téléchargement en streaming
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Balises suivies pour repérer la fin du document pendant le téléchargement
+_DOCUMENT_END_MARKERS_RE = re.compile(rb'<script|</script|<!--|-->|</html')
+
+
+class _DocumentEndScanner:
+    """
+    Repère </html hors script et commentaire sur des blocs successifs
+
+    Un </html> dans une chaîne JavaScript (document.write) ou dans un
+    JSON-LD contenant du balisage n'arrête pas la lecture.
+    """
+
+    # Longueur de la plus longue balise moins un: balise coupée entre deux blocs
+    _TAIL_LENGTH = 7
+
+    def __init__(self):
+        self._context = None  # None, 'script' ou 'comment'
+        self._tail = b''
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Analyse un bloc
+
+        Returns:
+            True si le bloc contient la fin du document
+        """
+        data = self._tail + chunk.lower()
+        for match in _DOCUMENT_END_MARKERS_RE.finditer(data):
+            # Balise entièrement contenue dans la fin du bloc précédent: déjà vue
+            if match.end() <= len(self._tail):
+                continue
+            marker = match.group()
+            if self._context == 'script':
+                if marker == b'</script':
+                    self._context = None
+            elif self._context == 'comment':
+                if marker == b'-->':
+                    self._context = None
+            elif marker == b'<script':
+                self._context = 'script'
+            elif marker == b'<!--':
+                self._context = 'comment'
+            elif marker == b'</html':
+                return True
+        self._tail = data[-self._TAIL_LENGTH:]
+        return False
+
+# Métriques (utils/metrics.py)
+_page_fetches = registry.counter('scraper_fetches_total', "Téléchargements de pages par statut HTTP", ('status',))
+_fetch_seconds = registry.histogram('scraper_fetch_seconds', "Durée des téléchargements de pages (en-têtes et corps)")
+_parse_seconds = registry.histogram('scraper_parse_seconds', "Durée de l'extraction des schemas d'une page", ('mode',))
+
+
+# Headers réalistes pour éviter les blocages
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+
+# User-Agents essayés successivement en cas d'échec
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Version/17.1 Safari/537.36',
+    'Mozilla/5.0 (compatible; SEOAnalyzer/1.0; +https://example.com/bot)'
+]
 
 
 class SchemaScraper:
     """Classe complète pour scraper et extraire les schemas des pages"""
 
-    def __init__(self):
-        self.session = requests.Session()
-
-        # Headers réalistes pour éviter les blocages
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        })
-
-    def scrape_url(self, url: str) -> Optional[str]:
+    # Transport partagé par toutes les instances du processus
+    _shared_transport: Optional[HttpClient] = None
+    _shared_transport_lock = threading.Lock()
+
+    def __init__(self,
+                 http_client: Optional[HttpClient] = None,
+                 page_store: Optional[PageStore] = None,
+                 scheduler: Optional[PolitenessScheduler] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        self.http = http_client or self.get_shared_transport()
+        self.session = self.http.session
+        self.page_store = page_store or get_page_store()
+        self.scheduler = scheduler or (get_politeness_scheduler() if Config.POLITENESS_ENABLED else None)
+        self.parse_pool = parse_pool or (get_parse_pool() if Config.PARSE_PROCESSES > 0 else None)
+
+    @classmethod
+    def get_shared_transport(cls) -> HttpClient:
+        """
+        Retourne le transport HTTP partagé par tous les scrapers
+
+        Les connexions keep-alive sont réutilisées d'une analyse à l'autre;
+        le pool est dimensionné pour les téléchargements concurrents.
+
+        Returns:
+            Client HTTP partagé
+        """
+        if cls._shared_transport is None:
+            with cls._shared_transport_lock:
+                if cls._shared_transport is None:
+                    cls._shared_transport = HttpClient(
+                        pool_maxsize=max(Config.HTTP_POOL_MAXSIZE, Config.MAX_CONCURRENT_REQUESTS),
+                        headers=BROWSER_HEADERS
+                    )
+        return cls._shared_transport
+
+    def scrape_url(self, url: str, cancel_token: Optional[CancelToken] = None) -> Optional[str]:
         """
         Scrape le contenu HTML d'une URL avec fallback multiple User-Agents
 
         Args:
             url: URL à scraper
+            cancel_token: Jeton d'annulation (optionnel)
 
         Returns:
             Contenu HTML ou None si erreur
         """
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Version/17.1 Safari/537.36',
-            'Mozilla/5.0 (compatible; SEOAnalyzer/1.0; +https://example.com/bot)'
-        ]
+        page = self.scrape_page(url, cancel_token)
+        return page['html'] if page else None
+
+    def scrape_page(self,
+                    url: str,
+                    cancel_token: Optional[CancelToken] = None,
+                    validators: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Télécharge une page HTML en streaming, dans la limite de Config.MAX_PAGE_BYTES
+
+        Args:
+            url: URL à scraper
+            cancel_token: Jeton d'annulation (optionnel)
+            validators: Validateurs d'une version précédente ('etag',
+                'last_modified') pour un GET conditionnel (optionnel)
+
+        Returns:
+            Dictionnaire {'html', 'bytes', 'truncated', 'not_modified', 'etag',
+            'last_modified'} ou None si erreur; 'html' vaut None et
+            'not_modified' True si le serveur répond 304
+        """
+        if Config.SCRAPE_HEAD_PRECHECK and not self._head_precheck(url, cancel_token):
+            return None
+
+        for i, ua in enumerate(USER_AGENTS):
+            if cancel_token and cancel_token.cancelled:
+                logger.info("Scraping annulé pour %s", url)
+                return None
+
+            # Seul le User-Agent change: la connexion du pool est réutilisée
+            headers = {'User-Agent': ua, **self._conditional_headers(validators)}
 
-        for i, ua in enumerate(user_agents):
             try:
-                # Créer une nouvelle session pour chaque tentative
-                session = requests.Session()
-                session.headers.update({
-                    'User-Agent': ua,
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                })
-
-                response = session.get(
-                    url,
-                    timeout=30,
-                    allow_redirects=True,
-                    verify=True
-                )
-                response.raise_for_status()
-
-                # Vérifier que c'est du HTML
-                content_type = response.headers.get('content-type', '')
-                if 'text/html' not in content_type:
-                    print(f"Type de contenu inattendu: {content_type}")
+                page = self._download(url, headers, cancel_token, verify=True)
+                if page is None:
                     continue
+                return page
 
-                return response.text
+            except RequestCancelled:
+                logger.info("Scraping annulé pour %s", url)
+                return None
 
             except requests.exceptions.SSLError:
                 try:
                     # Réessayer sans vérification SSL
-                    response = session.get(
-                        url,
-                        timeout=30,
-                        allow_redirects=True,
-                        verify=False
-                    )
-                    response.raise_for_status()
-                    return response.text
+                    page = self._download(url, headers, cancel_token, verify=False)
+                    if page is None:
+                        continue
+                    return page
                 except Exception as e:
-                    print(f"Erreur SSL fallback pour User-Agent {i + 1}: {e}")
+                    logger.info("Erreur SSL fallback pour User-Agent %d: %s", i + 1, e)
                     continue
 
             except requests.exceptions.Timeout:
-                print(f"Timeout avec User-Agent {i + 1}")
+                logger.info("Timeout avec User-Agent %d pour %s", i + 1, url)
                 continue
 
             except requests.exceptions.RequestException as e:
-                print(f"Erreur avec User-Agent {i + 1}: {e}")
+                logger.info("Erreur avec User-Agent %d: %s", i + 1, e)
                 continue
 
-        print(f"Échec du scraping pour {url} avec tous les User-Agents")
+        logger.warning("Échec du scraping pour %s avec tous les User-Agents", url)
         return None
 
-    def extract_schemas(self, url: str, html: Optional[str] = None) -> Dict:
+    @staticmethod
+    def _conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+        """En-têtes If-None-Match / If-Modified-Since d'un GET conditionnel"""
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _head_precheck(self, url: str, cancel_token: Optional[CancelToken] = None) -> bool:
+        """
+        Requête HEAD préalable: écarte les contenus non HTML sans télécharger le corps
+
+        Args:
+            url: URL à vérifier
+            cancel_token: Jeton d'annulation (optionnel)
+
+        Returns:
+            False seulement si le serveur annonce un type de contenu non HTML
+        """
+        try:
+            with self.scheduler.slot(url, cancel_token) if self.scheduler else nullcontext():
+                response = self.http.request('HEAD', url, cancel_token=cancel_token, timeout=15, allow_redirects=True)
+        except requests.exceptions.RequestException:
+            # HEAD non supporté ou en erreur: laisser le GET décider
+            return True
+
+        content_type = response.headers.get('content-type', '')
+        if response.ok and content_type and 'text/html' not in content_type:
+            logger.info("Type de contenu inattendu (HEAD): %s pour %s", content_type, url)
+            return False
+        return True
+
+    def _download(self,
+                  url: str,
+                  headers: Dict[str, str],
+                  cancel_token: Optional[CancelToken] = None,
+                  verify: bool = True) -> Optional[Dict]:
+        """
+        GET en streaming avec vérifications avant lecture du corps
+
+        Le type de contenu est contrôlé sur les en-têtes, le corps est lu (et
+        décompressé) par blocs jusqu'à Config.MAX_PAGE_BYTES, et la lecture
+        s'arrête dès la fin du document (</html> hors script et commentaire).
+
+        Returns:
+            Dictionnaire {'html', 'bytes', 'truncated', 'not_modified',
+            'etag', 'last_modified'}, ou None si le contenu n'est pas du HTML
+
+        Raises:
+            RequestCancelled: si le jeton est annulé pendant la lecture
+            requests.exceptions.RequestException: en cas d'erreur réseau
+        """
+        # Place accordée par l'ordonnanceur de politesse pendant toute la lecture
+        with self.scheduler.slot(url, cancel_token) if self.scheduler else nullcontext():
+            start = time.perf_counter()
+            # Jusqu'aux en-têtes: connexion éventuelle (span 'http.connect') et TTFB
+            with span('http.ttfb', url=url), fetching(url):
+                try:
+                    response = self.http.get(
+                        url,
+                        headers=headers,
+                        cancel_token=cancel_token,
+                        timeout=30,
+                        allow_redirects=True,
+                        verify=verify,
+                        stream=True
+                    )
+                except requests.exceptions.RequestException as e:
+                    _page_fetches.inc(status='timeout' if isinstance(e, requests.exceptions.Timeout) else 'error')
+                    raise
+            _page_fetches.inc(status=str(response.status_code))
+            if self.scheduler:
+                self.scheduler.record_response(url, response.status_code, response.headers.get('retry-after'))
+
+            with span('http.download', url=url) as fields:
+                page = self._read_page(url, response, cancel_token)
+                fields['bytes'] = page['bytes'] if page else 0
+            _fetch_seconds.observe(time.perf_counter() - start)
+            return page
+
+    def _read_page(self,
+                   url: str,
+                   response: requests.Response,
+                   cancel_token: Optional[CancelToken] = None) -> Optional[Dict]:
+        """Lit le corps d'une réponse en streaming (voir _download)"""
+        try:
+            response.raise_for_status()
+
+            page = {
+                'html': None,
+                'bytes': 0,
+                'truncated': False,
+                'not_modified': response.status_code == 304,
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified')
+            }
+
+            # Page inchangée depuis la version en cache: aucun corps à lire
+            if page['not_modified']:
+                return page
+
+            # Vérifier que c'est du HTML avant de lire le corps
+            content_type = response.headers.get('content-type', '')
+            if 'text/html' not in content_type:
+                logger.info("Type de contenu inattendu: %s pour %s", content_type, url)
+                return None
+
+            chunks = []
+            size = 0
+            truncated = False
+            finished = False
+            document_end = _DocumentEndScanner()
+
+            for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                if cancel_token and cancel_token.cancelled:
+                    raise RequestCancelled(url)
+
+                # Contenu binaire malgré l'en-tête annoncé
+                if not chunks and b'\x00' in chunk[:1024]:
+                    logger.info("Contenu binaire reçu pour %s", url)
+                    return None
+
+                if size + len(chunk) > Config.MAX_PAGE_BYTES:
+                    chunks.append(chunk[:Config.MAX_PAGE_BYTES - size])
+                    size = Config.MAX_PAGE_BYTES
+                    truncated = True
+                    logger.warning("Page tronquée", extra={'url': url, 'bytes': size})
+                    break
+
+                chunks.append(chunk)
+                size += len(chunk)
+
+                # Fin du document: les données structurées ont toutes été vues
+                if document_end.feed(chunk):
+                    finished = True
+                    break
+
+            if truncated or finished:
+                self._release_or_close(response)
+
+            page['html'] = self._decode_body(b''.join(chunks), response.encoding)
+            page['bytes'] = size
+            page['truncated'] = truncated
+            return page
+
+        finally:
+            response.close()
+
+    def _release_or_close(self, response: requests.Response):
+        """
+        Après un arrêt anticipé, vide le reste de la réponse s'il est court
+        pour garder la connexion keep-alive; sinon la connexion est fermée
+        """
+        remaining = getattr(response.raw, 'length_remaining', None)
+        if remaining is not None and remaining <= _DOWNLOAD_CHUNK_SIZE:
+            try:
+                response.raw.drain_conn()
+            except Exception:
+                pass
+
+    def _decode_body(self, body: bytes, encoding: Optional[str]) -> str:
+        """Décode le corps HTML (encodage annoncé, UTF-8 par défaut)"""
+        try:
+            return body.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
+
+    async def ascrape_url(self, url: str, cancel_token: Optional[CancelToken] = None) -> Optional[str]:
+        """
+        Version awaitable de scrape_url()
+
+        Args:
+            url: URL à scraper
+            cancel_token: Jeton d'annulation (optionnel)
+
+        Returns:
+            Contenu HTML ou None si erreur
+        """
+        cancel_token = cancel_token or CancelToken()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self.scrape_url, url, cancel_token)
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+    def extract_schemas(self,
+                        url: str,
+                        html: Optional[str] = None,
+                        cancel_token: Optional[CancelToken] = None,
+                        json_ld_only: bool = False) -> Dict:
         """
         Extrait tous les schemas d'une page avec détection améliorée
 
         Args:
             url: URL de la page
             html: Contenu HTML (optionnel, sera scrapé si non fourni)
+            cancel_token: Jeton d'annulation du téléchargement (optionnel)
+            json_ld_only: Extraire seulement le JSON-LD par pré-scan, sans
+                construire le DOM; le parsing complet reste utilisé si la
+                page contient des microdata ou un JSON-LD illisible
 
         Returns:
             Dictionnaire contenant tous les schemas trouvés
         """
         if not html:
-            html = self.scrape_url(url)
+            html = self.scrape_url(url, cancel_token)
             if not html:
                 return {}
 
         try:
-            print(f"Analyse de {url}...")
-            print(f"Taille HTML: {len(html)} caractères")
-
-            # Parser le HTML avec BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
+            logger.debug("Analyse de %s (%d caractères)", url, len(html))
+
+            if json_ld_only:
+                with span('json_ld.prescan', url=url):
+                    json_ld_items = self._prescan_json_ld(html)
+                if json_ld_items is not None:
+                    with span('json_ld.process', url=url):
+                        json_ld_processed = self._process_json_ld(json_ld_items)
+                    return {
+                        'json-ld': json_ld_processed,
+                        'microdata': [],
+                        'rdfa': [],
+                        'opengraph': []
+                    }
+                logger.debug("Pré-scan JSON-LD insuffisant, parsing complet")
+
+            # Un seul parsing lxml, partagé par toutes les extractions
+            with span('parse', url=url, chars=len(html)):
+                tree = self._parse_html(html)
 
             # 1. EXTRACTION JSON-LD MANUELLE (méthode principale)
             json_ld_schemas = []
 
-            # Chercher tous les scripts JSON-LD
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            print(f"Trouvé {len(json_ld_scripts)} scripts JSON-LD")
+            with span('json_ld.parse', url=url):
+                # Chercher tous les scripts JSON-LD
+                json_ld_scripts = tree.xpath('//script[@type="application/ld+json"]')
+                logger.debug("Trouvé %d scripts JSON-LD", len(json_ld_scripts))
 
-            for i, script in enumerate(json_ld_scripts):
-                try:
-                    script_content = script.string or script.get_text()
-                    if script_content:
-                        script_content = script_content.strip()
+                for i, script in enumerate(json_ld_scripts):
+                    try:
+                        script_content = script.text
+                        if script_content:
+                            script_content = script_content.strip()
 
-                        # Parser le JSON
-                        data = json.loads(script_content)
+                            # Parser le JSON
+                            data = json.loads(script_content)
 
-                        if isinstance(data, list):
-                            json_ld_schemas.extend(data)
-                            print(f"Script {i + 1}: liste de {len(data)} éléments")
-                        else:
-                            json_ld_schemas.append(data)
-                            print(f"Script {i + 1}: objet unique")
+                            if isinstance(data, list):
+                                json_ld_schemas.extend(data)
+                            else:
+                                json_ld_schemas.append(data)
 
-                except json.JSONDecodeError as e:
-                    print(f"Erreur JSON dans script {i + 1}: {e}")
-                except Exception as e:
-                    print(f"Erreur générale script {i + 1}: {e}")
+                    except json.JSONDecodeError as e:
+                        logger.info("Erreur JSON dans script %d de %s: %s", i + 1, url, e)
+                    except Exception as e:
+                        logger.warning("Erreur générale script %d de %s: %s", i + 1, url, e)
 
-            # 2. EXTRACTION AVEC EXTRUCT (backup)
+            # 2. EXTRACTION AVEC EXTRUCT (backup), sur l'arbre déjà parsé
             extruct_data = {'microdata': [], 'rdfa': [], 'opengraph': []}
             try:
-                extruct_data = extruct.extract(
-                    html,
-                    base_url=url,
-                    syntaxes=['json-ld', 'microdata', 'rdfa', 'opengraph']
-                )
+                with span('extruct', url=url):
+                    extruct_data = extruct.extract(
+                        tree,
+                        base_url=url,
+                        syntaxes=['json-ld', 'microdata', 'rdfa', 'opengraph']
+                    )
 
                 # Ajouter les données extruct JSON-LD si on n'a rien trouvé manuellement
                 extruct_json_ld = extruct_data.get('json-ld', [])
                 if extruct_json_ld and not json_ld_schemas:
                     json_ld_schemas.extend(extruct_json_ld)
-                    print(f"Ajouté {len(extruct_json_ld)} schemas via extruct")
+                    logger.debug("Ajouté %d schemas via extruct", len(extruct_json_ld))
 
             except Exception as e:
-                print(f"Erreur extruct: {e}")
+                logger.warning("Erreur extruct pour %s: %s", url, e)
 
             # 3. EXTRACTION MICRODATA MANUELLE
             microdata_items = []
             try:
-                microdata_elements = soup.find_all(attrs={"itemtype": True})
-                print(f"Trouvé {len(microdata_elements)} éléments microdata")
-
-                for element in microdata_elements:
-                    microdata_item = self._extract_microdata_item(element)
-                    if microdata_item:
-                        microdata_items.append(microdata_item)
+                with span('microdata', url=url):
+                    microdata_items = self._extract_microdata(tree)
+                logger.debug("Trouvé %d items microdata", len(microdata_items))
 
             except Exception as e:
-                print(f"Erreur extraction microdata: {e}")
+                logger.warning("Erreur extraction microdata pour %s: %s", url, e)
 
             # 4. COMPILATION DES RÉSULTATS
+            with span('json_ld.process', url=url):
+                json_ld_processed = self._process_json_ld(json_ld_schemas)
             schemas = {
-                'json-ld': self._process_json_ld(json_ld_schemas),
+                'json-ld': json_ld_processed,
                 'microdata': microdata_items or extruct_data.get('microdata', []),
                 'rdfa': extruct_data.get('rdfa', []),
                 'opengraph': extruct_data.get('opengraph', [])
@@ -206,75 +547,149 @@ class SchemaScraper:
                     len(schemas['opengraph'])
             )
 
-            print(f"Résultats finaux:")
-            print(f"   JSON-LD: {len(schemas['json-ld'])}")
-            print(f"   Microdata: {len(schemas['microdata'])}")
-            print(f"   RDFa: {len(schemas['rdfa'])}")
-            print(f"   OpenGraph: {len(schemas['opengraph'])}")
-            print(f"   TOTAL: {total_schemas}")
+            logger.debug(
+                "Résultats finaux: JSON-LD=%d Microdata=%d RDFa=%d OpenGraph=%d TOTAL=%d",
+                len(schemas['json-ld']), len(schemas['microdata']),
+                len(schemas['rdfa']), len(schemas['opengraph']), total_schemas
+            )
 
             return schemas
 
         except Exception as e:
-            print(f"Erreur lors de l'extraction des schemas de {url}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erreur lors de l'extraction des schemas de %s: %s", url, e)
             return {}
 
-    def _extract_microdata_item(self, element) -> Optional[Dict]:
+    def _prescan_json_ld(self, html: str) -> Optional[List]:
         """
-        Extrait un item microdata d'un élément HTML
+        Extrait les blocs JSON-LD par expression régulière, sans DOM
 
         Args:
-            element: Élément BeautifulSoup
+            html: Contenu HTML
 
         Returns:
-            Dictionnaire représentant l'item microdata
+            Items JSON-LD bruts, ou None si un parsing complet est nécessaire
+            (attributs itemtype présents ou script JSON-LD non décodable)
         """
-        try:
-            itemtype = element.get('itemtype')
-            if not itemtype:
+        if _ITEMTYPE_RE.search(html):
+            return None
+
+        if '<!--' in html:
+            html = _HTML_COMMENT_RE.sub('', html)
+
+        items = []
+        for i, match in enumerate(_JSON_LD_SCRIPT_RE.finditer(html)):
+            try:
+                data = _json_loads(match.group(1).strip())
+            except ValueError as e:
+                # CDATA, commentaires JS...: laisser le parsing complet et extruct s'en charger
+                logger.debug("Script JSON-LD %d non décodable par le pré-scan: %s", i + 1, e)
                 return None
 
-            item = {
-                'type': itemtype,
-                'properties': {}
-            }
+            if isinstance(data, list):
+                items.extend(data)
+            else:
+                items.append(data)
 
-            # Chercher toutes les propriétés dans cet élément
-            prop_elements = element.find_all(attrs={"itemprop": True})
+        logger.debug("Pré-scan: %d items JSON-LD", len(items))
+        return items
 
-            for prop_element in prop_elements:
-                prop_name = prop_element.get('itemprop')
-                if not prop_name:
-                    continue
+    def _parse_html(self, html: str):
+        """
+        Parse le HTML une seule fois en arbre lxml
 
-                # Extraire la valeur selon le type d'élément
-                if prop_element.name == 'meta':
-                    value = prop_element.get('content', '')
-                elif prop_element.name == 'a':
-                    value = prop_element.get('href', prop_element.get_text().strip())
-                elif prop_element.name == 'img':
-                    value = prop_element.get('src', prop_element.get('alt', ''))
-                elif prop_element.name == 'time':
-                    value = prop_element.get('datetime', prop_element.get_text().strip())
-                else:
-                    value = prop_element.get_text().strip()
+        L'arbre est compatible avec tous les extracteurs extruct (y compris
+        RDFa). BeautifulSoup, via lxml.html.soupparser, ne sert que de repli
+        lorsque lxml ne parvient pas à construire un document.
 
+        Args:
+            html: Contenu HTML
+
+        Returns:
+            Élément racine lxml
+        """
+        try:
+            tree = parse_xmldom_html(html.encode('utf-8'), encoding='utf-8')
+            if len(tree):
+                return tree
+        except (etree.ParserError, ValueError) as e:
+            logger.info("Parsing lxml impossible (%s), repli sur BeautifulSoup", e)
+
+        return soupparser.fromstring(html, makeelement=XmlDomHTMLParser(encoding='utf-8').makeelement)
+
+    def _extract_microdata(self, tree) -> List[Dict]:
+        """
+        Extrait les items microdata en un seul parcours de l'arbre
+
+        Chaque propriété est rattachée à l'itemscope englobant le plus proche;
+        une propriété portant elle-même un itemscope a pour valeur l'item
+        imbriqué. Le parcours est linéaire en nombre d'éléments, quelle que
+        soit la profondeur d'imbrication.
+
+        Args:
+            tree: Élément racine lxml
+
+        Returns:
+            Liste à plat des items typés ({'type', 'properties'}), dans l'ordre
+            du document; les items imbriqués y figurent aussi
+        """
+        items = []
+        # Pile des itemscopes ouverts: (élément, item)
+        scopes = []
+
+        for event, element in etree.iterwalk(tree, events=('start', 'end')):
+            if not isinstance(element.tag, str):
+                continue
+
+            if event == 'end':
+                if scopes and scopes[-1][0] is element:
+                    scopes.pop()
+                continue
+
+            is_scope = element.get('itemscope') is not None or element.get('itemtype') is not None
+            item = None
+            if is_scope:
+                item = {'type': element.get('itemtype'), 'properties': {}}
+                if item['type']:
+                    items.append(item)
+
+            prop_names = element.get('itemprop')
+            if prop_names and scopes:
+                value = item if is_scope else self._microdata_value(element)
                 if value:
-                    if prop_name in item['properties']:
-                        # Si la propriété existe déjà, créer une liste
-                        if not isinstance(item['properties'][prop_name], list):
-                            item['properties'][prop_name] = [item['properties'][prop_name]]
-                        item['properties'][prop_name].append(value)
-                    else:
-                        item['properties'][prop_name] = value
+                    properties = scopes[-1][1]['properties']
+                    for prop_name in prop_names.split():
+                        if prop_name in properties:
+                            # Si la propriété existe déjà, créer une liste
+                            if not isinstance(properties[prop_name], list):
+                                properties[prop_name] = [properties[prop_name]]
+                            properties[prop_name].append(value)
+                        else:
+                            properties[prop_name] = value
 
-            return item if item['properties'] else None
+            if is_scope:
+                scopes.append((element, item))
 
-        except Exception as e:
-            print(f"Erreur extraction microdata item: {e}")
-            return None
+        return [item for item in items if item['properties']]
+
+    def _microdata_value(self, element) -> str:
+        """
+        Valeur d'une propriété microdata selon le type d'élément
+
+        Args:
+            element: Élément lxml portant itemprop
+
+        Returns:
+            Valeur textuelle de la propriété
+        """
+        if element.tag == 'meta':
+            return element.get('content', '')
+        elif element.tag in ('a', 'link'):
+            return element.get('href') or element.text_content().strip()
+        elif element.tag == 'img':
+            return element.get('src', element.get('alt', ''))
+        elif element.tag == 'time':
+            return element.get('datetime', element.text_content().strip())
+        return element.text_content().strip()
 
     def _process_json_ld(self, json_ld_data: List[Dict]) -> List[Dict]:
         """
@@ -289,53 +704,43 @@ class SchemaScraper:
         """
         processed = []
         seen_items = set()
-
-        print(f"Traitement de {len(json_ld_data)} items JSON-LD")
+        # Journal par item seulement en mode debug (boucle chaude sur les grosses pages)
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for i, item in enumerate(json_ld_data):
             if not isinstance(item, dict):
                 continue
 
-            print(f"Item {i + 1}: {list(item.keys())}")
-
             # CORRECTION PRINCIPALE: Gérer les @graph
             if '@graph' in item:
-                print(f"Structure @graph détectée")
                 graph_items = item.get('@graph', [])
 
                 if isinstance(graph_items, list):
-                    print(f"   {len(graph_items)} éléments dans le @graph")
+                    if debug:
+                        logger.debug("Item %d: @graph de %d éléments", i + 1, len(graph_items))
 
                     for j, graph_item in enumerate(graph_items):
                         if isinstance(graph_item, dict) and '@type' in graph_item:
-                            schema_type = graph_item.get('@type', '')
-                            print(f"   Graph item {j + 1}: @type = {schema_type}")
-
                             # Dédupliquer et ajouter
                             processed_item = self._deduplicate_schema(graph_item, seen_items)
                             if processed_item:
                                 processed.append(processed_item)
-                                print(f"      Ajouté: {schema_type}")
-                            else:
-                                print(f"      Ignoré (dupliqué): {schema_type}")
-                else:
-                    print(f"   @graph n'est pas une liste: {type(graph_items)}")
+                            elif debug:
+                                logger.debug("Graph item %d ignoré (dupliqué): %s", j + 1, graph_item.get('@type'))
+                elif debug:
+                    logger.debug("Item %d: @graph n'est pas une liste: %s", i + 1, type(graph_items))
 
             elif '@type' in item:
                 # Schema individuel (pas dans un @graph)
-                schema_type = item.get('@type', '')
-                print(f"Schema individuel: @type = {schema_type}")
-
                 processed_item = self._deduplicate_schema(item, seen_items)
                 if processed_item:
                     processed.append(processed_item)
-                    print(f"   Ajouté: {schema_type}")
-                else:
-                    print(f"   Ignoré (dupliqué): {schema_type}")
-            else:
-                print(f"Item sans @type ni @graph ignoré")
+                elif debug:
+                    logger.debug("Item %d ignoré (dupliqué): %s", i + 1, item.get('@type'))
+            elif debug:
+                logger.debug("Item %d sans @type ni @graph ignoré", i + 1)
 
-        print(f"Traitement terminé: {len(json_ld_data)} items -> {len(processed)} schemas uniques")
+        logger.debug("Traitement JSON-LD: %d items -> %d schemas uniques", len(json_ld_data), len(processed))
         return processed
 
     def _deduplicate_schema(self, schema: Dict, seen_items: Set) -> Optional[Dict]:
@@ -389,12 +794,9 @@ class SchemaScraper:
             if not schemas or not isinstance(schemas, dict):
                 return types
 
-            print(f"Extraction des types de schemas...")
-
             # JSON-LD
             json_ld_items = schemas.get('json-ld', [])
             if isinstance(json_ld_items, list):
-                print(f"Analyse de {len(json_ld_items)} items JSON-LD")
                 for item in json_ld_items:
                     if isinstance(item, dict) and '@type' in item:
                         schema_type = item['@type']
@@ -404,7 +806,6 @@ class SchemaScraper:
                             clean_type = type_name.split(':')[-1] if ':' in type_name else type_name
                             if clean_type and len(clean_type) > 1:
                                 types.add(clean_type)
-                                print(f"  Trouvé: {clean_type}")
 
                         elif isinstance(schema_type, list):
                             for t in schema_type:
@@ -413,12 +814,10 @@ class SchemaScraper:
                                     clean_type = type_name.split(':')[-1] if ':' in type_name else type_name
                                     if clean_type and len(clean_type) > 1:
                                         types.add(clean_type)
-                                        print(f"  Trouvé: {clean_type}")
 
             # Microdata
             microdata_items = schemas.get('microdata', [])
             if isinstance(microdata_items, list):
-                print(f"Analyse de {len(microdata_items)} items Microdata")
                 for item in microdata_items:
                     if isinstance(item, dict) and 'type' in item:
                         type_url = item['type']
@@ -430,7 +829,6 @@ class SchemaScraper:
 
                             if type_name and len(type_name) > 1:
                                 types.add(type_name)
-                                print(f"  Trouvé: {type_name}")
 
             # RDFa
             rdfa_items = schemas.get('rdfa', [])
@@ -446,16 +844,11 @@ class SchemaScraper:
                                     if clean_type and len(clean_type) > 1:
                                         types.add(clean_type)
 
-            print(f"Total des types trouvés: {len(types)}")
-            if types:
-                print(f"Types: {', '.join(sorted(types))}")
-            else:
-                print("Aucun type de schema détecté")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%d type(s) trouvé(s): %s", len(types), ', '.join(sorted(types)) or '-')
 
         except Exception as e:
-            print(f"Erreur dans get_schema_types: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erreur dans get_schema_types: %s", e)
 
         return types
 
@@ -507,70 +900,298 @@ class SchemaScraper:
                                 matching_schemas.append(schema)
 
         except Exception as e:
-            print(f"Erreur dans get_schemas_by_type: {e}")
+            logger.warning("Erreur dans get_schemas_by_type: %s", e)
 
         return matching_schemas
 
-    def analyze_multiple_urls(self, urls: List[str]) -> Dict:
+    def analyze_multiple_urls(self,
+                              urls: List[str],
+                              max_workers: Optional[int] = None,
+                              deadline: Optional[float] = None,
+                              json_ld_only: bool = False,
+                              progress: Optional[Callable[[int, int], None]] = None) -> Dict:
         """
-        Analyse plusieurs URLs et compile les résultats
+        Analyse plusieurs URLs en parallèle et compile les résultats
+
+        Les URLs sont récupérées par un pool de threads borné. L'ordre des
+        positions SERP est conservé dans les résultats, quel que soit l'ordre
+        de fin des téléchargements.
 
         Args:
             urls: Liste des URLs à analyser
+            max_workers: Nombre maximum de requêtes simultanées
+                (défaut: Config.MAX_CONCURRENT_REQUESTS)
+            deadline: Durée maximale de l'analyse en secondes
+                (défaut: Config.ANALYSIS_DEADLINE)
+            json_ld_only: Mode rapide limité au JSON-LD (voir extract_schemas)
+            progress: Callback progress(urls terminées, total) (voir analyze_urls)
 
         Returns:
             Dictionnaire avec l'analyse compilée
         """
-        results = {
-            'urls_analyzed': [],
-            'schema_frequency': {},
-            'schema_by_position': {},
-            'total_urls': len(urls)
-        }
+        urls = urls[:Config.MAX_URLS_PER_ANALYSIS]
+        return self.compile_url_results(self.analyze_urls(urls, max_workers, deadline, json_ld_only, progress))
+
+    def analyze_urls(self,
+                     urls: List[str],
+                     max_workers: Optional[int] = None,
+                     deadline: Optional[float] = None,
+                     json_ld_only: bool = False,
+                     progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+        """
+        Analyse une liste d'URLs en parallèle, sans limite de nombre
 
-        for position, url in enumerate(urls, 1):
-            try:
-                print(f"\nAnalyse URL {position}/{len(urls)}: {url}")
+        Args:
+            urls: Liste des URLs à analyser
+            max_workers: Nombre maximum de requêtes simultanées
+                (défaut: Config.MAX_CONCURRENT_REQUESTS)
+            deadline: Durée maximale de l'analyse en secondes
+                (défaut: Config.ANALYSIS_DEADLINE)
+            json_ld_only: Mode rapide limité au JSON-LD (voir extract_schemas)
+            progress: Callback progress(urls terminées, total), appelé dans le
+                thread de l'appelant à chaque URL terminée (optionnel)
 
-                schemas = self.extract_schemas(url)
-                schema_types = self.get_schema_types(schemas)
+        Returns:
+            Résultats par URL, dans l'ordre des URLs (position = rang dans la liste)
+        """
+        max_workers = max_workers or Config.MAX_CONCURRENT_REQUESTS
+        deadline = Config.ANALYSIS_DEADLINE if deadline is None else deadline
 
-                results['urls_analyzed'].append({
-                    'url': url,
-                    'position': position,
-                    'schemas': schemas,
-                    'schema_types': list(schema_types)
-                })
+        if not urls:
+            return []
 
-                # Compter la fréquence des schemas
-                for schema_type in schema_types:
-                    if schema_type not in results['schema_frequency']:
-                        results['schema_frequency'][schema_type] = 0
-                    results['schema_frequency'][schema_type] += 1
+        url_results: List[Optional[Dict]] = [None] * len(urls)
+        cancel_token = CancelToken()
 
-                    # Enregistrer les positions où apparaît chaque schema
-                    if schema_type not in results['schema_by_position']:
-                        results['schema_by_position'][schema_type] = []
-                    results['schema_by_position'][schema_type].append(position)
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+        # Les spans des threads du pool sont rattachés à l'analyse en cours
+        analyze_single_url = bind(self._analyze_single_url)
+        futures = {
+            executor.submit(analyze_single_url, url, position, len(urls), cancel_token, json_ld_only): position - 1
+            for position, url in enumerate(urls, 1)
+        }
 
-            except Exception as e:
-                print(f"Erreur lors de l'analyse de {url}: {e}")
-                results['urls_analyzed'].append({
+        try:
+            for done, future in enumerate(as_completed(futures, timeout=deadline), 1):
+                url_results[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(urls))
+        except FuturesTimeoutError:
+            pending = sum(1 for url_result in url_results if url_result is None)
+            logger.warning("Délai d'analyse dépassé", extra={'deadline': deadline, 'abandoned_urls': pending})
+            # Empêcher les retardataires de lancer de nouvelles requêtes
+            cancel_token.cancel()
+        finally:
+            # Ne pas attendre les retardataires: leurs résultats sont ignorés
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for position, url in enumerate(urls, 1):
+            if url_results[position - 1] is None:
+                url_results[position - 1] = {
                     'url': url,
                     'position': position,
                     'schemas': {},
                     'schema_types': [],
-                    'error': str(e)
-                })
+                    'error': f'Délai dépassé ({deadline}s)',
+                    'timed_out': True
+                }
+
+        return url_results
+
+    def compile_url_results(self, url_results: List[Dict]) -> Dict:
+        """
+        Compile des résultats par URL en fréquences et positions de schemas
+
+        Args:
+            url_results: Résultats par URL (clé 'position' renseignée)
+
+        Returns:
+            Dictionnaire avec l'analyse compilée
+        """
+        with span('aggregation.compile', urls=len(url_results)):
+            return self._compile_url_results(url_results)
+
+    def _compile_url_results(self, url_results: List[Dict]) -> Dict:
+        """Compilation des résultats par URL (voir compile_url_results)"""
+        results = {
+            'urls_analyzed': [],
+            'schema_frequency': {},
+            'schema_by_position': {},
+            'total_urls': len(url_results),
+            'page_reuse': reuse_stats(url_results),
+            'truncated_urls': [url_result['url'] for url_result in url_results if url_result.get('truncated')]
+        }
+
+        for url_result in url_results:
+            results['urls_analyzed'].append(url_result)
+            position = url_result['position']
+
+            for schema_type in url_result['schema_types']:
+                # Compter la fréquence des schemas
+                if schema_type not in results['schema_frequency']:
+                    results['schema_frequency'][schema_type] = 0
+                results['schema_frequency'][schema_type] += 1
+
+                # Enregistrer les positions où apparaît chaque schema
+                if schema_type not in results['schema_by_position']:
+                    results['schema_by_position'][schema_type] = []
+                results['schema_by_position'][schema_type].append(position)
 
         return results
 
-    def analyze_serp_results(self, serp_results: List[Dict]) -> Dict:
+    def get_page(self,
+                 url: str,
+                 cancel_token: Optional[CancelToken] = None,
+                 json_ld_only: bool = False) -> Tuple[Dict, bool]:
+        """
+        Extraction d'une page via le magasin de pages partagé
+
+        Une page déjà extraite par une autre analyse (mots-clés, lots, ma
+        page) est servie sans requête; une page expirée est revalidée par GET
+        conditionnel avec ses validateurs.
+
+        Args:
+            url: URL de la page
+            cancel_token: Jeton d'annulation du téléchargement (optionnel)
+            json_ld_only: Mode rapide limité au JSON-LD
+
+        Returns:
+            Tuple (extraction, réutilisée): extraction {'schemas',
+            'schema_types', 'fetched', ...} ('fetched' à False si la page n'a
+            pas pu être téléchargée)
+        """
+        return self.page_store.get_or_extract(
+            url,
+            lambda: self._extract_page(url, cancel_token, json_ld_only),
+            variant='json-ld' if json_ld_only else None,
+            revalidate=lambda previous: self._extract_page(url, cancel_token, json_ld_only, previous)
+        )
+
+    def _analyze_single_url(self,
+                            url: str,
+                            position: int,
+                            total: int,
+                            cancel_token: Optional[CancelToken] = None,
+                            json_ld_only: bool = False) -> Dict:
+        """
+        Analyse une URL unique (exécuté dans un thread du pool)
+
+        Args:
+            url: URL à analyser
+            position: Position SERP de l'URL
+            total: Nombre total d'URLs de l'analyse
+            cancel_token: Jeton d'annulation de l'analyse (optionnel)
+            json_ld_only: Mode rapide limité au JSON-LD
+
+        Returns:
+            Résultat de l'analyse pour cette URL
+        """
+        try:
+            logger.debug("Analyse URL %d/%d: %s", position, total, url)
+
+            page, reused = self.get_page(url, cancel_token, json_ld_only)
+
+            return {
+                'url': url,
+                'position': position,
+                'schemas': page['schemas'],
+                'schema_types': page['schema_types'],
+                'fetched': page.get('fetched', True),
+                'reused': reused,
+                'revalidated': not reused and page.get('revalidated', False),
+                'truncated': page.get('truncated', False)
+            }
+
+        except Exception as e:
+            logger.warning("Erreur lors de l'analyse de %s: %s", url, e)
+            return {
+                'url': url,
+                'position': position,
+                'schemas': {},
+                'schema_types': [],
+                'error': str(e)
+            }
+
+    def _extract_page(self,
+                      url: str,
+                      cancel_token: Optional[CancelToken] = None,
+                      json_ld_only: bool = False,
+                      previous: Optional[Dict] = None) -> Dict:
+        """
+        Télécharge une page et extrait ses schemas (calcul du magasin de pages)
+
+        Args:
+            url: URL de la page
+            cancel_token: Jeton d'annulation du téléchargement (optionnel)
+            json_ld_only: Mode rapide limité au JSON-LD
+            previous: Extraction expirée à revalider (optionnel); ses schemas
+                sont repris tels quels si le serveur répond 304
+
+        Returns:
+            Dictionnaire {'url', 'schemas', 'schema_types', 'fetched', 'bytes',
+            'truncated', 'etag', 'last_modified', 'revalidated'}
+        """
+        page = self.scrape_page(url, cancel_token, validators=previous)
+
+        if page and page['not_modified'] and previous:
+            # Le serveur peut renouveler ses validateurs dans la réponse 304
+            return {
+                **previous,
+                'etag': page['etag'] or previous.get('etag'),
+                'last_modified': page['last_modified'] or previous.get('last_modified'),
+                'revalidated': True
+            }
+
+        if not page or not page['html']:
+            return {'url': url, 'schemas': {}, 'schema_types': [], 'fetched': False}
+
+        extraction = self._extract_page_data(url, page['html'], json_ld_only)
+        return {
+            'url': url,
+            'schemas': extraction['schemas'],
+            'schema_types': extraction['schema_types'],
+            'fetched': True,
+            'bytes': page['bytes'],
+            'truncated': page['truncated'],
+            'etag': page['etag'],
+            'last_modified': page['last_modified'],
+            'revalidated': False
+        }
+
+    def _extract_page_data(self, url: str, html: str, json_ld_only: bool = False) -> Dict:
+        """
+        Extrait schemas et types d'une page, dans le pool de processus s'il est actif
+
+        Returns:
+            Dictionnaire {'schemas', 'schema_types'}
+        """
+        start = time.perf_counter()
+        mode = 'json-ld' if json_ld_only else 'full'
+        if self.parse_pool:
+            try:
+                # Étapes internes non détaillées: elles s'exécutent dans un autre processus
+                with span('parse_pool', url=url):
+                    extraction = self.parse_pool.extract(url, html, json_ld_only)
+                _parse_seconds.observe(time.perf_counter() - start, mode=mode)
+                return extraction
+            except BrokenProcessPool as e:
+                logger.warning("Pool d'extraction indisponible, extraction locale pour %s: %s", url, e)
+
+        schemas = self.extract_schemas(url, html, json_ld_only=json_ld_only)
+        with span('types', url=url):
+            schema_types = list(self.get_schema_types(schemas))
+        _parse_seconds.observe(time.perf_counter() - start, mode=mode)
+        return {'schemas': schemas, 'schema_types': schema_types}
+
+    def analyze_serp_results(self,
+                             serp_results: List[Dict],
+                             progress: Optional[Callable[[int, int], None]] = None) -> Dict:
         """
         Analyse les résultats SERP pour extraire les schemas
 
         Args:
             serp_results: Liste des résultats organiques de ValueSERP
+            progress: Callback progress(urls terminées, total) (optionnel)
 
         Returns:
             Dictionnaire avec l'analyse des schemas
@@ -581,13 +1202,18 @@ class SchemaScraper:
             if 'link' in result:
                 urls.append(result['link'])
 
-        # Limiter à 10 URLs maximum
-        urls = urls[:10]
+        # Limiter au nombre maximum d'URLs par analyse
+        urls = urls[:Config.MAX_URLS_PER_ANALYSIS]
 
-        print(f"Analyse des schemas pour {len(urls)} URLs du SERP")
+        logger.info("Analyse des schemas pour %d URLs du SERP", len(urls))
 
         # Utiliser la méthode existante analyze_multiple_urls
-        analysis_results = self.analyze_multiple_urls(urls)
+        analysis_results = self.analyze_multiple_urls(urls, progress=progress)
+
+        page_reuse = analysis_results['page_reuse']
+        logger.info("Pages réutilisées: %d/%d (%.0f%%), revalidées (304): %d",
+                    page_reuse['reused'], page_reuse['urls'], page_reuse['reuse_ratio'] * 100,
+                    page_reuse['revalidated'])
 
         # Ajouter des métadonnées supplémentaires
         analysis_results['serp_data'] = serp_results
@@ -17,6 +17,13 @@ TRANSLATIONS = {
         'cache': 'Cache',
         'clear_cache': 'Vider le cache',
         'cache_cleared': 'Cache vidé !',
+        'cache_entries': 'Entrées en cache',
+        'cache_hit_ratio': 'Taux de succès',
+        'cache_evictions': 'Évictions / expirations',
+        'cache_size': 'Taille approximative',
+        'cache_enabled': 'Cache activé',
+        'cache_fresh_results': 'Résultats issus du cache (il y a {minutes} min)',
+        'cache_stale_results': 'Résultats en cache datant de {minutes} min : actualisation en cours en arrière-plan, relancez l\'analyse pour obtenir la version à jour',
         'diagnostic': 'Diagnostic',
         'check_api_status': 'Vérifier le statut de l\'API',
 
@@ -415,6 +422,16 @@ TRANSLATIONS = {
         'schema_desc_event': 'Événement avec date et lieu',
         'schema_desc_jobposting': 'Offre d\'emploi',
         'schema_desc_service': 'Service offert par votre entreprise',
+
+        # Durées de l'analyse (mode debug)
+        'analyzing_pages_progress': 'Analyse des pages : {done}/{total}',
+        'stage_timings': 'Durées par étape',
+        'stage': 'Étape',
+        'calls': 'Appels',
+        'wall_time_ms': 'Durée (ms)',
+        'cpu_time_ms': 'CPU (ms)',
+        'max_time_ms': 'Max (ms)',
+        'slowest_pages': 'Pages les plus lentes (ms par étape)',
     },
 
     'en': {
@@ -430,6 +447,13 @@ TRANSLATIONS = {
         'cache': 'Cache',
         'clear_cache': 'Clear cache',
         'cache_cleared': 'Cache cleared!',
+        'cache_entries': 'Cached entries',
+        'cache_hit_ratio': 'Hit ratio',
+        'cache_evictions': 'Evictions / expirations',
+        'cache_size': 'Approximate size',
+        'cache_enabled': 'Cache enabled',
+        'cache_fresh_results': 'Results served from cache ({minutes} min ago)',
+        'cache_stale_results': 'Cached results from {minutes} min ago: refreshing in the background, run the analysis again to get the updated version',
         'diagnostic': 'Diagnostic',
         'check_api_status': 'Check API status',
 
@@ -827,6 +851,16 @@ TRANSLATIONS = {
         'schema_desc_event': 'Event with date and location',
         'schema_desc_jobposting': 'Job posting',
         'schema_desc_service': 'Service offered by your company',
+
+        # Analysis timings (debug mode)
+        'analyzing_pages_progress': 'Analyzing pages: {done}/{total}',
+        'stage_timings': 'Time per stage',
+        'stage': 'Stage',
+        'calls': 'Calls',
+        'wall_time_ms': 'Duration (ms)',
+        'cpu_time_ms': 'CPU (ms)',
+        'max_time_ms': 'Max (ms)',
+        'slowest_pages': 'Slowest pages (ms per stage)',
     },
 
     'es': {
@@ -842,6 +876,13 @@ TRANSLATIONS = {
         'cache': 'Caché',
         'clear_cache': 'Limpiar caché',
         'cache_cleared': '¡Caché limpiado!',
+        'cache_entries': 'Entradas en caché',
+        'cache_hit_ratio': 'Tasa de aciertos',
+        'cache_evictions': 'Desalojos / expiraciones',
+        'cache_size': 'Tamaño aproximado',
+        'cache_enabled': 'Caché activada',
+        'cache_fresh_results': 'Resultados de la caché (hace {minutes} min)',
+        'cache_stale_results': 'Resultados en caché de hace {minutes} min: actualizando en segundo plano, vuelve a lanzar el análisis para obtener la versión actualizada',
         'diagnostic': 'Diagnóstico',
         'check_api_status': 'Verificar estado de la API',
 
@@ -1239,6 +1280,16 @@ TRANSLATIONS = {
         'schema_desc_event': 'Evento con fecha y ubicación',
         'schema_desc_jobposting': 'Oferta de trabajo',
         'schema_desc_service': 'Servicio ofrecido por tu empresa',
+
+        # Duraciones del análisis (modo debug)
+        'analyzing_pages_progress': 'Analizando páginas: {done}/{total}',
+        'stage_timings': 'Duración por etapa',
+        'stage': 'Etapa',
+        'calls': 'Llamadas',
+        'wall_time_ms': 'Duración (ms)',
+        'cpu_time_ms': 'CPU (ms)',
+        'max_time_ms': 'Máx. (ms)',
+        'slowest_pages': 'Páginas más lentas (ms por etapa)',
     }
 }
 
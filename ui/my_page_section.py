@@ -9,7 +9,7 @@ from translations import get_text
 from scrapers.schema_scraper import SchemaScraper
 from analyzers.schema_analyzer import SchemaAnalyzer
 from utils.helpers import is_valid_url, normalize_url, get_schema_icon
-from utils.cache import get_cached_schema_analysis, set_cached_schema_analysis
+from utils.cache import get_or_compute_schema_analysis
 
 
 def ensure_data_compatibility():
@@ -64,33 +64,11 @@ def my_page_section():
         # Analyser la page
         with st.spinner(get_text('loading', st.session_state.language)):
             try:
-                # Vérifier le cache
-                cached_data = get_cached_schema_analysis(my_url)
-                if cached_data:
-                    st.session_state.my_page_schemas = cached_data
-                else:
-                    # Scraper les schemas
-                    scraper = SchemaScraper()
-                    schemas = scraper.extract_schemas(my_url)
-
-                    # Extraire les types de schemas
-                    schema_types = scraper.get_schema_types(schemas)
-
-                    # Analyser les schemas (méthode simplifiée)
-                    analyzer = SchemaAnalyzer()
-                    analyzed_schemas = analyzer.analyze_page_schemas(schemas, schema_types)
-
-                    # Combiner les données
-                    result = {
-                        'schemas': schemas,
-                        'schema_types': list(schema_types),
-                        'url': my_url,
-                        'analysis': analyzed_schemas
-                    }
-
-                    # Mettre en cache et sauvegarder
-                    set_cached_schema_analysis(my_url, result)
-                    st.session_state.my_page_schemas = result
+                # Cache, ou analyse unique partagée avec les appels concurrents sur la même URL
+                st.session_state.my_page_schemas = get_or_compute_schema_analysis(
+                    my_url,
+                    lambda: _analyze_page(my_url)
+                )
 
                 st.success(get_text('success_analysis', st.session_state.language))
 
@@ -103,6 +81,35 @@ def my_page_section():
         _display_my_page_results()
 
 
+def _analyze_page(url):
+    """
+    Scrape et analyse les schemas d'une page
+
+    Args:
+        url: URL de la page
+
+    Returns:
+        Résultat combiné (schemas, types, analyse)
+    """
+    # Schemas via le magasin de pages: extraction partagée avec les analyses SERP et les lots
+    scraper = SchemaScraper()
+    page, _ = scraper.get_page(url)
+    schemas = page['schemas']
+    schema_types = set(page['schema_types'])
+
+    # Analyser les schemas (méthode simplifiée)
+    analyzer = SchemaAnalyzer()
+    analyzed_schemas = analyzer.analyze_page_schemas(schemas, schema_types)
+
+    # Combiner les données
+    return {
+        'schemas': schemas,
+        'schema_types': list(schema_types),
+        'url': url,
+        'analysis': analyzed_schemas
+    }
+
+
 def _display_my_page_results():
     """Affiche les résultats d'analyse de ma page"""
     schemas_data = st.session_state.my_page_schemas
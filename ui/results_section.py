@@ -76,6 +76,9 @@ def results_section():
     analysis = data.get('analysis', {})
     urls_analyzed = data.get('urls_analyzed', [])
 
+    # Fraîcheur des résultats servis depuis le cache
+    _display_cache_freshness(data['full_data'].get('cache_info'))
+
     # Métriques principales
     st.subheader(f"📊 {get_text('main_metrics', st.session_state.language)}")
 
@@ -179,6 +182,19 @@ def results_section():
             )
 
 
+def _display_cache_freshness(cache_info):
+    """Affiche l'indicateur de fraîcheur des résultats servis depuis le cache"""
+    if not cache_info or cache_info.get('status') not in ('fresh', 'stale'):
+        return
+
+    age_minutes = int(cache_info.get('age_seconds', 0) // 60)
+
+    if cache_info['status'] == 'stale':
+        st.warning(f"⏳ {format_text('cache_stale_results', st.session_state.language, minutes=age_minutes)}")
+    else:
+        st.caption(f"📦 {format_text('cache_fresh_results', st.session_state.language, minutes=age_minutes)}")
+
+
 def _display_competitor_analysis(data):
     """Affiche l'analyse détaillée par concurrent avec le code des schemas"""
     urls_analyzed = data.get('urls_analyzed', [])
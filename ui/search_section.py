@@ -2,12 +2,17 @@
 Section de recherche avec mécanisme de retry et diagnostic avancé
 Version corrigée et compatible - Entièrement traduite
 """
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+import pandas as pd
 import streamlit as st
 from translations import get_text, format_text
 from api.valueserp import ValueSERPAPIWithRetry, diagnose_valueserp_issues
 from scrapers.schema_scraper import SchemaScraper
 from analyzers.schema_analyzer import SchemaAnalyzer
-from utils.cache import get_cached_serp_results, set_cached_serp_results
+from utils.cache import get_or_compute_serp_results
+from utils.http_client import CancelToken
+from utils.timing import Timings, bind, span
 from utils.valueserp_locations import get_reliable_locations
 import time
 
@@ -116,6 +121,9 @@ def search_section():
                 value=False
             )
 
+        # Le mode debug n'affiche que des détails propres à cette session: les
+        # niveaux de journalisation sont communs au processus (Config.LOG_LEVEL)
+
         if show_debug:
             debug_params = f"""
 {get_text('search_params', st.session_state.language)} :
@@ -153,16 +161,7 @@ def search_section():
 
         keyword = keyword.strip()
 
-        # Vérifier le cache en premier
-        cached_results = get_cached_serp_results(keyword, location, search_language)
-        if cached_results:
-            st.success(f"📦 {get_text('no_api_needed', st.session_state.language)}")
-            st.session_state.serp_results = cached_results
-            st.session_state.schema_analysis = cached_results.get('analysis')
-            st.rerun()
-            return
-
-        # Effectuer la recherche avec retry
+        # Effectuer la recherche avec retry (le cache est consulté en premier)
         perform_search_with_retry(keyword, location, location_display, search_language, max_retries, show_debug)
 
 
@@ -181,90 +180,52 @@ def perform_search_with_retry(keyword, location, location_display, search_langua
         status_text = st.empty()
 
     try:
-        # Initialiser l'API avec retry
-        api = ValueSERPAPIWithRetry(st.session_state.api_key)
-        api.max_retries = max_retries - 1  # -1 car on compte la première tentative
+        # Une analyse identique déjà en cours (autre session ou rerun) est
+        # attendue au lieu d'être relancée: un seul appel ValueSERP et un seul crawl
+        api_key = st.session_state.api_key
+        ui_language = st.session_state.language
 
-        # Étape 1: Recherche SERP avec retry
-        status_text.text(f"📡 {get_text('searching_google_results', st.session_state.language)}")
-        progress_bar.progress(20)
+        def update_progress(percent, text):
+            progress_bar.progress(percent)
+            status_text.text(text)
 
-        search_result = api.search_google_with_retry(
+        final_results = get_or_compute_serp_results(
             keyword,
-            location=location,
-            language=search_language
+            location,
+            search_language,
+            lambda: _compute_serp_analysis(
+                api_key, keyword, location, location_display, search_language,
+                max_retries, ui_language, update_progress
+            ),
+            should_cache=lambda result: 'search_result' not in result,
+            # Actualisation en arrière-plan (stale-while-revalidate): aucun widget
+            refresh=lambda: _compute_serp_analysis(
+                api_key, keyword, location, location_display, search_language,
+                max_retries, ui_language
+            )
         )
 
-        if not search_result:
-            st.error(f"❌ {get_text('no_api_response', st.session_state.language)}")
+        # Échec de la recherche: afficher l'erreur sans mettre en cache
+        if 'search_result' in final_results:
+            _display_search_error(final_results['search_result'])
             return
 
-        # Vérifier s'il y a une erreur
-        if 'error' in search_result:
-            status_code = search_result.get('status_code', 'N/A')
-            error_msg = search_result['error']
-
-            st.error(f"❌ {get_text('api_error', st.session_state.language)} {status_code}: {error_msg}")
-
-            # Afficher les suggestions si disponibles
-            if 'suggestions' in search_result:
-                st.info(f"💡 {get_text('suggested_solutions', st.session_state.language)}")
-                for suggestion in search_result['suggestions']:
-                    st.write(f"• {suggestion}")
-
-            # Suggestions spécifiques selon l'erreur
-            if status_code == 503:
-                st.warning(f"⚠️ {get_text('service_overloaded', st.session_state.language)}")
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button(f"🔄 {get_text('retry_now', st.session_state.language)}"):
-                        st.rerun()
-                with col2:
-                    if st.button(f"📊 {get_text('check_valueserp_status', st.session_state.language)}"):
-                        st.link_button(f"🌐 {get_text('valueserp_status_page', st.session_state.language)}",
-                                       "https://valueserp.statuspage.io/")
-
-            return
-
-        # Vérifier les résultats organiques
-        results = search_result.get('organic_results', [])
-        if not results:
-            st.warning(f"⚠️ {get_text('no_organic_results', st.session_state.language)}")
+        # Résultats servis depuis le cache (frais ou périmés en cours d'actualisation)
+        if final_results['cache_info']['status'] in ('fresh', 'stale'):
+            status_container.empty()
+            progress_container.empty()
+            st.success(f"📦 {get_text('no_api_needed', st.session_state.language)}")
+            st.session_state.serp_results = final_results
+            st.session_state.schema_analysis = final_results.get('analysis')
+            st.rerun()
             return
 
-        progress_bar.progress(40)
-        status_text.text(format_text('results_retrieved_analyzing', st.session_state.language, count=len(results)))
-
-        # Étape 2: Analyse des schemas
-        schema_scraper = SchemaScraper()
-        scraper_results = schema_scraper.analyze_serp_results(results)
-
-        progress_bar.progress(70)
-        status_text.text(f"📊 {get_text('processing_analyzing_data', st.session_state.language)}")
-
-        # Étape 3: Analyse des données
-        analyzer = SchemaAnalyzer()
-        analysis = analyzer.analyze_serp_schemas(scraper_results)
-
-        progress_bar.progress(90)
-        status_text.text(f"✅ {get_text('finalizing', st.session_state.language)}")
-
-        # Combiner les résultats
-        final_results = {
-            **scraper_results,
-            'analysis': analysis,
-            'search_params': {
-                'keyword': keyword,
-                'location': location,
-                'location_display': location_display,
-                'language': search_language
-            }
-        }
+        analysis = final_results['analysis']
+        scraper_results = final_results
 
         # Sauvegarder
         st.session_state.serp_results = final_results
         st.session_state.schema_analysis = analysis
-        set_cached_serp_results(keyword, location, search_language, final_results)
 
         progress_bar.progress(100)
 
@@ -289,6 +250,9 @@ def perform_search_with_retry(keyword, location, location_display, search_langua
 
         st.info(f"👉 {get_text('check_results_tab', st.session_state.language)}")
 
+        if show_debug and final_results.get('timings'):
+            _display_timings(final_results['timings'])
+
         # Masquer l'alerte de statut après succès
         st.session_state.show_valueserp_status = False
 
@@ -298,6 +262,176 @@ def perform_search_with_retry(keyword, location, location_display, search_langua
             st.exception(e)
 
 
+# Avancement de la barre à la fin de la recherche SERP et de l'analyse des pages:
+# entre les deux, la barre suit le nombre de pages terminées
+SERP_PROGRESS = 10
+ANALYSIS_PROGRESS = 95
+
+# Intervalle de rafraîchissement de l'interface pendant la recherche ValueSERP
+SEARCH_POLL_INTERVAL = 0.25
+
+
+def _search_interruptible(api, keyword, location, search_language, heartbeat):
+    """
+    Recherche ValueSERP (retries compris) hors du thread du script
+
+    Le thread du script ne fait qu'attendre le résultat par intervalles et
+    appelle heartbeat entre deux: chaque appel st.* laisse Streamlit
+    interrompre le script (bouton Stop, nouvelle interaction). La recherche
+    est alors annulée, attentes entre retries comprises.
+
+    Args:
+        api: Client ValueSERPAPIWithRetry
+        heartbeat: Fonction sans argument appelée à chaque intervalle
+
+    Returns:
+        Résultat de search_google_with_retry
+    """
+    cancel_token = CancelToken()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='serp-search')
+    future = executor.submit(bind(api.search_google_with_retry), keyword,
+                             location=location, language=search_language, cancel_token=cancel_token)
+    executor.shutdown(wait=False)
+    try:
+        while True:
+            try:
+                return future.result(timeout=SEARCH_POLL_INTERVAL)
+            except FuturesTimeoutError:
+                heartbeat()
+    except BaseException:
+        # RerunException/StopException de Streamlit ou erreur de l'interface
+        cancel_token.cancel()
+        raise
+
+
+def _compute_serp_analysis(api_key, keyword, location, location_display, search_language, max_retries,
+                           ui_language, progress=None):
+    """
+    Recherche ValueSERP puis analyse des schemas du top 10
+
+    N'accède ni aux widgets ni à st.session_state: peut s'exécuter dans un
+    thread d'arrière-plan lors d'une actualisation du cache.
+
+    Args:
+        progress: Callback optionnel progress(pourcentage, texte)
+
+    Returns:
+        Résultats combinés, ou {'search_result': ...} si la recherche a échoué
+    """
+    progress = progress or (lambda percent, text: None)
+
+    # Initialiser l'API avec retry
+    api = ValueSERPAPIWithRetry(api_key)
+    api.max_retries = max_retries - 1  # -1 car on compte la première tentative
+
+    # Durées réelles de chaque étape et de chaque URL, jointes au résultat
+    timings = Timings()
+    with timings.activate():
+        # Étape 1: Recherche SERP avec retry
+        searching_text = f"📡 {get_text('searching_google_results', ui_language)}"
+        progress(0, searching_text)
+
+        with span('serp.search'):
+            search_result = _search_interruptible(api, keyword, location, search_language,
+                                                  lambda: progress(0, searching_text))
+
+        if not search_result or 'error' in search_result:
+            return {'search_result': search_result}
+
+        # Vérifier les résultats organiques
+        results = search_result.get('organic_results', [])
+        if not results:
+            return {'search_result': search_result}
+
+        progress(SERP_PROGRESS, format_text('results_retrieved_analyzing', ui_language, count=len(results)))
+
+        # Étape 2: Analyse des schemas, la barre avance à chaque page terminée
+        def url_progress(done, total):
+            percent = SERP_PROGRESS + (ANALYSIS_PROGRESS - SERP_PROGRESS) * done // total
+            progress(percent, format_text('analyzing_pages_progress', ui_language, done=done, total=total))
+
+        schema_scraper = SchemaScraper()
+        scraper_results = schema_scraper.analyze_serp_results(results, progress=url_progress)
+
+        progress(ANALYSIS_PROGRESS, f"📊 {get_text('processing_analyzing_data', ui_language)}")
+
+        # Étape 3: Analyse des données
+        analyzer = SchemaAnalyzer()
+        with span('aggregation.analyze'):
+            analysis = analyzer.analyze_serp_schemas(scraper_results)
+
+    # Combiner les résultats
+    return {
+        **scraper_results,
+        'analysis': analysis,
+        'timings': timings.to_dict(),
+        'search_params': {
+            'keyword': keyword,
+            'location': location,
+            'location_display': location_display,
+            'language': search_language
+        }
+    }
+
+
+def _display_timings(timings):
+    """Affiche les durées par étape et les pages les plus lentes (mode debug)"""
+    language = st.session_state.language
+    with st.expander(f"⏱️ {get_text('stage_timings', language)} ({timings['total_ms'] / 1000:.1f}s)"):
+        st.dataframe(pd.DataFrame([
+            {
+                get_text('stage', language): stage,
+                get_text('calls', language): totals['count'],
+                get_text('wall_time_ms', language): totals['wall_ms'],
+                get_text('cpu_time_ms', language): totals['cpu_ms'],
+                get_text('max_time_ms', language): totals['max_ms']
+            }
+            for stage, totals in timings['stages'].items()
+        ]), use_container_width=True, hide_index=True)
+
+        # Pages triées de la plus lente à la plus rapide, une colonne par étape
+        urls = sorted(timings['urls'].items(), key=lambda item: item[1]['total'], reverse=True)
+        if urls:
+            st.write(f"**{get_text('slowest_pages', language)}**")
+            st.dataframe(pd.DataFrame([{'URL': url, **stages} for url, stages in urls]),
+                         use_container_width=True, hide_index=True)
+
+
+def _display_search_error(search_result):
+    """Affiche l'erreur d'une recherche ValueSERP échouée"""
+    if not search_result:
+        st.error(f"❌ {get_text('no_api_response', st.session_state.language)}")
+        return
+
+    # Vérifier s'il y a une erreur
+    if 'error' not in search_result:
+        st.warning(f"⚠️ {get_text('no_organic_results', st.session_state.language)}")
+        return
+
+    status_code = search_result.get('status_code', 'N/A')
+    error_msg = search_result['error']
+
+    st.error(f"❌ {get_text('api_error', st.session_state.language)} {status_code}: {error_msg}")
+
+    # Afficher les suggestions si disponibles
+    if 'suggestions' in search_result:
+        st.info(f"💡 {get_text('suggested_solutions', st.session_state.language)}")
+        for suggestion in search_result['suggestions']:
+            st.write(f"• {suggestion}")
+
+    # Suggestions spécifiques selon l'erreur
+    if status_code == 503:
+        st.warning(f"⚠️ {get_text('service_overloaded', st.session_state.language)}")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"🔄 {get_text('retry_now', st.session_state.language)}"):
+                st.rerun()
+        with col2:
+            if st.button(f"📊 {get_text('check_valueserp_status', st.session_state.language)}"):
+                st.link_button(f"🌐 {get_text('valueserp_status_page', st.session_state.language)}",
+                               "https://valueserp.statuspage.io/")
+
+
 def run_diagnostic():
     """Lance un diagnostic complet de ValueSERP"""
     if not st.session_state.api_key:
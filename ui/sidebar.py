@@ -65,14 +65,14 @@ def render_sidebar():
                 cache_manager.clear()
                 st.success(get_text('cache_cleared', st.session_state.language))
 
-            stats = cache_manager.get_stats()
-            st.write(f"{get_text('valid_entries', st.session_state.language)}: {stats['valid_entries']}")
-            st.write(f"{get_text('expired_entries', st.session_state.language)}: {stats['expired_entries']}")
+            # Instantané des compteurs: aucun parcours du cache à chaque rerun
+            stats = cache_manager.snapshot()
+            st.write(f"{get_text('cache_entries', st.session_state.language)}: {stats['entries']}")
+            st.write(f"{get_text('cache_hit_ratio', st.session_state.language)}: "
+                     f"{stats['hit_ratio']:.0%} ({stats['hits']}/{stats['hits'] + stats['misses']})")
+            st.write(f"{get_text('cache_evictions', st.session_state.language)}: "
+                     f"{stats['evictions']} / {stats['expirations']}")
+            st.write(f"{get_text('cache_size', st.session_state.language)}: {stats['bytes'] / (1024 * 1024):.1f} MB")
 
-            # Affichage d'informations supplémentaires si disponibles
-            if 'total_entries' in stats:
-                st.write(f"{get_text('total_entries', st.session_state.language)}: {stats['total_entries']}")
-
-            if 'cache_enabled' in stats:
-                cache_status = "✅" if stats['cache_enabled'] else "❌"
-                st.write(f"{get_text('cache_enabled', st.session_state.language)}: {cache_status}")
\ No newline at end of file
+            cache_status = "✅" if Config.CACHE_ENABLED else "❌"
+            st.write(f"{get_text('cache_enabled', st.session_state.language)}: {cache_status}")
@@ -20,12 +20,69 @@ from .helpers import (
 
 from .cache import (
     CacheManager,
+    CacheKeyError,
+    make_cache_key,
     cache_manager,
     cached,
     get_cached_serp_results,
     set_cached_serp_results,
     get_cached_schema_analysis,
-    set_cached_schema_analysis
+    set_cached_schema_analysis,
+    get_or_compute_serp_results,
+    get_or_compute_schema_analysis
+)
+
+from .cache_backends import (
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    create_cache_backend
+)
+
+from .http_client import (
+    HttpClient,
+    CancelToken,
+    RequestCancelled,
+    get_http_client,
+    parse_retry_after
+)
+
+from .http_fixtures import (
+    FailureProfile,
+    FixtureNotFound,
+    RecordingTransport,
+    ReplayTransport,
+    fixture_key,
+    get_fixture_transport
+)
+
+from .page_store import (
+    PageStore,
+    get_page_store,
+    page_key,
+    reuse_stats
+)
+
+from .metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    registry,
+    start_metrics_server
+)
+
+from .timing import (
+    Timings,
+    bind,
+    current_timings,
+    fetching,
+    fetching_url,
+    span
+)
+
+from .logging_config import (
+    StructuredFormatter,
+    configure_logging,
+    set_debug_logging
 )
 
 __all__ = [
@@ -46,10 +103,52 @@ __all__ = [
     'get_schema_icon',
     # Cache
     'CacheManager',
+    'CacheKeyError',
+    'make_cache_key',
     'cache_manager',
     'cached',
     'get_cached_serp_results',
     'set_cached_serp_results',
     'get_cached_schema_analysis',
-    'set_cached_schema_analysis'
+    'set_cached_schema_analysis',
+    'get_or_compute_serp_results',
+    'get_or_compute_schema_analysis',
+    'MemoryCacheBackend',
+    'SQLiteCacheBackend',
+    'create_cache_backend',
+    # HTTP
+    'HttpClient',
+    'CancelToken',
+    'RequestCancelled',
+    'get_http_client',
+    'parse_retry_after',
+    # Enregistrement/rejeu HTTP
+    'FailureProfile',
+    'FixtureNotFound',
+    'RecordingTransport',
+    'ReplayTransport',
+    'fixture_key',
+    'get_fixture_transport',
+    # Magasin de pages
+    'PageStore',
+    'get_page_store',
+    'page_key',
+    'reuse_stats',
+    # Métriques
+    'Counter',
+    'Histogram',
+    'MetricsRegistry',
+    'registry',
+    'start_metrics_server',
+    # Durées par étape
+    'Timings',
+    'bind',
+    'current_timings',
+    'fetching',
+    'fetching_url',
+    'span',
+    # Journalisation
+    'StructuredFormatter',
+    'configure_logging',
+    'set_debug_logging'
 ]
\ No newline at end of file
@@ -2,21 +2,123 @@
 Module de gestion du cache pour optimiser les performances
 """
 import json
+import logging
+import threading
 import time
 import hashlib
-from typing import Any, Optional, Dict
-from functools import wraps
+from typing import Any, Callable, Optional, Dict, Hashable, Tuple
+from functools import partial, wraps
 from config import Config
+from utils.cache_backends import create_cache_backend
+from utils.metrics import registry
 
+logger = logging.getLogger(__name__)
+
+# Métriques (utils/metrics.py): hits, misses, sets, expirations, coalesced, stale_hits, revalidations
+_cache_events = registry.counter('cache_events_total', "Événements des caches par type", ('cache', 'event'))
+
+# Types acceptés tels quels dans une clé structurelle (type exact: bool et float
+# passent par la sérialisation pour ne pas confondre True/1 ou 1/1.0)
+_SIMPLE_KEY_TYPES = (str, int, type(None))
+
+# Au-delà de cette longueur, une chaîne est hachée plutôt que stockée
+_MAX_PLAIN_KEY_LENGTH = 256
+
+
+class CacheKeyError(TypeError):
+    """Levée lorsqu'une clé de cache ne peut pas être sérialisée"""
+
+
+def _is_simple_key(key_data: Any) -> bool:
+    """Vérifie si une clé peut être utilisée directement (tuple de scalaires courts)"""
+    if type(key_data) is tuple:
+        return all(
+            type(item) in _SIMPLE_KEY_TYPES and
+            (type(item) is not str or len(item) <= _MAX_PLAIN_KEY_LENGTH)
+            for item in key_data
+        )
+    return type(key_data) in _SIMPLE_KEY_TYPES and (
+        type(key_data) is not str or len(key_data) <= _MAX_PLAIN_KEY_LENGTH
+    )
+
+
+def make_cache_key(key_data: Any) -> Hashable:
+    """
+    Génère une clé de cache
+
+    Les clés simples (chaîne, entier, None ou tuple de ceux-ci) sont
+    utilisées telles quelles; les structures sont sérialisées en JSON
+    canonique puis hachées avec BLAKE2b.
+
+    Args:
+        key_data: Données pour générer la clé
+
+    Returns:
+        Clé de cache hashable
+
+    Raises:
+        CacheKeyError: si les données ne sont pas sérialisables en JSON
+    """
+    if _is_simple_key(key_data):
+        return key_data
+
+    if isinstance(key_data, str):
+        key_str = key_data
+    else:
+        try:
+            key_str = json.dumps(key_data, sort_keys=True)
+        except (TypeError, ValueError) as e:
+            raise CacheKeyError(
+                f"Clé de cache non sérialisable ({type(key_data).__name__}): {e}"
+            ) from e
+
+    return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
 
-class CacheManager:
-    """Gestionnaire de cache simple en mémoire"""
+
+class _InFlightCall:
+    """Calcul en cours partagé par les appelants d'une même clé"""
 
     def __init__(self):
-        self.cache = {}
-        self.timestamps = {}
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.timestamp: Optional[float] = None
+        # Meneur interrompu hors erreur (ex. rerun Streamlit): pas de résultat à partager
+        self.abandoned = False
+        # Résultat accepté par should_cache (conservé si le cache est actif)
+        self.cacheable = False
+
+
+class CacheManager:
+    """Gestionnaire de cache avec backend de stockage interchangeable"""
 
-    def _get_cache_key(self, key_data: Any) -> str:
+    def __init__(self, backend=None, name: str = 'app'):
+        """
+        Args:
+            backend: Backend de stockage (défaut: selon Config.CACHE_BACKEND)
+            name: Nom du cache dans les métriques (label cache)
+        """
+        self.backend = backend or create_cache_backend()
+        self.name = name
+
+        # Compteurs incrémentaux (aucun parcours du cache pour les statistiques)
+        self._counters = {
+            'hits': 0, 'misses': 0, 'sets': 0, 'expirations': 0,
+            'coalesced': 0, 'stale_hits': 0, 'revalidations': 0
+        }
+        self._counters_lock = threading.Lock()
+
+        # Calculs en cours par clé (single-flight)
+        self._inflight: Dict[Hashable, _InFlightCall] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _count(self, counter: str):
+        """Incrémente un compteur de statistiques"""
+        with self._counters_lock:
+            self._counters[counter] += 1
+        _cache_events.inc(cache=self.name, event=counter)
+
+    def _get_cache_key(self, key_data: Any) -> Hashable:
         """
         Génère une clé de cache unique
 
@@ -26,12 +128,7 @@ class CacheManager:
         Returns:
             Clé de cache
         """
-        if isinstance(key_data, (dict, list)):
-            key_str = json.dumps(key_data, sort_keys=True)
-        else:
-            key_str = str(key_data)
-
-        return hashlib.md5(key_str.encode()).hexdigest()
+        return make_cache_key(key_data)
 
     def get(self, key: Any) -> Optional[Any]:
         """
@@ -48,16 +145,19 @@ class CacheManager:
 
         cache_key = self._get_cache_key(key)
 
-        if cache_key in self.cache:
+        entry = self.backend.get(cache_key)
+        if entry is not None:
             # Vérifier l'expiration
-            timestamp = self.timestamps.get(cache_key, 0)
+            value, timestamp = entry
             if time.time() - timestamp < Config.CACHE_DURATION:
-                return self.cache[cache_key]
+                self._count('hits')
+                return value
             else:
                 # Supprimer l'entrée expirée
-                del self.cache[cache_key]
-                del self.timestamps[cache_key]
+                self.backend.delete(cache_key)
+                self._count('expirations')
 
+        self._count('misses')
         return None
 
     def set(self, key: Any, value: Any):
@@ -72,13 +172,219 @@ class CacheManager:
             return
 
         cache_key = self._get_cache_key(key)
-        self.cache[cache_key] = value
-        self.timestamps[cache_key] = time.time()
+        self.backend.set(cache_key, value, time.time())
+        self._count('sets')
+
+    def get_or_compute(self,
+                       key: Any,
+                       compute: Callable[[], Any],
+                       should_cache: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Retourne la valeur en cache ou la calcule une seule fois
+
+        Les appels concurrents sur une même clé attendent le calcul lancé par
+        le premier appelant au lieu de le dupliquer (single-flight); ils
+        reçoivent son résultat ou son exception. Si le meneur est interrompu
+        par une exception de contrôle (BaseException hors Exception, comme
+        le rerun d'une session Streamlit), un appelant en attente reprend le
+        calcul.
+
+        Args:
+            key: Clé de cache
+            compute: Fonction sans argument qui produit la valeur
+            should_cache: Prédicat indiquant si le résultat doit être stocké
+                (défaut: tout résultat non None)
+
+        Returns:
+            Valeur en cache ou calculée
+        """
+        return self.lookup_or_compute(key, compute, should_cache)[0]
+
+    def lookup_or_compute(self,
+                          key: Any,
+                          compute: Callable[[], Any],
+                          should_cache: Optional[Callable[[Any], bool]] = None,
+                          stale_while_revalidate: bool = False,
+                          max_age: Optional[float] = None,
+                          refresh: Optional[Callable[[], Any]] = None,
+                          revalidate: Optional[Callable[[Any], Any]] = None,
+                          share_uncached: bool = True) -> Tuple[Any, Dict]:
+        """
+        Comme get_or_compute(), avec stale-while-revalidate et indicateur de fraîcheur
+
+        En mode stale-while-revalidate, une entrée plus ancienne que
+        Config.CACHE_DURATION mais plus jeune que max_age est retournée
+        immédiatement et recalculée en arrière-plan (une seule fois).
+        Avec revalidate, une entrée expirée plus jeune que max_age est passée
+        à cette fonction à la place de compute (requête conditionnelle); elle
+        reste en cache si la revalidation échoue ou n'est pas conservable.
+
+        Args:
+            key: Clé de cache
+            compute: Fonction sans argument qui produit la valeur
+            should_cache: Prédicat indiquant si le résultat doit être stocké
+            stale_while_revalidate: Servir les entrées périmées pendant l'actualisation
+            max_age: Âge maximum d'une entrée périmée (défaut: Config.CACHE_MAX_STALE_AGE)
+            refresh: Fonction utilisée pour l'actualisation en arrière-plan
+                (défaut: compute); elle ne doit pas dépendre du thread appelant
+            revalidate: Fonction recevant la valeur expirée et produisant la
+                nouvelle valeur (ex. GET conditionnel avec ETag)
+            share_uncached: Transmettre aux appelants en attente un résultat
+                refusé par should_cache ou une exception du meneur; à False,
+                ils relancent leur propre calcul (ex. téléchargement annulé
+                par le jeton du meneur)
+
+        Returns:
+            Tuple (valeur, infos) où infos contient 'status' ('fresh', 'stale',
+            'computed' ou 'coalesced'), 'cached_at', 'age_seconds' et 'revalidating'
+        """
+        cache_key = self._get_cache_key(key)
+        max_age = Config.CACHE_MAX_STALE_AGE if max_age is None else max_age
+
+        if Config.CACHE_ENABLED:
+            entry = self.backend.get(cache_key)
+            if entry is not None:
+                value, timestamp = entry
+                age = time.time() - timestamp
+
+                if age < Config.CACHE_DURATION:
+                    self._count('hits')
+                    return value, self._cache_info('fresh', timestamp)
+
+                if stale_while_revalidate and age < max_age:
+                    self._count('hits')
+                    self._count('stale_hits')
+                    revalidating = self._start_revalidation(cache_key, refresh or compute, should_cache)
+                    return value, self._cache_info('stale', timestamp, revalidating)
+
+                if revalidate is not None and age < max_age:
+                    # L'entrée et ses validateurs restent en place jusqu'à ce
+                    # qu'une revalidation réussie la remplace (set)
+                    compute = partial(revalidate, value)
+                else:
+                    # Supprimer l'entrée expirée
+                    self.backend.delete(cache_key)
+                    self._count('expirations')
+
+            self._count('misses')
+
+        call, is_leader = self._join_inflight(cache_key)
+
+        if not is_leader:
+            call.event.wait()
+            if call.abandoned or (not share_uncached and not call.cacheable):
+                # L'exception du meneur appartient à sa session, ou son échec
+                # lui est propre: reprendre le calcul
+                return self.lookup_or_compute(key, compute, should_cache, stale_while_revalidate,
+                                              max_age, refresh, revalidate, share_uncached)
+            self._count('coalesced')
+            if call.error is not None:
+                raise call.error
+            return call.result, self._cache_info('coalesced', call.timestamp)
+
+        if Config.CACHE_ENABLED:
+            # Le meneur précédent a pu stocker la valeur et quitter _inflight
+            # entre la lecture ci-dessus et _join_inflight
+            entry = self.backend.get(cache_key)
+            if entry is not None and time.time() - entry[1] < Config.CACHE_DURATION:
+                call.result, call.timestamp = entry
+                call.cacheable = True
+                self._release_inflight(cache_key, call)
+                # Résultat du meneur précédent (le miss est déjà compté)
+                self._count('coalesced')
+                return entry[0], self._cache_info('coalesced', entry[1])
+
+        result = self._run_inflight(cache_key, call, compute, should_cache)
+        return result, self._cache_info('computed', call.timestamp)
+
+    @staticmethod
+    def _cache_info(status: str, timestamp: Optional[float], revalidating: bool = False) -> Dict:
+        """Construit l'indicateur de fraîcheur d'une valeur"""
+        return {
+            'status': status,
+            'cached_at': timestamp,
+            'age_seconds': round(time.time() - timestamp, 1) if timestamp else 0.0,
+            'revalidating': revalidating
+        }
+
+    def _join_inflight(self, cache_key: Hashable) -> Tuple[_InFlightCall, bool]:
+        """Rejoint le calcul en cours pour la clé, ou l'enregistre comme meneur"""
+        with self._inflight_lock:
+            call = self._inflight.get(cache_key)
+            if call is not None:
+                return call, False
+            call = _InFlightCall()
+            self._inflight[cache_key] = call
+            return call, True
+
+    def _run_inflight(self,
+                      cache_key: Hashable,
+                      call: _InFlightCall,
+                      compute: Callable[[], Any],
+                      should_cache: Optional[Callable[[Any], bool]]) -> Any:
+        """Exécute le calcul meneur et publie son résultat aux appelants en attente"""
+        try:
+            result = compute()
+            call.timestamp = time.time()
+            call.cacheable = result is not None and (should_cache is None or should_cache(result))
+            if call.cacheable:
+                self.set(cache_key, result)
+            call.result = result
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # Contrôle d'exécution propre à l'appelant (RerunException,
+            # StopException, KeyboardInterrupt): jamais relancé chez les autres
+            call.abandoned = True
+            raise
+        finally:
+            self._release_inflight(cache_key, call)
+
+    def _release_inflight(self, cache_key: Hashable, call: _InFlightCall):
+        """Retire le calcul de _inflight et réveille les appelants en attente"""
+        with self._inflight_lock:
+            del self._inflight[cache_key]
+        call.event.set()
+
+    def _start_revalidation(self,
+                            cache_key: Hashable,
+                            refresh: Callable[[], Any],
+                            should_cache: Optional[Callable[[Any], bool]]) -> bool:
+        """
+        Lance l'actualisation d'une entrée périmée dans un thread d'arrière-plan
+
+        Returns:
+            True si une actualisation est en cours (lancée ici ou déjà active)
+        """
+        call, is_leader = self._join_inflight(cache_key)
+        if not is_leader:
+            return True
+
+        def revalidate():
+            try:
+                self._run_inflight(cache_key, call, refresh, should_cache)
+                self._count('revalidations')
+            except Exception as e:
+                # L'entrée périmée reste servie jusqu'à max_age
+                logger.warning("Échec de l'actualisation en arrière-plan du cache: %s", e)
+
+        threading.Thread(target=revalidate, name='cache-revalidate', daemon=True).start()
+        return True
 
     def clear(self):
         """Vide complètement le cache"""
-        self.cache.clear()
-        self.timestamps.clear()
+        self.backend.clear()
+
+    def purge_expired(self) -> int:
+        """
+        Supprime toutes les entrées expirées du backend
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        return self.backend.purge_expired(Config.CACHE_DURATION)
 
     def remove(self, key: Any):
         """
@@ -88,32 +394,61 @@ class CacheManager:
             key: Clé à supprimer
         """
         cache_key = self._get_cache_key(key)
-        if cache_key in self.cache:
-            del self.cache[cache_key]
-            del self.timestamps[cache_key]
+        self.backend.delete(cache_key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Instantané des compteurs du cache, sans parcourir les entrées
+
+        Returns:
+            Dictionnaire avec hits, misses, sets, coalesced (appels ayant
+            attendu un calcul en cours), stale_hits et revalidations
+            (stale-while-revalidate), evictions, expirations,
+            entries (entrées vivantes), bytes (taille approximative) et hit_ratio
+        """
+        with self._counters_lock:
+            counters = dict(self._counters)
+
+        backend_counters = self.backend.get_counters()
+        lookups = counters['hits'] + counters['misses']
+
+        return {
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+            'sets': counters['sets'],
+            'coalesced': counters['coalesced'],
+            'stale_hits': counters['stale_hits'],
+            'revalidations': counters['revalidations'],
+            'evictions': backend_counters['evictions'],
+            'expirations': counters['expirations'] + backend_counters['expirations'],
+            'entries': backend_counters['entries'],
+            'bytes': backend_counters['bytes'],
+            'hit_ratio': round(counters['hits'] / lookups, 3) if lookups else 0.0
+        }
 
     def get_stats(self) -> Dict:
         """
         Retourne des statistiques sur le cache
 
+        Contrairement à snapshot(), compte les entrées expirées encore
+        conservées (servables en stale-while-revalidate ou à revalider), ce
+        qui parcourt les timestamps du backend.
+
         Returns:
-            Statistiques du cache
+            Statistiques du cache: valid_entries (moins de
+            Config.CACHE_DURATION) et expired_entries (plus anciennes, encore
+            conservées) en plus des compteurs de snapshot()
         """
-        current_time = time.time()
-        valid_entries = 0
-        expired_entries = 0
-
-        for cache_key, timestamp in self.timestamps.items():
-            if current_time - timestamp < Config.CACHE_DURATION:
-                valid_entries += 1
-            else:
-                expired_entries += 1
+        snapshot = self.snapshot()
+        expired_entries = self.backend.count_expired(Config.CACHE_DURATION)
 
         return {
-            'total_entries': len(self.cache),
-            'valid_entries': valid_entries,
+            'total_entries': snapshot['entries'],
+            'valid_entries': max(0, snapshot['entries'] - expired_entries),
             'expired_entries': expired_entries,
-            'cache_enabled': Config.CACHE_ENABLED
+            'cache_enabled': Config.CACHE_ENABLED,
+            'backend': type(self.backend).__name__,
+            **snapshot
         }
 
 
@@ -135,12 +470,18 @@ def cached(cache_key_prefix: str = ""):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Construire la clé de cache
-            cache_key = {
-                'prefix': cache_key_prefix or func.__name__,
-                'args': args,
-                'kwargs': kwargs
-            }
+            # Construire la clé de cache (tuple direct si les arguments sont simples)
+            prefix = cache_key_prefix or func.__name__
+            if not kwargs and _is_simple_key(args):
+                cache_key = (prefix,) + args
+            else:
+                cache_key = {
+                    'prefix': prefix,
+                    'args': args,
+                    'kwargs': kwargs
+                }
+            # Échouer avant l'appel si les arguments ne sont pas sérialisables
+            cache_key = make_cache_key(cache_key)
 
             # Vérifier le cache
             cached_result = cache_manager.get(cache_key)
@@ -161,6 +502,16 @@ def cached(cache_key_prefix: str = ""):
 
 
 # Fonctions utilitaires pour le cache Streamlit
+def _serp_cache_key(keyword: str, location: str, language: str) -> tuple:
+    """Clé précalculée des résultats SERP"""
+    return 'serp_results', keyword, location, language
+
+
+def _schema_analysis_cache_key(url: str) -> Hashable:
+    """Clé précalculée d'une analyse de page"""
+    return make_cache_key(('schema_analysis', url))
+
+
 def get_cached_serp_results(keyword: str, location: str, language: str) -> Optional[Dict]:
     """
     Récupère les résultats SERP du cache
@@ -173,14 +524,7 @@ def get_cached_serp_results(keyword: str, location: str, language: str) -> Optio
     Returns:
         Résultats en cache ou None
     """
-    cache_key = {
-        'type': 'serp_results',
-        'keyword': keyword,
-        'location': location,
-        'language': language
-    }
-
-    return cache_manager.get(cache_key)
+    return cache_manager.get(_serp_cache_key(keyword, location, language))
 
 
 def set_cached_serp_results(keyword: str, location: str, language: str, results: Dict):
@@ -193,14 +537,7 @@ def set_cached_serp_results(keyword: str, location: str, language: str, results:
         language: Langue
         results: Résultats à stocker
     """
-    cache_key = {
-        'type': 'serp_results',
-        'keyword': keyword,
-        'location': location,
-        'language': language
-    }
-
-    cache_manager.set(cache_key, results)
+    cache_manager.set(_serp_cache_key(keyword, location, language), results)
 
 
 def get_cached_schema_analysis(url: str) -> Optional[Dict]:
@@ -213,12 +550,7 @@ def get_cached_schema_analysis(url: str) -> Optional[Dict]:
     Returns:
         Analyse en cache ou None
     """
-    cache_key = {
-        'type': 'schema_analysis',
-        'url': url
-    }
-
-    return cache_manager.get(cache_key)
+    return cache_manager.get(_schema_analysis_cache_key(url))
 
 
 def set_cached_schema_analysis(url: str, analysis: Dict):
@@ -229,9 +561,65 @@ def set_cached_schema_analysis(url: str, analysis: Dict):
         url: URL analysée
         analysis: Analyse à stocker
     """
-    cache_key = {
-        'type': 'schema_analysis',
-        'url': url
-    }
+    cache_manager.set(_schema_analysis_cache_key(url), analysis)
+
+
+def get_or_compute_serp_results(keyword: str,
+                                 location: str,
+                                 language: str,
+                                 compute: Callable[[], Dict],
+                                 should_cache: Optional[Callable[[Dict], bool]] = None,
+                                 refresh: Optional[Callable[[], Dict]] = None) -> Dict:
+    """
+    Récupère les résultats SERP du cache ou les calcule une seule fois
+    pour tous les appelants concurrents
+
+    Si Config.SERP_STALE_WHILE_REVALIDATE est actif, des résultats périmés
+    (moins de Config.CACHE_MAX_STALE_AGE) sont retournés immédiatement et
+    actualisés en arrière-plan avec `refresh`. Seuls les résultats
+    conservables sont partagés entre appelants concurrents: un échec de
+    recherche est propre à la clé API de l'appelant.
+
+    Args:
+        keyword: Mot-clé recherché
+        location: Localisation
+        language: Langue
+        compute: Fonction produisant les résultats (appel ValueSERP + analyse)
+        should_cache: Prédicat indiquant si le résultat doit être stocké
+        refresh: Fonction d'actualisation en arrière-plan, sans dépendance à
+            l'interface (défaut: compute)
 
-    cache_manager.set(cache_key, analysis)
\ No newline at end of file
+    Returns:
+        Copie des résultats SERP avec un indicateur de fraîcheur 'cache_info'
+    """
+    results, cache_info = cache_manager.lookup_or_compute(
+        _serp_cache_key(keyword, location, language),
+        compute,
+        should_cache,
+        stale_while_revalidate=Config.SERP_STALE_WHILE_REVALIDATE,
+        refresh=refresh,
+        # La clé n'inclut pas la clé API: une erreur du meneur (clé invalide,
+        # quota épuisé) n'est pas transmise, chaque appelant relance sa recherche
+        share_uncached=False
+    )
+
+    if not isinstance(results, dict):
+        return results
+
+    # Copie superficielle: l'objet en cache n'est pas modifié
+    return {**results, 'cache_info': cache_info}
+
+
+def get_or_compute_schema_analysis(url: str, compute: Callable[[], Dict]) -> Dict:
+    """
+    Récupère l'analyse de schema du cache ou la calcule une seule fois
+    pour tous les appelants concurrents
+
+    Args:
+        url: URL analysée
+        compute: Fonction produisant l'analyse
+
+    Returns:
+        Analyse de la page
+    """
+    return cache_manager.get_or_compute(_schema_analysis_cache_key(url), compute)
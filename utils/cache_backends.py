@@ -0,0 +1,460 @@
+"""
+Backends de stockage pour le gestionnaire de cache
+Mémoire (par défaut) ou SQLite persistant sous Config.CACHE_DIR
+"""
+import heapq
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+# Éléments mesurés par conteneur avant extrapolation (voir estimate_size)
+_SIZE_SAMPLE = 8
+
+# Valeurs sans contenu à parcourir
+_ATOMIC_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estime l'occupation mémoire d'une valeur en octets
+
+    Parcours récursif avec sys.getsizeof; dans chaque dictionnaire ou
+    séquence, seuls les _SIZE_SAMPLE premiers éléments sont mesurés et le
+    résultat est extrapolé à la longueur du conteneur. Le coût reste
+    faible quelle que soit la taille de la valeur (pas de sérialisation),
+    au prix d'une estimation approximative (objets partagés comptés à
+    chaque occurrence).
+
+    Args:
+        value: Valeur à mesurer
+
+    Returns:
+        Taille approximative en octets
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, _ATOMIC_TYPES):
+        return size
+
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    else:
+        return size
+
+    count = len(value)
+    if not count:
+        return size
+
+    measured = 0
+    sampled = 0
+    for item in itertools.islice(items, _SIZE_SAMPLE):
+        if isinstance(value, dict):
+            measured += estimate_size(item[0]) + estimate_size(item[1])
+        else:
+            measured += estimate_size(item)
+        sampled += 1
+    return size + measured * count // sampled
+
+
+class MemoryCacheBackend:
+    """
+    Stockage LRU borné en mémoire du processus (perdu au redémarrage)
+
+    L'ordre LRU est tenu par un OrderedDict et les expirations par un tas
+    de timestamps: éviction et expiration sont en O(1) amorti (O(log n)
+    pour le tas), sans parcours de tout le cache.
+    """
+
+    def __init__(self,
+                 max_entries: int = Config.MAX_CACHE_SIZE,
+                 max_bytes: int = Config.MAX_CACHE_BYTES,
+                 ttl: float = max(Config.CACHE_DURATION, Config.CACHE_MAX_STALE_AGE)):
+        """
+        Args:
+            max_entries: Nombre maximum d'entrées (0 = illimité)
+            max_bytes: Budget approximatif en octets (0 = illimité)
+            ttl: Durée de conservation des entrées en secondes (les entrées
+                plus anciennes que Config.CACHE_DURATION restent servables en
+                stale-while-revalidate jusqu'à cette limite)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.cache: OrderedDict = OrderedDict()
+        self.timestamps: Dict[Hashable, float] = {}
+        self.sizes: Dict[Hashable, int] = {}
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        # (timestamp, séquence, clé): la séquence évite de comparer des clés de types différents
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def get(self, cache_key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Récupère une entrée brute et la marque comme récemment utilisée
+
+        Args:
+            cache_key: Clé de cache
+
+        Returns:
+            Tuple (valeur, timestamp) ou None si absente
+        """
+        with self._lock:
+            if cache_key not in self.cache:
+                return None
+            self.cache.move_to_end(cache_key)
+            return self.cache[cache_key], self.timestamps[cache_key]
+
+    def set(self, cache_key: Hashable, value: Any, timestamp: float):
+        size = estimate_size(value)
+
+        with self._lock:
+            self._remove(cache_key)
+            self.cache[cache_key] = value
+            self.timestamps[cache_key] = timestamp
+            self.sizes[cache_key] = size
+            self.total_bytes += size
+            heapq.heappush(self._expiry_heap, (timestamp, next(self._sequence), cache_key))
+
+            self._expire(time.time() - self.ttl)
+            self._evict()
+            self._compact_heap()
+
+    def delete(self, cache_key: Hashable):
+        with self._lock:
+            self._remove(cache_key)
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.timestamps.clear()
+            self.sizes.clear()
+            self.total_bytes = 0
+            self._expiry_heap.clear()
+
+    def purge_expired(self, max_age: float) -> int:
+        """
+        Supprime les entrées plus anciennes que max_age
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            return self._expire(time.time() - max_age)
+
+    def count_expired(self, max_age: float) -> int:
+        """
+        Compte les entrées plus anciennes que max_age encore conservées
+        (parcours des timestamps)
+
+        Returns:
+            Nombre d'entrées expirées
+        """
+        limit = time.time() - max_age
+        with self._lock:
+            return sum(1 for timestamp in self.timestamps.values() if timestamp <= limit)
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Compteurs maintenus incrémentalement (lecture en O(1))
+
+        Returns:
+            Dictionnaire {'entries', 'bytes', 'evictions', 'expirations'}
+        """
+        with self._lock:
+            return {
+                'entries': len(self.cache),
+                'bytes': self.total_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _remove(self, cache_key: Hashable) -> bool:
+        """Retire une entrée (son éventuelle trace dans le tas est ignorée plus tard)"""
+        if cache_key not in self.cache:
+            return False
+        del self.cache[cache_key]
+        del self.timestamps[cache_key]
+        self.total_bytes -= self.sizes.pop(cache_key, 0)
+        return True
+
+    def _expire(self, limit: float) -> int:
+        """Retire les entrées dont le timestamp est <= limit, par le sommet du tas"""
+        expired = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= limit:
+            timestamp, _, cache_key = heapq.heappop(heap)
+            # Ignorer les traces d'entrées réécrites ou déjà supprimées
+            if self.timestamps.get(cache_key) == timestamp and self._remove(cache_key):
+                expired += 1
+        self.expirations += expired
+        return expired
+
+    def _evict(self):
+        """Évince les entrées les moins récemment utilisées au-delà des limites"""
+        while self.cache and (
+                (self.max_entries and len(self.cache) > self.max_entries) or
+                (self.max_bytes and self.total_bytes > self.max_bytes)):
+            cache_key = next(iter(self.cache))
+            self._remove(cache_key)
+            self.evictions += 1
+
+    def _compact_heap(self):
+        """Reconstruit le tas lorsqu'il contient trop de traces obsolètes"""
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                (timestamp, next(self._sequence), cache_key)
+                for cache_key, timestamp in self.timestamps.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+
+class SQLiteCacheBackend:
+    """
+    Stockage persistant dans une base SQLite
+
+    Le mode WAL permet des lectures concurrentes depuis plusieurs processus
+    pendant qu'un processus écrit; chaque écriture est une transaction
+    atomique. Les valeurs sont sérialisées avec pickle. Les limites de
+    taille sont appliquées par éviction LRU sur la date de dernier accès.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_entries: int = Config.MAX_CACHE_SIZE,
+                 max_bytes: int = Config.MAX_CACHE_BYTES,
+                 ttl: float = max(Config.CACHE_DURATION, Config.CACHE_MAX_STALE_AGE)):
+        self.path = path or os.path.join(Config.CACHE_DIR, 'cache.sqlite3')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Une connexion par thread (sqlite3 ne partage pas les connexions)
+        self._local = threading.local()
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'cache_key TEXT PRIMARY KEY, '
+                'value BLOB NOT NULL, '
+                'timestamp REAL NOT NULL)'
+            )
+
+            # Colonnes LRU ajoutées aux bases créées sans elles
+            columns = {row[1] for row in connection.execute('PRAGMA table_info(cache_entries)')}
+            if 'accessed_at' not in columns:
+                connection.execute('ALTER TABLE cache_entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0')
+            if 'size' not in columns:
+                connection.execute('ALTER TABLE cache_entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cache_entries_timestamp '
+                'ON cache_entries (timestamp)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at '
+                'ON cache_entries (accessed_at)'
+            )
+
+            # Compteurs tenus à jour par triggers: lecture en O(1), cohérente entre processus
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_stats ('
+                'id INTEGER PRIMARY KEY CHECK (id = 1), '
+                'entries INTEGER NOT NULL, '
+                'bytes INTEGER NOT NULL)'
+            )
+            connection.execute(
+                'INSERT OR IGNORE INTO cache_stats (id, entries, bytes) '
+                'SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+            )
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_entries_after_insert AFTER INSERT ON cache_entries '
+                'BEGIN UPDATE cache_stats SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1; END'
+            )
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_entries_after_delete AFTER DELETE ON cache_entries '
+                'BEGIN UPDATE cache_stats SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1; END'
+            )
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_entries_after_update AFTER UPDATE OF size ON cache_entries '
+                'BEGIN UPDATE cache_stats SET bytes = bytes - OLD.size + NEW.size WHERE id = 1; END'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _sql_key(cache_key: Hashable) -> str:
+        """Représentation textuelle non ambiguë d'une clé (chaîne ou tuple)"""
+        return repr(cache_key)
+
+    def get(self, cache_key: Hashable) -> Optional[Tuple[Any, float]]:
+        cache_key = self._sql_key(cache_key)
+        connection = self._connect()
+        row = connection.execute(
+            'SELECT value, timestamp FROM cache_entries WHERE cache_key = ?',
+            (cache_key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        with connection:
+            connection.execute(
+                'UPDATE cache_entries SET accessed_at = ? WHERE cache_key = ?',
+                (time.time(), cache_key)
+            )
+
+        try:
+            return pickle.loads(row[0]), row[1]
+        except Exception as e:
+            # Entrée corrompue ou écrite par une version incompatible
+            logger.warning("Entrée de cache illisible ignorée: %s", e)
+            with connection:
+                connection.execute('DELETE FROM cache_entries WHERE cache_key = ?', (cache_key,))
+            return None
+
+    def set(self, cache_key: Hashable, value: Any, timestamp: float):
+        cache_key = self._sql_key(cache_key)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as connection:
+            # UPSERT plutôt que REPLACE: les triggers de statistiques restent exacts
+            connection.execute(
+                'INSERT INTO cache_entries (cache_key, value, timestamp, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(cache_key) DO UPDATE SET value = excluded.value, '
+                'timestamp = excluded.timestamp, accessed_at = excluded.accessed_at, '
+                'size = excluded.size',
+                (cache_key, sqlite3.Binary(data), timestamp, time.time(), len(data))
+            )
+            self.expirations += connection.execute(
+                'DELETE FROM cache_entries WHERE timestamp <= ?',
+                (time.time() - self.ttl,)
+            ).rowcount
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection):
+        """Évince les entrées les moins récemment utilisées au-delà des limites"""
+        count, total_bytes = self._read_stats(connection)
+
+        if self.max_entries and count > self.max_entries:
+            self.evictions += connection.execute(
+                'DELETE FROM cache_entries WHERE cache_key IN ('
+                'SELECT cache_key FROM cache_entries ORDER BY accessed_at LIMIT ?)',
+                (count - self.max_entries,)
+            ).rowcount
+            count, total_bytes = self._read_stats(connection)
+
+        if self.max_bytes and total_bytes > self.max_bytes:
+            excess = total_bytes - self.max_bytes
+            victims = []
+            for cache_key, size in connection.execute(
+                    'SELECT cache_key, size FROM cache_entries ORDER BY accessed_at'):
+                if excess <= 0:
+                    break
+                victims.append((cache_key,))
+                excess -= size
+            connection.executemany('DELETE FROM cache_entries WHERE cache_key = ?', victims)
+            self.evictions += len(victims)
+
+    def delete(self, cache_key: Hashable):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM cache_entries WHERE cache_key = ?', (self._sql_key(cache_key),))
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM cache_entries')
+
+    def purge_expired(self, max_age: float) -> int:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                'DELETE FROM cache_entries WHERE timestamp <= ?',
+                (time.time() - max_age,)
+            )
+            self.expirations += cursor.rowcount
+            return cursor.rowcount
+
+    def count_expired(self, max_age: float) -> int:
+        row = self._connect().execute(
+            'SELECT COUNT(*) FROM cache_entries WHERE timestamp <= ?',
+            (time.time() - max_age,)
+        ).fetchone()
+        return row[0]
+
+    @staticmethod
+    def _read_stats(connection: sqlite3.Connection) -> Tuple[int, int]:
+        """Lit (entrées, octets) depuis la table de compteurs"""
+        row = connection.execute('SELECT entries, bytes FROM cache_stats WHERE id = 1').fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Compteurs maintenus incrémentalement (lecture en O(1))
+
+        Les entrées et octets sont partagés entre processus; les évictions
+        et expirations sont propres à ce processus.
+
+        Returns:
+            Dictionnaire {'entries', 'bytes', 'evictions', 'expirations'}
+        """
+        entries, total_bytes = self._read_stats(self._connect())
+        return {
+            'entries': entries,
+            'bytes': total_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+
+def create_cache_backend(backend_name: Optional[str] = None, path: Optional[str] = None, **limits):
+    """
+    Crée le backend de cache configuré
+
+    Args:
+        backend_name: 'memory' ou 'sqlite' (défaut: Config.CACHE_BACKEND)
+        path: Fichier de la base SQLite (défaut: CACHE_DIR/cache.sqlite3)
+        **limits: max_entries, max_bytes et ttl transmis au backend
+
+    Returns:
+        Instance de backend
+    """
+    backend_name = (backend_name or Config.CACHE_BACKEND).lower()
+
+    if backend_name == 'sqlite':
+        try:
+            return SQLiteCacheBackend(path, **limits)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Cache SQLite indisponible, repli sur la mémoire: %s", e)
+            return MemoryCacheBackend(**limits)
+
+    if backend_name != 'memory':
+        logger.warning("Backend de cache inconnu '%s', utilisation de la mémoire", backend_name)
+
+    return MemoryCacheBackend(**limits)
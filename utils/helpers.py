@@ -1,9 +1,7 @@
 """
 Fonctions utilitaires pour l'application
 """
-import streamlit as st
 import json
-import pandas as pd
 from typing import Dict, List, Any, Optional
 from urllib.parse import urlparse, urljoin
 import re
@@ -64,6 +62,8 @@ def create_download_button(data: Any, filename: str, label: str, file_type: str
         label: Label du bouton
         file_type: Type de fichier
     """
+    import streamlit as st
+
     if file_type == "json":
         if isinstance(data, (dict, list)):
             data_str = json.dumps(data, indent=2, ensure_ascii=False)
@@ -96,6 +96,9 @@ def display_schema_summary(schemas: List[Dict], language: str = 'fr'):
     if not schemas:
         return
 
+    import pandas as pd
+    import streamlit as st
+
     # Compter les types
     schema_types = {}
     for schema in schemas:
@@ -303,6 +306,8 @@ def create_progress_bar(current: int, total: int, label: str = ""):
         total: Valeur totale
         label: Label de la barre
     """
+    import streamlit as st
+
     progress = current / total if total > 0 else 0
     st.progress(progress, text=label)
 
@@ -0,0 +1,258 @@
+"""
+Couche HTTP partagée entre le scraper et les clients ValueSERP
+Pool de connexions keep-alive, limites de concurrence par hôte et annulation
+"""
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import Config
+from utils.http_fixtures import get_fixture_transport
+from utils.timing import fetching_url, span
+
+
+class RequestCancelled(Exception):
+    """Levée lorsqu'une requête est annulée avant d'être envoyée"""
+
+
+class CancelToken:
+    """Jeton d'annulation partagé par un groupe de requêtes"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Annule toutes les requêtes qui n'ont pas encore démarré"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Attend sans bloquer l'annulation (remplace time.sleep)
+
+        Args:
+            timeout: Durée maximale d'attente en secondes
+
+        Returns:
+            True si le jeton a été annulé pendant l'attente
+        """
+        return self._event.wait(timeout)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interprète l'en-tête Retry-After
+
+    Args:
+        value: Valeur de l'en-tête (nombre de secondes ou date HTTP)
+
+    Returns:
+        Délai d'attente en secondes, ou None si absent/invalide
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """
+    Connexion HTTP dont l'établissement est mesuré (span 'http.connect')
+
+    Les spans portent l'URL déclarée par timing.fetching (tableau par page)
+    et sont marqués comme inclus dans le TTFB de la requête.
+    """
+
+    def _new_conn(self):
+        with span('http.dns_tcp', url=fetching_url(), host=self.host, within='http.connect'):
+            return super()._new_conn()
+
+    def connect(self):
+        with span('http.connect', url=fetching_url(), host=self.host, within='http.ttfb'):
+            super().connect()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """Connexion HTTPS: 'http.dns_tcp' (résolution + TCP) inclus dans 'http.connect' (+ TLS)"""
+
+    def _new_conn(self):
+        with span('http.dns_tcp', url=fetching_url(), host=self.host, within='http.connect'):
+            return super()._new_conn()
+
+    def connect(self):
+        with span('http.connect', url=fetching_url(), host=self.host, tls=True, within='http.ttfb'):
+            super().connect()
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """Transport réseau par défaut: les nouvelles connexions du pool sont mesurées"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class HttpClient:
+    """Client HTTP thread-safe avec pool de connexions et limites par hôte"""
+
+    def __init__(self,
+                 pool_maxsize: int = Config.HTTP_POOL_MAXSIZE,
+                 per_host_limit: int = Config.MAX_REQUESTS_PER_HOST,
+                 timeout: float = Config.REQUEST_TIMEOUT,
+                 headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[BaseAdapter] = None):
+        """
+        Args:
+            pool_maxsize: Connexions keep-alive conservées par hôte
+            per_host_limit: Requêtes simultanées maximum par hôte
+            timeout: Timeout par défaut des requêtes en secondes
+            headers: En-têtes ajoutés à toutes les requêtes
+            transport: Transport requests à utiliser à la place du pool réseau
+                (ex. RecordingTransport/ReplayTransport de utils.http_fixtures;
+                défaut: celui de Config.HTTP_FIXTURES_MODE, sinon le réseau)
+        """
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+
+        self.session = requests.Session()
+        adapter = transport or get_fixture_transport() or _TimedHTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Retourne le sémaphore limitant la concurrence vers l'hôte de l'URL"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def request(self,
+                method: str,
+                url: str,
+                cancel_token: Optional[CancelToken] = None,
+                **kwargs) -> requests.Response:
+        """
+        Effectue une requête HTTP via le pool partagé
+
+        Args:
+            method: Méthode HTTP
+            url: URL cible
+            cancel_token: Jeton d'annulation (optionnel)
+            **kwargs: Arguments transmis à requests.Session.request
+
+        Returns:
+            Réponse HTTP
+
+        Raises:
+            RequestCancelled: si le jeton est annulé avant l'envoi
+            requests.exceptions.RequestException: en cas d'erreur réseau
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        semaphore = self._get_host_semaphore(url)
+
+        # Attendre une place libre pour cet hôte en surveillant l'annulation
+        while not semaphore.acquire(timeout=0.1):
+            if cancel_token and cancel_token.cancelled:
+                raise RequestCancelled(url)
+
+        try:
+            if cancel_token and cancel_token.cancelled:
+                raise RequestCancelled(url)
+            return self.session.request(method, url, **kwargs)
+        finally:
+            semaphore.release()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Raccourci pour une requête GET"""
+        return self.request('GET', url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Version awaitable de request()
+
+        La requête s'exécute dans l'exécuteur de la boucle; l'annulation de
+        la tâche asyncio annule aussi le jeton associé.
+        """
+        cancel_token = kwargs.pop('cancel_token', None) or CancelToken()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None,
+                partial(self.request, method, url, cancel_token=cancel_token, **kwargs)
+            )
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+    async def aget(self, url: str, **kwargs) -> requests.Response:
+        """Raccourci awaitable pour une requête GET"""
+        return await self.arequest('GET', url, **kwargs)
+
+    def close(self):
+        """Ferme toutes les connexions du pool"""
+        self.session.close()
+
+
+# Instance partagée par le processus
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Retourne le client HTTP partagé du processus
+
+    Returns:
+        Instance HttpClient unique
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
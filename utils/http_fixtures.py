@@ -0,0 +1,338 @@
+"""
+Transport HTTP d'enregistrement et de rejeu pour les tests de charge
+En enregistrement, les réponses (statut, en-têtes, corps) sont conservées
+dans une archive zip compressée et indexée; en rejeu elles sont servies
+sans réseau, avec une latence et des pannes (rafales de 503, hôtes lents)
+reproductibles
+"""
+import atexit
+import io
+import json
+import random
+import threading
+import time
+import zipfile
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from config import Config
+
+ARCHIVE_VERSION = 1
+INDEX_NAME = 'index.json'
+
+# Paramètres de requête retirés des clés et des URLs enregistrées
+REDACTED_PARAMS = frozenset({'api_key'})
+
+# En-têtes qui décrivent le transfert d'origine et non le corps enregistré (décompressé)
+_TRANSFER_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection'})
+
+_RECORD_CHUNK_SIZE = 64 * 1024
+
+
+class FixtureNotFound(requests.exceptions.ConnectionError):
+    """Levée en rejeu lorsqu'aucune réponse n'a été enregistrée pour la requête"""
+
+
+def fixture_key(method: str, url: str) -> str:
+    """
+    Clé d'archive d'une requête: méthode et URL normalisée
+
+    Les paramètres de requête sont triés et les paramètres sensibles
+    (REDACTED_PARAMS) retirés, pour que la clé API ne soit jamais écrite
+    dans l'archive et qu'une autre clé rejoue les mêmes réponses.
+
+    Args:
+        method: Méthode HTTP
+        url: URL complète
+
+    Returns:
+        Clé "MÉTHODE url"
+    """
+    parsed = urlparse(url)
+    query = sorted((name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+                   if name not in REDACTED_PARAMS)
+    normalized = urlunparse((parsed.scheme, parsed.netloc.lower(), parsed.path or '/', '', urlencode(query), ''))
+    return f"{method.upper()} {normalized}"
+
+
+class FailureProfile:
+    """
+    Latence et pannes injectées en rejeu
+
+    La latence d'une réponse vaut latency + slow_hosts[hôte] + un tirage
+    uniforme dans [0, jitter]. Les rafales de pannes sont déterministes:
+    sur chaque tranche de burst_every requêtes d'un hôte, les burst_length
+    premières reçoivent burst_status (avec Retry-After si retry_after est
+    renseigné).
+    """
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 slow_hosts: Optional[Dict[str, float]] = None,
+                 burst_every: int = 0,
+                 burst_length: int = 0,
+                 burst_status: int = 503,
+                 retry_after: Optional[float] = None,
+                 seed: int = 0):
+        """
+        Args:
+            latency: Latence de base en secondes
+            jitter: Latence aléatoire supplémentaire maximale en secondes
+            slow_hosts: Latence supplémentaire par hôte ({'hote:port': secondes})
+            burst_every: Période des rafales de pannes en requêtes (0 = aucune panne)
+            burst_length: Nombre de requêtes en échec au début de chaque période
+            burst_status: Statut HTTP renvoyé pendant une rafale
+            retry_after: Valeur de l'en-tête Retry-After des réponses en échec
+            seed: Graine du tirage de la latence aléatoire
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_hosts = {host.lower(): delay for host, delay in (slow_hosts or {}).items()}
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.burst_status = burst_status
+        self.retry_after = retry_after
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remet les compteurs de rafales et le tirage aléatoire à zéro (rejeu identique)"""
+        with self._lock:
+            self._rng = random.Random(self.seed)
+            self._host_requests: Dict[str, int] = {}
+
+    def next_outcome(self, host: str) -> Tuple[float, bool]:
+        """
+        Tire la latence de la prochaine requête vers un hôte
+
+        Args:
+            host: Hôte (netloc) de la requête
+
+        Returns:
+            Tuple (latence en secondes, True si la requête tombe dans une rafale de pannes)
+        """
+        with self._lock:
+            index = self._host_requests.get(host, 0)
+            self._host_requests[host] = index + 1
+            jitter = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+
+        delay = self.latency + self.slow_hosts.get(host, 0.0) + jitter
+        failed = bool(self.burst_every) and index % self.burst_every < self.burst_length
+        return delay, failed
+
+
+class _FixtureTransport(HTTPAdapter):
+    """Base commune: construction des réponses requests depuis un enregistrement"""
+
+    def _build_fixture_response(self, request: requests.PreparedRequest, status: int, reason: str,
+                                headers: Dict[str, str], body: bytes) -> requests.Response:
+        """Réponse équivalente à une réponse réseau (raw urllib3 lisible en flux)"""
+        headers = {name: value for name, value in headers.items() if name.lower() not in _TRANSFER_HEADERS}
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+            request_url=request.url
+        )
+        return self.build_response(request, raw)
+
+
+class RecordingTransport(_FixtureTransport):
+    """
+    Transport réseau qui enregistre chaque réponse
+
+    Les corps sont lus en entier (décompressés, au plus Config.MAX_PAGE_BYTES
+    plus un bloc) puis rendus à l'appelant depuis la mémoire; l'archive est
+    écrite par save(), appelée à la fermeture du client HTTP.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Args:
+            path: Chemin de l'archive zip à écrire
+            **kwargs: Arguments de HTTPAdapter (taille du pool...)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self._records: List[Tuple[str, Dict, bytes]] = []
+        self._records_lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        try:
+            body = self._read_body(response)
+        finally:
+            response.close()
+
+        metadata = {
+            'method': request.method,
+            'url': fixture_key(request.method, request.url).split(' ', 1)[1],
+            'status': response.status_code,
+            'reason': response.reason or '',
+            'headers': dict(response.headers),
+            'elapsed': round(time.perf_counter() - start, 4)
+        }
+        with self._records_lock:
+            self._records.append((fixture_key(request.method, request.url), metadata, body))
+
+        return self._build_fixture_response(request, response.status_code, response.reason or '',
+                                            dict(response.headers), body)
+
+    def _read_body(self, response: requests.Response) -> bytes:
+        """Lit le corps décompressé dans la limite de taille des pages"""
+        limit = Config.MAX_PAGE_BYTES + _RECORD_CHUNK_SIZE
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=_RECORD_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= limit:
+                break
+        return b''.join(chunks)
+
+    def save(self):
+        """Écrit l'archive (index + une paire métadonnées/corps par réponse)"""
+        with self._records_lock:
+            records = list(self._records)
+        if not records:
+            return
+
+        index: Dict[str, List[str]] = {}
+        with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for number, (key, metadata, body) in enumerate(records, 1):
+                name = f'responses/{number:06d}'
+                archive.writestr(f'{name}.json', json.dumps(metadata, ensure_ascii=False))
+                archive.writestr(f'{name}.body', body)
+                index.setdefault(key, []).append(name)
+            archive.writestr(INDEX_NAME, json.dumps({'version': ARCHIVE_VERSION, 'entries': index},
+                                                    ensure_ascii=False, indent=1))
+
+    def close(self):
+        self.save()
+        super().close()
+
+
+class ReplayTransport(_FixtureTransport):
+    """
+    Transport sans réseau qui rejoue une archive enregistrée
+
+    Les réponses enregistrées plusieurs fois pour une même requête sont
+    servies dans l'ordre, la dernière étant répétée ensuite. La latence du
+    profil est une attente réelle (time.sleep libère le GIL comme une
+    attente réseau) et un délai supérieur au timeout de lecture lève
+    requests.exceptions.ReadTimeout.
+    """
+
+    def __init__(self, path: str, profile: Optional[FailureProfile] = None):
+        """
+        Args:
+            path: Chemin de l'archive zip enregistrée
+            profile: Latence et pannes injectées (défaut: aucune)
+        """
+        super().__init__()
+        self.path = path
+        self.profile = profile or FailureProfile()
+        self._archive: Optional[zipfile.ZipFile] = zipfile.ZipFile(path, 'r')
+        index = json.loads(self._archive.read(INDEX_NAME))
+        if index.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Version d'archive non supportée: {index.get('version')}")
+        self._entries: Dict[str, List[str]] = index['entries']
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.injected_failures = 0
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             **kwargs) -> requests.Response:
+        key = fixture_key(request.method, request.url)
+        host = urlparse(request.url).netloc.lower()
+        delay, failed = self.profile.next_outcome(host)
+
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Délai de rejeu dépassé pour {key}", request=request)
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.injected_failures += 1
+            else:
+                names = self._entries.get(key)
+                if not names:
+                    raise FixtureNotFound(f"Aucune réponse enregistrée pour {key}", request=request)
+                served = self._served.get(key, 0)
+                self._served[key] = served + 1
+                name = names[min(served, len(names) - 1)]
+                if self._archive is None:
+                    # Transport partagé: un client fermé ne prive pas les autres de l'archive
+                    self._archive = zipfile.ZipFile(self.path, 'r')
+                metadata = json.loads(self._archive.read(f'{name}.json'))
+                body = self._archive.read(f'{name}.body')
+
+        if failed:
+            headers = {'Content-Type': 'text/plain'}
+            if self.profile.retry_after is not None:
+                headers['Retry-After'] = f'{self.profile.retry_after:g}'
+            return self._build_fixture_response(request, self.profile.burst_status, 'Injected failure',
+                                                headers, b'injected failure')
+        return self._build_fixture_response(request, metadata['status'], metadata['reason'],
+                                            metadata['headers'], body)
+
+    def close(self):
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+
+
+# Transport partagé par les clients HTTP du processus (Config.HTTP_FIXTURES_MODE)
+_configured_transport: Optional[HTTPAdapter] = None
+_configured_transport_lock = threading.Lock()
+
+
+def get_fixture_transport() -> Optional[HTTPAdapter]:
+    """
+    Retourne le transport d'enregistrement ou de rejeu configuré
+
+    Config.HTTP_FIXTURES_MODE vaut 'record', 'replay' ou '' (réseau normal);
+    l'archive est Config.HTTP_FIXTURES_PATH. En enregistrement l'archive
+    est écrite à la sortie du processus.
+
+    Returns:
+        Transport partagé, ou None hors mode fixtures
+    """
+    global _configured_transport
+    mode = Config.HTTP_FIXTURES_MODE
+    if not mode:
+        return None
+
+    with _configured_transport_lock:
+        if _configured_transport is None:
+            if mode == 'record':
+                _configured_transport = RecordingTransport(
+                    Config.HTTP_FIXTURES_PATH,
+                    pool_connections=Config.HTTP_POOL_MAXSIZE,
+                    pool_maxsize=max(Config.HTTP_POOL_MAXSIZE, Config.MAX_CONCURRENT_REQUESTS),
+                    max_retries=0
+                )
+                atexit.register(_configured_transport.save)
+            elif mode == 'replay':
+                _configured_transport = ReplayTransport(Config.HTTP_FIXTURES_PATH)
+            else:
+                raise ValueError(f"HTTP_FIXTURES_MODE inconnu: {mode!r} (attendu: 'record' ou 'replay')")
+        return _configured_transport
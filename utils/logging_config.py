@@ -0,0 +1,92 @@
+"""
+Journalisation structurée de l'application
+Niveaux par module, discrète par défaut (Config.LOG_LEVEL, Config.LOG_LEVELS)
+et mode debug global pour les scripts
+"""
+import logging
+import sys
+import threading
+from typing import Dict, Optional
+
+from config import Config
+
+# Paquets de l'application: chaque module journalise via logging.getLogger(__name__)
+APP_LOGGERS = ('analyzers', 'api', 'generators', 'schemeo', 'scrapers', 'ui', 'utils')
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Attributs standard d'un LogRecord: tout le reste provient de extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formate le message puis les champs passés via extra= en clé=valeur
+
+    Exemple: logger.info("Page tronquée", extra={'url': url, 'bytes': size})
+    donne "... scrapers.schema_scraper: Page tronquée url='https://...' bytes=5242880"
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [
+            f"{key}={value!r}" for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_')
+        ]
+        return f"{line} {' '.join(fields)}" if fields else line
+
+
+def configure_logging(level: Optional[str] = None,
+                      levels: Optional[Dict[str, str]] = None,
+                      stream=None):
+    """
+    Installe le gestionnaire de l'application (idempotent)
+
+    Args:
+        level: Niveau des paquets de l'application (défaut: Config.LOG_LEVEL)
+        levels: Niveaux par module (défaut: Config.LOG_LEVELS)
+        stream: Flux de sortie (défaut: sys.stderr)
+    """
+    global _configured
+    with _configure_lock:
+        if not _configured:
+            handler = logging.StreamHandler(stream or sys.stderr)
+            handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+            for name in APP_LOGGERS:
+                logger = logging.getLogger(name)
+                logger.addHandler(handler)
+                # Pas de double affichage si l'hôte (Streamlit) configure le logger racine
+                logger.propagate = False
+            _configured = True
+
+    _apply_levels(level or Config.LOG_LEVEL, Config.LOG_LEVELS if levels is None else levels)
+
+
+def _apply_levels(level: str, levels: Dict[str, str]):
+    """Applique le niveau global puis les niveaux par module"""
+    for name in APP_LOGGERS:
+        logging.getLogger(name).setLevel(level.upper())
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level.upper())
+
+
+def set_debug_logging(enabled: bool):
+    """
+    Active ou désactive le mode debug de tous les modules de l'application
+
+    Les niveaux sont ceux du processus entier: à réserver aux scripts et à
+    la ligne de commande, jamais à une option d'une session Streamlit (elle
+    changerait le journal de toutes les sessions).
+
+    Args:
+        enabled: True pour le niveau DEBUG partout, False pour revenir aux
+            niveaux configurés
+    """
+    configure_logging()
+    if enabled:
+        _apply_levels('DEBUG', {name: 'DEBUG' for name in Config.LOG_LEVELS})
+    else:
+        _apply_levels(Config.LOG_LEVEL, Config.LOG_LEVELS)
@@ -0,0 +1,271 @@
+"""
+Métriques de l'instance au format texte Prometheus
+Compteurs et histogrammes déclarés par les modules, exposés sur un port
+HTTP local; désactivés (Config.METRICS_ENABLED), chaque mise à jour se
+limite à un test de booléen
+"""
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bornes par défaut des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label (antislash, guillemet, saut de ligne)"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    """Labels au format {nom="valeur",...}"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base commune: nom, aide, labels et verrou"""
+
+    kind = ''
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames: Sequence[str]):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Valeurs des labels dans l'ordre déclaré"""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: labels attendus {self.labelnames}, reçus {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def expose(self) -> List[str]:
+        """Lignes HELP/TYPE puis échantillons"""
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}'] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Compteur monotone, une valeur par combinaison de labels"""
+
+    kind = 'counter'
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Incrémente le compteur (sans effet si les métriques sont désactivées)
+
+        Args:
+            amount: Valeur ajoutée (positive)
+            **labels: Valeur de chaque label déclaré
+        """
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Valeur courante pour une combinaison de labels"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in values]
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif (bornes fixes, somme et nombre d'observations)"""
+
+    kind = 'histogram'
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # Par labels: [compte par borne..., compte au-delà, somme]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """
+        Enregistre une observation (sans effet si les métriques sont désactivées)
+
+        Args:
+            value: Valeur observée (secondes pour une durée)
+            **labels: Valeur de chaque label déclaré
+        """
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = []
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(values[-1])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques de l'instance"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: Enregistrer les mises à jour (sinon elles sont ignorées)
+        """
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_cls(self, name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Métrique {name} déjà déclarée avec un autre type ou d'autres labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Déclare (ou retrouve) un compteur
+
+        Args:
+            name: Nom Prometheus (suffixe _total par convention)
+            documentation: Texte de la ligne HELP
+            labelnames: Noms des labels
+
+        Returns:
+            Compteur
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Déclare (ou retrouve) un histogramme
+
+        Args:
+            name: Nom Prometheus (suffixe _seconds pour une durée)
+            documentation: Texte de la ligne HELP
+            labelnames: Noms des labels
+            buckets: Bornes supérieures des intervalles
+
+        Returns:
+            Histogramme
+        """
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def expose(self) -> str:
+        """
+        Toutes les métriques au format texte Prometheus 0.0.4
+
+        Returns:
+            Texte de la page /metrics
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+# Registre de l'application
+registry = MetricsRegistry(enabled=Config.METRICS_ENABLED)
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def _make_handler(metrics_registry: MetricsRegistry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics_registry.expose().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Démarre l'endpoint /metrics dans un thread (idempotent)
+
+    Sans effet si les métriques sont désactivées; Streamlit ré-exécute le
+    script à chaque interaction, le serveur n'est démarré qu'une fois par
+    processus.
+
+    Args:
+        port: Port d'écoute (défaut: Config.METRICS_PORT)
+        host: Adresse d'écoute (défaut: Config.METRICS_HOST)
+
+    Returns:
+        Serveur démarré, ou None si les métriques sont désactivées
+    """
+    global _server
+    if not registry.enabled:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            address = (host or Config.METRICS_HOST, Config.METRICS_PORT if port is None else port)
+            try:
+                server = ThreadingHTTPServer(address, _make_handler(registry))
+            except OSError as e:
+                logger.warning("Endpoint de métriques indisponible sur %s:%s: %s", address[0], address[1], e)
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+            logger.info("Métriques exposées sur http://%s:%d/metrics", *server.server_address[:2])
+            _server = server
+        return _server
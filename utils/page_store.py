@@ -0,0 +1,175 @@
+"""
+Magasin partagé des extractions de pages
+Les schemas extraits d'une URL sont réutilisés par toutes les analyses
+(mots-clés, lots, ma page) tant qu'ils ont moins de Config.CACHE_DURATION,
+puis revalidés par GET conditionnel jusqu'à Config.PAGE_REVALIDATION_MAX_AGE
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from config import Config
+from utils.cache import CacheManager
+from utils.cache_backends import create_cache_backend
+from utils.helpers import normalize_url
+
+
+def page_key(url: str) -> str:
+    """
+    Clé d'une page dans le magasin
+
+    Basée sur normalize_url(), avec en plus le schéma et l'hôte en minuscules
+    et sans fragment (#ancre), qui ne change pas le contenu téléchargé.
+
+    Args:
+        url: URL de la page
+
+    Returns:
+        URL normalisée
+    """
+    scheme, netloc, path, query, _ = urlsplit(normalize_url(url.strip()))
+    return urlunsplit((scheme.lower(), netloc.lower(), path, query, ''))
+
+
+class PageStore:
+    """
+    Extractions de pages indexées par URL normalisée
+
+    Les appels concurrents pour une même URL n'entraînent qu'un seul
+    téléchargement (single-flight du CacheManager sous-jacent); seules les
+    pages effectivement téléchargées sont conservées et partagées: après un
+    échec ou une annulation du premier appelant, les suivants téléchargent
+    la page avec leur propre jeton. Les pages expirées sont
+    gardées avec leurs validateurs HTTP (ETag, Last-Modified) pour être
+    revalidées sans nouveau téléchargement si elles n'ont pas changé.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: Backend de stockage (défaut: selon Config.CACHE_BACKEND,
+                fichier pages.sqlite3 séparé en mode SQLite)
+        """
+        self.cache = CacheManager(backend or create_cache_backend(
+            path=os.path.join(Config.CACHE_DIR, 'pages.sqlite3'),
+            max_entries=Config.PAGE_STORE_MAX_SIZE,
+            ttl=max(Config.CACHE_DURATION, Config.PAGE_REVALIDATION_MAX_AGE)
+        ), name='pages')
+        self.lookups = 0
+        self.reuses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+
+    def get_or_extract(self,
+                       url: str,
+                       extract: Callable[[], Dict],
+                       variant: Optional[str] = None,
+                       revalidate: Optional[Callable[[Dict], Dict]] = None) -> Tuple[Dict, bool]:
+        """
+        Retourne l'extraction d'une page, en la calculant si elle est absente
+
+        Args:
+            url: URL de la page
+            extract: Fonction produisant {'url', 'schemas', 'schema_types',
+                'fetched'}; 'fetched' à False si la page n'a pas pu être
+                téléchargée (résultat non conservé)
+            variant: Type d'extraction partielle (ex. 'json-ld'), stockée à
+                part de l'extraction complète
+            revalidate: Fonction recevant l'extraction expirée et produisant
+                la nouvelle (GET conditionnel); 'revalidated' à True si la
+                page n'a pas changé (défaut: extract)
+
+        Returns:
+            Tuple (extraction, réutilisée) où réutilisée vaut True si aucune
+            requête n'a été faite pour cet appel
+        """
+        key = page_key(url) if variant is None else (page_key(url), variant)
+        page, info = self.cache.lookup_or_compute(
+            key,
+            extract,
+            should_cache=lambda result: bool(result.get('fetched')),
+            max_age=Config.PAGE_REVALIDATION_MAX_AGE,
+            revalidate=revalidate,
+            share_uncached=False
+        )
+        reused = info['status'] in ('fresh', 'coalesced')
+
+        with self._lock:
+            self.lookups += 1
+            if reused:
+                self.reuses += 1
+            elif page.get('revalidated'):
+                self.revalidations += 1
+
+        return page, reused
+
+    def clear(self):
+        """Vide le magasin"""
+        self.cache.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        Statistiques de réutilisation depuis le démarrage
+
+        Returns:
+            Dictionnaire avec lookups, reuses, revalidations, reuse_ratio,
+            entries et bytes
+        """
+        cache_stats = self.cache.snapshot()
+        with self._lock:
+            lookups, reuses, revalidations = self.lookups, self.reuses, self.revalidations
+
+        return {
+            'lookups': lookups,
+            'reuses': reuses,
+            'revalidations': revalidations,
+            'reuse_ratio': round(reuses / lookups, 3) if lookups else 0.0,
+            'entries': cache_stats['entries'],
+            'bytes': cache_stats['bytes']
+        }
+
+
+def reuse_stats(url_results: List[Dict]) -> Dict:
+    """
+    Taux de réutilisation du magasin pour un lot de résultats par URL
+
+    Args:
+        url_results: Résultats par URL (clés 'reused' et 'revalidated' posées
+            par le scraper)
+
+    Returns:
+        Dictionnaire {'urls', 'reused', 'fetched', 'revalidated', 'reuse_ratio'}
+        où revalidated compte les pages servies après une réponse 304
+    """
+    total = len(url_results)
+    reused = sum(1 for url_result in url_results if url_result.get('reused'))
+    revalidated = sum(1 for url_result in url_results if url_result.get('revalidated'))
+
+    return {
+        'urls': total,
+        'reused': reused,
+        'fetched': total - reused,
+        'revalidated': revalidated,
+        'reuse_ratio': round(reused / total, 3) if total else 0.0
+    }
+
+
+# Instance partagée par le processus
+_page_store: Optional[PageStore] = None
+_page_store_lock = threading.Lock()
+
+
+def get_page_store() -> PageStore:
+    """
+    Retourne le magasin de pages partagé du processus
+
+    Returns:
+        Instance PageStore unique
+    """
+    global _page_store
+    if _page_store is None:
+        with _page_store_lock:
+            if _page_store is None:
+                _page_store = PageStore()
+    return _page_store
@@ -0,0 +1,209 @@
+"""
+Mesure des durées par étape du pipeline d'analyse
+Chaque étape (appel ValueSERP, connexion, TTFB, téléchargement, parsing,
+JSON-LD, extruct, types, agrégation) est un span avec sa durée réelle et
+son temps CPU, rattaché à l'analyse en cours via un contextvar
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+# Collecteur de l'analyse en cours (None: mesure désactivée, coût quasi nul)
+_current: contextvars.ContextVar[Optional['Timings']] = contextvars.ContextVar('timings', default=None)
+
+# URL en cours de téléchargement: rattache les spans de connexion (couche
+# urllib3, sans accès à l'URL) à la page qui les a déclenchés
+_fetch_url: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('fetch_url', default=None)
+
+
+class Timings:
+    """
+    Collecteur des spans d'une analyse, partagé par ses threads
+
+    Le temps CPU d'un span est celui du thread qui l'exécute
+    (time.thread_time): les extractions faites dans un ParsePool sont
+    comptées en durée réelle seulement.
+    """
+
+    def __init__(self):
+        self._spans: List[Dict] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def activate(self) -> Iterator['Timings']:
+        """Rattache les spans du contexte courant (et des tâches lancées via bind) à ce collecteur"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def record(self, stage: str, wall: float, cpu: float, **fields):
+        """
+        Enregistre un span
+
+        Args:
+            stage: Nom de l'étape (ex. 'http.ttfb', 'parse')
+            wall: Durée réelle en secondes
+            cpu: Temps CPU du thread en secondes
+            **fields: Attributs du span (url, octets...)
+        """
+        span = {
+            'stage': stage,
+            'start_ms': round((time.perf_counter() - wall - self._started) * 1000, 3),
+            'wall_ms': round(wall * 1000, 3),
+            'cpu_ms': round(cpu * 1000, 3),
+            **fields
+        }
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def stages(self) -> Dict[str, Dict]:
+        """
+        Totaux par étape
+
+        Returns:
+            {étape: {'count', 'wall_ms', 'cpu_ms', 'max_ms'}}, les étapes
+            dans l'ordre de leur premier span
+        """
+        totals: Dict[str, Dict] = {}
+        for span in self.spans:
+            stage = totals.setdefault(span['stage'], {'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'max_ms': 0.0})
+            stage['count'] += 1
+            stage['wall_ms'] += span['wall_ms']
+            stage['cpu_ms'] += span['cpu_ms']
+            stage['max_ms'] = max(stage['max_ms'], span['wall_ms'])
+        for stage in totals.values():
+            stage['wall_ms'] = round(stage['wall_ms'], 3)
+            stage['cpu_ms'] = round(stage['cpu_ms'], 3)
+        return totals
+
+    def by_url(self) -> Dict[str, Dict[str, float]]:
+        """
+        Durée réelle de chaque étape par URL
+
+        Les spans inclus dans un autre (champ 'within', ex. la connexion
+        dans le TTFB) ont leur colonne mais ne comptent pas dans le total.
+
+        Returns:
+            {url: {étape: wall_ms, 'total': wall_ms}}
+        """
+        urls: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            url = span.get('url')
+            if not url:
+                continue
+            stages = urls.setdefault(url, {'total': 0.0})
+            stages[span['stage']] = round(stages.get(span['stage'], 0.0) + span['wall_ms'], 3)
+            if not span.get('within'):
+                stages['total'] = round(stages['total'] + span['wall_ms'], 3)
+        return urls
+
+    def to_dict(self) -> Dict:
+        """
+        Résumé sérialisable attaché au résultat de l'analyse
+
+        Returns:
+            Dictionnaire {'total_ms', 'stages', 'urls', 'spans'}
+        """
+        return {
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'stages': self.stages(),
+            'urls': self.by_url(),
+            'spans': self.spans
+        }
+
+
+def current_timings() -> Optional[Timings]:
+    """Collecteur de l'analyse en cours, ou None"""
+    return _current.get()
+
+
+@contextmanager
+def fetching(url: str) -> Iterator[None]:
+    """
+    Déclare l'URL téléchargée pendant le bloc (voir fetching_url)
+
+    Args:
+        url: URL de la page
+    """
+    token = _fetch_url.set(url)
+    try:
+        yield
+    finally:
+        _fetch_url.reset(token)
+
+
+def fetching_url() -> Optional[str]:
+    """URL en cours de téléchargement dans ce contexte, ou None"""
+    return _fetch_url.get()
+
+
+def span(stage: str, **fields) -> ContextManager[Dict]:
+    """
+    Mesure un bloc comme une étape de l'analyse en cours
+
+    Sans collecteur actif (Timings.activate), le bloc s'exécute sans mesure
+    (un simple nullcontext). Les champs peuvent être complétés dans le bloc
+    via le dictionnaire retourné (ex. fields['bytes'] = taille).
+
+    Usage:
+        with span('http.download', url=url) as fields:
+            body = ...
+            fields['bytes'] = len(body)
+
+    Args:
+        stage: Nom de l'étape
+        **fields: Attributs du span
+    """
+    timings = _current.get()
+    if timings is None:
+        return nullcontext(fields)
+    return _measure(timings, stage, fields)
+
+
+@contextmanager
+def _measure(timings: Timings, stage: str, fields: Dict) -> Iterator[Dict]:
+    """Span mesuré (voir span)"""
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield fields
+    finally:
+        timings.record(stage, time.perf_counter() - wall_start, time.thread_time() - cpu_start, **fields)
+
+
+def bind(function: Callable) -> Callable:
+    """
+    Rattache une fonction exécutée dans un autre thread au collecteur courant
+
+    Les threads d'un ThreadPoolExecutor n'héritent pas du contexte de
+    l'appelant: la fonction retournée réactive le collecteur capturé à
+    chaque appel (plusieurs threads peuvent l'exécuter en même temps).
+
+    Args:
+        function: Fonction à soumettre au pool
+
+    Returns:
+        Fonction équivalente (la fonction elle-même sans collecteur actif)
+    """
+    timings = _current.get()
+    if timings is None:
+        return function
+
+    def run(*args, **kwargs):
+        token = _current.set(timings)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
@@ -152,11 +152,12 @@ def test_location_with_api(api_key: str, location: str) -> dict:
     Returns:
         Résultat du test
     """
-    import requests
+    from config import Config
+    from utils.http_client import get_http_client
 
     try:
-        response = requests.get(
-            'https://api.valueserp.com/search',
+        response = get_http_client().get(
+            Config.VALUESERP_BASE_URL,
             params={
                 'api_key': api_key,
                 'q': 'test',
@@ -194,6 +195,23 @@ def test_location_with_api(api_key: str, location: str) -> dict:
         }
 
 
+async def atest_location_with_api(api_key: str, location: str) -> dict:
+    """
+    Version awaitable de test_location_with_api()
+
+    Args:
+        api_key: Clé API ValueSERP
+        location: Localisation à tester
+
+    Returns:
+        Résultat du test
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, test_location_with_api, api_key, location)
+
+
 def get_recommended_locations() -> dict:
     """
     Retourne les localisations recommandées avec exemples